@@ -122,6 +122,7 @@ def check_update_in_background(notification_manager: NotificationManager, tray_m
 
 def main() -> None:
     """应用程序主入口点"""
+    container = None
     try:
         # 设置 DPI 感知（尽早调用）
         set_dpi_awareness()
@@ -286,6 +287,21 @@ def main() -> None:
         log(f"Fatal error: {e}")
         raise
     finally:
+        # 写入托盘开关尚未落盘的配置
+        if container is not None:
+            try:
+                container.tray_menu_manager.flush_pending_save()
+            except Exception as e:
+                log(f"Failed to flush pending config save: {e}")
+
+        # 停止常驻 pandoc server
+        try:
+            from ..integrations.pandoc_server import shutdown_all_servers
+
+            shutdown_all_servers()
+        except Exception as e:
+            log(f"Failed to stop pandoc server: {e}")
+
         # 释放锁
         if app_state.instance_checker:
             app_state.instance_checker.release_lock()
@@ -82,6 +82,8 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "pandoc_request_headers": [
         "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     ],
+    # 实验性：常驻 pandoc server 进程处理不带 filter 的转换（需要 pandoc 3.x 的 server 子命令）
+    "pandoc_server_mode": False,
     "pandoc_filters": [],
     "pandoc_filters_by_conversion": {
         "md_to_docx": [],
@@ -51,6 +51,14 @@ class ConfigLoader:
         if "save_dir" in config:
             config["save_dir"] = os.path.expandvars(config["save_dir"])
 
+        # html_formatting 保证为 dict 且包含默认键，读取方无需再做类型判断
+        html_formatting = config.get("html_formatting")
+        if not isinstance(html_formatting, dict):
+            html_formatting = {}
+            config["html_formatting"] = html_formatting
+        for key, value in DEFAULT_CONFIG["html_formatting"].items():
+            html_formatting.setdefault(key, value)
+
         return config
 
     def _update_recursive(self, target: dict, source: dict) -> bool:
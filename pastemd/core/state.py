@@ -15,6 +15,8 @@ class AppState:
     last_ok: bool = True
     hotkey_str: str = "<ctrl>+<shift>+b"
     config: Dict[str, Any] = field(default_factory=dict)
+    # 已展开环境变量并确保存在的保存目录（配置变更后置为 None 以重新解析）
+    resolved_save_dir: Optional[str] = None
 
     # UI组件引用
     root: Optional[Any] = None      # tkinter.Tk (Global root window)
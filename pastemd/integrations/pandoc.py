@@ -11,6 +11,7 @@ from ..config.paths import resource_path
 
 from ..core.errors import PandocError
 from ..utils.logging import log
+from .pandoc_server import PandocServer
 
 LUA_KEEP_ORIGINAL_FORMULA = resource_path("lua/keep-latex-math.lua")
 LUA_LATEX_REPLACEMENTS = resource_path("lua/latex-replacements.lua")
@@ -84,6 +85,23 @@ class PandocIntegration:
         except Exception as e:
             raise PandocError(f"Pandoc Error: {e}")
         self.pandoc_path = pandoc_path
+        self._server: Optional[PandocServer] = None
+
+    def enable_server(self) -> None:
+        """
+        在后台启动常驻 pandoc server（实验性），用于不带 filter 的转换
+
+        不阻塞调用方；server 就绪前及启动失败时，所有转换继续使用一次性子进程。
+        """
+        if self._server is None:
+            self._server = PandocServer(self.pandoc_path)
+        self._server.start_async()
+
+    def shutdown_server(self) -> None:
+        """停止常驻 pandoc server"""
+        if self._server is not None:
+            self._server.stop()
+            self._server = None
 
     def _build_filter_args(self, custom_filters: Optional[List[str]] = None) -> List[str]:
         """
@@ -130,38 +148,52 @@ class PandocIntegration:
         使用 Pandoc 将 HTML 转换为 Markdown。
         """
         html_text = protect_brackets(html_text)
-        cmd = [
-            self.pandoc_path,
-            "-f", "html+tex_math_dollars+raw_tex+tex_math_double_backslash+tex_math_single_backslash",
-            "-t", "gfm-raw_html+tex_math_dollars",
-            "-o", "-",          # 输出到 stdout
-            "--wrap", "none",   # 不自动换行，方便你后处理
-        ]
-        cmd += self._build_filter_args(custom_filters)
+        from_format = "html+tex_math_dollars+raw_tex+tex_math_double_backslash+tex_math_single_backslash"
+        to_format = "gfm-raw_html+tex_math_dollars"
+        filter_args = self._build_filter_args(custom_filters)
+
+        md = None
+        # 无 filter 时优先走常驻 server，失败回退到一次性子进程
+        if self._server is not None and not filter_args:
+            try:
+                md = self._server.convert(html_text, from_format=from_format, to_format=to_format)
+            except Exception as e:
+                log(f"pandoc server conversion failed, falling back to subprocess: {e}")
+
+        if md is None:
+            cmd = [
+                self.pandoc_path,
+                "-f", from_format,
+                "-t", to_format,
+                "-o", "-",          # 输出到 stdout
+                "--wrap", "none",   # 不自动换行，方便你后处理
+            ]
+            cmd += filter_args
 
-        startupinfo = None
-        creationflags = 0
-        if os.name == "nt":
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            creationflags = subprocess.CREATE_NO_WINDOW
+            startupinfo = None
+            creationflags = 0
+            if os.name == "nt":
+                startupinfo = subprocess.STARTUPINFO()
+                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+                creationflags = subprocess.CREATE_NO_WINDOW
 
-        result = subprocess.run(
-            cmd,
-            input=html_text.encode("utf-8"),  # 显式用 UTF-8 编码
-            capture_output=True,
-            text=False,                       # 二进制模式
-            shell=False,
-            startupinfo=startupinfo,
-            creationflags=creationflags,
-        )
-        if result.returncode != 0:
-            err = (result.stderr or b"").decode("utf-8", "ignore")
-            log(f"Pandoc HTML to MD error: {err}")
-            raise PandocError(err or "Pandoc HTML to Markdown conversion failed")
+            result = subprocess.run(
+                cmd,
+                input=html_text.encode("utf-8"),  # 显式用 UTF-8 编码
+                capture_output=True,
+                text=False,                       # 二进制模式
+                shell=False,
+                startupinfo=startupinfo,
+                creationflags=creationflags,
+            )
+            if result.returncode != 0:
+                err = (result.stderr or b"").decode("utf-8", "ignore")
+                log(f"Pandoc HTML to MD error: {err}")
+                raise PandocError(err or "Pandoc HTML to Markdown conversion failed")
+
+            # stdout 也是 bytes，自行按 UTF-8 解码
+            md = result.stdout.decode("utf-8", "ignore")
 
-        # stdout 也是 bytes，自行按 UTF-8 解码
-        md = result.stdout.decode("utf-8", "ignore")
         md = md.replace('\r\n', '\n').replace('\r', '\n')  # 统一换行符
         md = re.sub(r'```\s*math\s*\n(.*?)\n\s*```', r'$$\n\1\n$$', md, flags=re.DOTALL)
         md = re.sub(r'\$\s*`([^`]+)`\s*\$', r'$\1$', md)
@@ -0,0 +1,261 @@
+"""Long-lived `pandoc server` process for filter-free conversions."""
+
+import atexit
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+from typing import Optional
+
+from ..core.errors import PandocError
+from ..utils.logging import log
+
+# 启动失败（或运行中崩溃）后再次尝试启动前的等待时间（秒），按失败次数翻倍
+_RESTART_BACKOFF_S = 30.0
+_RESTART_BACKOFF_MAX_S = 600.0
+
+_servers: "weakref.WeakSet[PandocServer]" = weakref.WeakSet()
+
+
+def shutdown_all_servers() -> None:
+    """停止所有常驻 pandoc server（应用退出时调用）"""
+    for server in list(_servers):
+        try:
+            server.stop()
+        except Exception as e:
+            log(f"Failed to stop pandoc server: {e}")
+
+
+atexit.register(shutdown_all_servers)
+
+
+class PandocServer:
+    """
+    常驻 pandoc server 进程（实验性）
+
+    在后台线程启动一次后通过本地 HTTP 复用，省去每次转换启动 pandoc 的开销。
+
+    Note:
+        - pandoc server 不支持 Lua/JSON filter，也不能读取本地文件（如 reference-doc），
+          因此只适用于不带 filter 的转换，其余转换仍走一次性子进程
+        - 启动、重启都在后台进行，convert 从不等待启动；未就绪时直接抛出 PandocError，
+          由调用方回退到子进程
+        - 启动失败或崩溃后按退避时间重试，避免每次转换都尝试重启
+        - 请求串行执行（threading.Lock）
+    """
+
+    def __init__(self, pandoc_path: str, startup_timeout: float = 3.0):
+        self.pandoc_path = pandoc_path
+        self.startup_timeout = startup_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._port: Optional[int] = None
+        self._ready = False
+        self._starting = False
+        self._stopped = False
+        self._failures = 0
+        self._next_start_at = 0.0
+        self._lock = threading.Lock()
+        self._request_lock = threading.Lock()
+        _servers.add(self)
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def is_ready(self) -> bool:
+        with self._lock:
+            return self._ready and self.is_running()
+
+    def start_async(self) -> bool:
+        """
+        在后台线程启动 server（不阻塞）
+
+        Returns:
+            是否发起了新的启动；已在运行/启动中、已停止或处于失败退避期时返回 False
+        """
+        with self._lock:
+            if self._stopped or self._starting or self.is_running():
+                return False
+            if time.monotonic() < self._next_start_at:
+                return False
+            self._starting = True
+
+        threading.Thread(target=self._start_worker, name="PandocServerStart", daemon=True).start()
+        return True
+
+    def _start_worker(self) -> None:
+        ok = False
+        try:
+            ok = self._launch()
+        except Exception as e:
+            log(f"Failed to start pandoc server: {e}")
+        finally:
+            with self._lock:
+                self._starting = False
+                if ok:
+                    self._failures = 0
+                else:
+                    self._record_failure_locked()
+
+    def _record_failure_locked(self) -> None:
+        self._failures += 1
+        backoff = min(_RESTART_BACKOFF_S * (2 ** (self._failures - 1)), _RESTART_BACKOFF_MAX_S)
+        self._next_start_at = time.monotonic() + backoff
+
+    def _launch(self) -> bool:
+        port = self._pick_free_port()
+        cmd = [self.pandoc_path, "server", "--port", str(port)]
+
+        startupinfo = None
+        creationflags = 0
+        if os.name == "nt":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            creationflags = subprocess.CREATE_NO_WINDOW
+
+        try:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                shell=False,
+                startupinfo=startupinfo,
+                creationflags=creationflags,
+            )
+        except Exception as e:
+            log(f"Failed to start pandoc server: {e}")
+            return False
+
+        with self._lock:
+            if self._stopped:
+                self._terminate(process)
+                return False
+            self._process = process
+            self._port = port
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                log(f"pandoc server exited during startup (code {process.returncode})")
+                break
+            try:
+                with urllib.request.urlopen(self._url(port, "/version"), timeout=0.5) as resp:
+                    if resp.status == 200:
+                        with self._lock:
+                            if self._process is not process:
+                                return False
+                            self._ready = True
+                        log(f"pandoc server started on port {port}")
+                        return True
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.05)
+        else:
+            log("pandoc server did not become ready in time")
+
+        with self._lock:
+            if self._process is process:
+                self._process = None
+        self._terminate(process)
+        return False
+
+    def convert(
+        self,
+        text: str,
+        *,
+        from_format: str,
+        to_format: str,
+        wrap: str = "none",
+        timeout: float = 30.0,
+    ) -> str:
+        """
+        通过 server 转换文本
+
+        Raises:
+            PandocError: server 未就绪（启动中/已崩溃/退避中）或转换失败时
+        """
+        with self._lock:
+            process, port, ready = self._process, self._port, self._ready
+            alive = process is not None and process.poll() is None
+            if process is not None and not alive:
+                log(f"pandoc server exited unexpectedly (code {process.returncode})")
+                self._process = None
+                self._ready = False
+                self._record_failure_locked()
+
+        if not alive:
+            # 后台按退避重启，本次交给子进程
+            self.start_async()
+            raise PandocError("pandoc server is not running")
+        if not ready:
+            raise PandocError("pandoc server is still starting")
+
+        payload = json.dumps({
+            "text": text,
+            "from": from_format,
+            "to": to_format,
+            "wrap": wrap,
+        }).encode("utf-8")
+        request = urllib.request.Request(
+            self._url(port, "/"),
+            data=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            method="POST",
+        )
+
+        with self._request_lock:
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as resp:
+                    body = resp.read()
+            except urllib.error.HTTPError as e:
+                err = e.read().decode("utf-8", "ignore")
+                raise PandocError(err or f"pandoc server error: HTTP {e.code}")
+            except (urllib.error.URLError, OSError) as e:
+                raise PandocError(f"pandoc server request failed: {e}")
+
+        result = json.loads(body.decode("utf-8"))
+        if result.get("base64"):
+            raise PandocError("pandoc server returned binary output for a text conversion")
+        for message in result.get("messages") or []:
+            log(f"pandoc server message: {message}")
+        return result.get("output", "")
+
+    def stop(self) -> None:
+        """停止 server，之后不再自动重启"""
+        with self._lock:
+            self._stopped = True
+            self._ready = False
+            process = self._process
+            self._process = None
+        if process is not None:
+            self._terminate(process)
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen) -> None:
+        if process.poll() is not None:
+            return
+        try:
+            process.terminate()
+            process.wait(timeout=2)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _url(port: Optional[int], path: str) -> str:
+        return f"http://127.0.0.1:{port}{path}"
+
+    @staticmethod
+    def _pick_free_port() -> int:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
@@ -2,22 +2,84 @@
 
 from __future__ import annotations
 
-import datetime as _dt
+import functools
 import subprocess
+import time
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable, Optional, Tuple
+from typing import Callable, NamedTuple, Optional, Tuple
 
 from ...i18n import t
 from ...utils.logging import log
+from ...utils.system_detect import is_macos
 
 
 _Status = Optional[bool]
 
+_SETTINGS_URL_PREFIX = "x-apple.systempreferences:com.apple.preference.security?"
+
+
+def _ax_is_process_trusted_ctypes() -> _Status:
+    """ctypes fallback：直接调 ApplicationServices 的 AXIsProcessTrusted。"""
+    try:
+        import ctypes
+        app_services = ctypes.CDLL(
+            "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
+        )
+
+        # Boolean AXIsProcessTrusted(void);
+        app_services.AXIsProcessTrusted.restype = ctypes.c_bool
+        app_services.AXIsProcessTrusted.argtypes = []
+        return bool(app_services.AXIsProcessTrusted())
+    except Exception as exc:
+        log(f"AXIsProcessTrusted failed (ctypes): {exc}")
+        return None
+
+
+class _PermissionSpec(NamedTuple):
+    key: str
+    preflight: Tuple[str, ...]
+    request: Optional[str]
+    prompt_option: Optional[str]
+    pane: str
+    fallback: Optional[Callable[[], _Status]] = None
+
+
+_AUTOMATION_SPEC = _PermissionSpec("automation", (), None, None, "Privacy_Automation")
+
+# 权限表：Quartz 检查函数（按顺序尝试）、请求函数、提示选项常量、系统设置面板
+_PERMISSION_SPECS = (
+    _PermissionSpec(
+        "accessibility",
+        ("AXIsProcessTrustedWithOptions", "AXIsProcessTrusted"),
+        "AXIsProcessTrustedWithOptions",
+        "kAXTrustedCheckOptionPrompt",
+        "Privacy_Accessibility",
+        _ax_is_process_trusted_ctypes,
+    ),
+    _PermissionSpec(
+        "screen_recording",
+        ("CGPreflightScreenCaptureAccess",),
+        "CGRequestScreenCaptureAccess",
+        None,
+        "Privacy_ScreenCapture",
+    ),
+    _PermissionSpec(
+        "input_monitoring",
+        ("CGPreflightListenEventAccess",),
+        "CGRequestListenEventAccess",
+        None,
+        "Privacy_ListenEvent",
+    ),
+    _AUTOMATION_SPEC,
+)
+
 
 class MacOSPermissionsTab:
     """Build and manage the macOS permissions page."""
 
+    _IS_MAC = is_macos()
+
     def __init__(self, notebook: ttk.Notebook, root: tk.Tk):
         self.notebook = notebook
         self.root = root
@@ -29,9 +91,15 @@ class MacOSPermissionsTab:
         self._refresh_interval_ms = 2000
         self._last_checked_var = tk.StringVar(value=t("settings.permissions.last_checked", time="--:--:--"))
 
+        if not self._IS_MAC:
+            # 非 macOS 平台不做任何检查与轮询
+            ttk.Label(self.frame, text=t("settings.permissions.macos_only")).pack(anchor=tk.W)
+            return
+
         self._build_ui()
         self.refresh()
         self._schedule_refresh()
+        self._bind_visibility_events()
 
     def select(self) -> None:
         """Select this tab in the notebook."""
@@ -42,6 +110,8 @@ class MacOSPermissionsTab:
 
     def refresh(self) -> None:
         """Refresh permissions status."""
+        if not self._IS_MAC:
+            return
         for item in self._items:
             status = self._safe_check(item["checker"])
             status_text, status_color = self._format_status(status)
@@ -52,16 +122,21 @@ class MacOSPermissionsTab:
                 pass
             self._update_request_button(item, status)
 
-        timestamp = _dt.datetime.now().strftime("%H:%M:%S")
+        lt = time.localtime()
+        timestamp = f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
         self._last_checked_var.set(t("settings.permissions.last_checked", time=timestamp))
 
     def _schedule_refresh(self) -> None:
-        if not self._is_alive():
+        if not self._IS_MAC or not self._is_alive():
             return
 
         def _tick():
             if not self._is_alive():
                 return
+            if not self._is_visible():
+                # 窗口最小化/隐藏时不做任何检查，仅保持轮询节奏
+                self._schedule_refresh()
+                return
             try:
                 self.refresh()
             except Exception as exc:
@@ -125,37 +200,14 @@ class MacOSPermissionsTab:
 
         self._items = [
             self._make_item(
-                key="accessibility",
-                title=t("settings.permissions.accessibility.title"),
-                desc=t("settings.permissions.accessibility.desc"),
-                checker=self._check_accessibility,
-                open_settings=self._open_accessibility_settings,
-                request_access=self._request_accessibility,
-            ),
-            self._make_item(
-                key="screen_recording",
-                title=t("settings.permissions.screen_recording.title"),
-                desc=t("settings.permissions.screen_recording.desc"),
-                checker=self._check_screen_recording,
-                open_settings=self._open_screen_recording_settings,
-                request_access=self._request_screen_recording,
-            ),
-            self._make_item(
-                key="input_monitoring",
-                title=t("settings.permissions.input_monitoring.title"),
-                desc=t("settings.permissions.input_monitoring.desc"),
-                checker=self._check_input_monitoring,
-                open_settings=self._open_input_monitoring_settings,
-                request_access=self._request_input_monitoring,
-            ),
-            self._make_item(
-                key="automation",
-                title=t("settings.permissions.automation.title"),
-                desc=t("settings.permissions.automation.desc"),
-                checker=self._check_automation,
-                open_settings=self._open_automation_settings,
-                request_access=self._request_automation,
-            ),
+                key=spec.key,
+                title=t(f"settings.permissions.{spec.key}.title"),
+                desc=t(f"settings.permissions.{spec.key}.desc"),
+                checker=functools.partial(self._check, spec),
+                open_settings=functools.partial(self._open, spec),
+                request_access=functools.partial(self._request, spec),
+            )
+            for spec in _PERMISSION_SPECS
         ]
 
         for index, item in enumerate(self._items, start=1):
@@ -259,43 +311,68 @@ class MacOSPermissionsTab:
         except Exception as exc:
             log(f"Failed to update request button: {exc}")
 
-    def _check_accessibility(self) -> _Status:
-        # 1) Quartz 路线（最简单）
+    def _check(self, spec: _PermissionSpec) -> _Status:
+        if not self._IS_MAC:
+            return None
+        if spec.key == "automation":
+            return self._check_automation()
+
         try:
             import Quartz
-            if hasattr(Quartz, "AXIsProcessTrustedWithOptions"):
-                try:
-                    # 常量通常就是这个
-                    prompt_key = getattr(Quartz, "kAXTrustedCheckOptionPrompt", None)
-                    options = {prompt_key: False} if prompt_key is not None else {}
-                    return bool(Quartz.AXIsProcessTrustedWithOptions(options))
-                except Exception as exc:
-                    log(f"AXIsProcessTrustedWithOptions failed (Quartz): {exc}")
+        except Exception as exc:
+            # Quartz 不可用，不要当成“缺权限”
+            log(f"Quartz not available for {spec.key} check: {exc}")
+            Quartz = None
 
-            if hasattr(Quartz, "AXIsProcessTrusted"):
+        if Quartz is not None:
+            for name in spec.preflight:
+                if not hasattr(Quartz, name):
+                    continue
                 try:
-                    return bool(Quartz.AXIsProcessTrusted())
+                    return bool(self._call_quartz(Quartz, name, spec, prompt=False))
                 except Exception as exc:
-                    log(f"AXIsProcessTrusted failed (Quartz): {exc}")
+                    log(f"{name} failed (Quartz): {exc}")
 
-        except Exception as exc:
-            # Quartz 不可用，不要当成“缺权限”
-            log(f"Quartz not available for accessibility check: {exc}")
+        if spec.fallback is not None:
+            return spec.fallback()
+        return None
+
+    def _request(self, spec: _PermissionSpec) -> None:
+        if spec.key == "automation":
+            self._request_automation()
+            return
 
-        # 2) ctypes fallback：直接调 ApplicationServices
         try:
-            import ctypes
-            app_services = ctypes.CDLL(
-                "/System/Library/Frameworks/ApplicationServices.framework/ApplicationServices"
-            )
+            import Quartz
+        except Exception as exc:
+            log(f"Quartz not available for {spec.key} request: {exc}")
+            self._open(spec)
+            return
 
-            # Boolean AXIsProcessTrusted(void);
-            app_services.AXIsProcessTrusted.restype = ctypes.c_bool
-            app_services.AXIsProcessTrusted.argtypes = []
-            return bool(app_services.AXIsProcessTrusted())
+        if not spec.request or not hasattr(Quartz, spec.request):
+            self._open(spec)
+            return
+
+        try:
+            self._call_quartz(Quartz, spec.request, spec, prompt=True)
         except Exception as exc:
-            log(f"AXIsProcessTrusted failed (ctypes): {exc}")
-            return None
+            log(f"{spec.key} request failed: {exc}")
+            self._open(spec)
+        else:
+            self.root.after(1200, self.refresh)
+
+    def _open(self, spec: _PermissionSpec) -> None:
+        self._open_system_settings(_SETTINGS_URL_PREFIX + spec.pane)
+
+    @staticmethod
+    def _call_quartz(quartz, name: str, spec: _PermissionSpec, *, prompt: bool):
+        func = getattr(quartz, name)
+        # AXIsProcessTrustedWithOptions 需要传入 {kAXTrustedCheckOptionPrompt: bool}
+        if spec.prompt_option and name.endswith("WithOptions"):
+            prompt_key = getattr(quartz, spec.prompt_option, None)
+            options = {prompt_key: prompt} if prompt_key is not None else {}
+            return func(options)
+        return func()
 
     def _check_automation(self) -> _Status:
         script = 'tell application "System Events" to get name of processes'
@@ -322,132 +399,78 @@ class MacOSPermissionsTab:
             return False
         return None
 
-    def _check_screen_recording(self) -> _Status:
-        try:
-            import Quartz
-        except Exception as exc:
-            log(f"Quartz not available for screen recording check: {exc}")
-            return None
-
-        if hasattr(Quartz, "CGPreflightScreenCaptureAccess"):
-            try:
-                return bool(Quartz.CGPreflightScreenCaptureAccess())
-            except Exception as exc:
-                log(f"CGPreflightScreenCaptureAccess failed: {exc}")
-                return None
-        return None
-
-    def _check_input_monitoring(self) -> _Status:
-        try:
-            import Quartz
-        except Exception as exc:
-            log(f"Quartz not available for input monitoring check: {exc}")
-            return None
-
-        if hasattr(Quartz, "CGPreflightListenEventAccess"):
-            try:
-                return bool(Quartz.CGPreflightListenEventAccess())
-            except Exception as exc:
-                log(f"CGPreflightListenEventAccess failed: {exc}")
-                return None
-        return None
-
-    def _open_accessibility_settings(self) -> None:
-        self._open_system_settings("x-apple.systempreferences:com.apple.preference.security?Privacy_Accessibility")
-
-    def _request_accessibility(self) -> None:
-        try:
-            import Quartz
-        except Exception as exc:
-            log(f"Quartz not available for accessibility request: {exc}")
-            self._open_accessibility_settings()
-            return
-
+    def _request_automation(self) -> None:
+        script = 'tell application "System Events" to get name of processes'
         try:
-            prompt_key = getattr(Quartz, "kAXTrustedCheckOptionPrompt", None)
-            if prompt_key is None and hasattr(Quartz, "kAXTrustedCheckOptionPrompt"):
-                prompt_key = Quartz.kAXTrustedCheckOptionPrompt
-            if hasattr(Quartz, "AXIsProcessTrustedWithOptions"):
-                Quartz.AXIsProcessTrustedWithOptions({prompt_key: True})
-            else:
-                Quartz.AXIsProcessTrusted()
+            # 只需触发系统授权弹窗，不等待 osascript 返回，避免阻塞 Tk 主循环
+            subprocess.Popen(
+                ["osascript", "-e", script],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+            )
         except Exception as exc:
-            log(f"Accessibility request failed: {exc}")
-            self._open_accessibility_settings()
+            log(f"Automation request failed: {exc}")
+            self._open(_AUTOMATION_SPEC)
         else:
             self.root.after(1200, self.refresh)
 
-    def _open_screen_recording_settings(self) -> None:
-        self._open_system_settings("x-apple.systempreferences:com.apple.preference.security?Privacy_ScreenCapture")
-
-    def _request_screen_recording(self) -> None:
-        try:
-            import Quartz
-        except Exception as exc:
-            log(f"Quartz not available for screen recording request: {exc}")
-            self._open_screen_recording_settings()
-            return
-
+    def _open_system_settings(self, url: str) -> None:
+        # 优先直接调用 LaunchServices，省去 fork /usr/bin/open
         try:
-            if hasattr(Quartz, "CGRequestScreenCaptureAccess"):
-                Quartz.CGRequestScreenCaptureAccess()
-            else:
-                self._open_screen_recording_settings()
+            from CoreFoundation import CFURLCreateWithString
+            from LaunchServices import LSOpenCFURLRef
+
+            url_ref = CFURLCreateWithString(None, url, None)
+            if url_ref is not None:
+                result = LSOpenCFURLRef(url_ref, None)
+                status = result[0] if isinstance(result, tuple) else result
+                if status == 0:
+                    return
+                log(f"LSOpenCFURLRef failed with status {status}")
         except Exception as exc:
-            log(f"Screen recording request failed: {exc}")
-            self._open_screen_recording_settings()
-        else:
-            self.root.after(1200, self.refresh)
-
-    def _open_input_monitoring_settings(self) -> None:
-        self._open_system_settings("x-apple.systempreferences:com.apple.preference.security?Privacy_ListenEvent")
+            log(f"LSOpenCFURLRef unavailable, falling back to open(1): {exc}")
 
-    def _request_input_monitoring(self) -> None:
         try:
-            import Quartz
+            subprocess.Popen(
+                ["open", url],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=True,
+            )
         except Exception as exc:
-            log(f"Quartz not available for input monitoring request: {exc}")
-            self._open_input_monitoring_settings()
-            return
+            log(f"Failed to open System Settings: {exc}")
 
+    def _bind_visibility_events(self) -> None:
         try:
-            if hasattr(Quartz, "CGRequestListenEventAccess"):
-                Quartz.CGRequestListenEventAccess()
-            else:
-                self._open_input_monitoring_settings()
+            toplevel = self.frame.winfo_toplevel()
+            toplevel.bind("<Map>", self._on_window_mapped, add="+")
         except Exception as exc:
-            log(f"Input monitoring request failed: {exc}")
-            self._open_input_monitoring_settings()
-        else:
-            self.root.after(1200, self.refresh)
+            log(f"Failed to bind permissions visibility events: {exc}")
 
-    def _open_automation_settings(self) -> None:
-        self._open_system_settings("x-apple.systempreferences:com.apple.preference.security?Privacy_Automation")
-
-    def _request_automation(self) -> None:
-        script = 'tell application "System Events" to get name of processes'
+    def _on_window_mapped(self, event) -> None:
+        # 只响应顶层窗口本身的 Map 事件，忽略子控件
+        if event.widget is not self.frame.winfo_toplevel():
+            return
+        if self._refresh_job is not None:
+            try:
+                self.root.after_cancel(self._refresh_job)
+            except Exception:
+                pass
+            self._refresh_job = None
         try:
-            subprocess.run(
-                ["osascript", "-e", script],
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                timeout=2,
-            )
-        except subprocess.TimeoutExpired:
-            self._open_automation_settings()
+            self.refresh()
         except Exception as exc:
-            log(f"Automation request failed: {exc}")
-            self._open_automation_settings()
-        else:
-            self.root.after(1200, self.refresh)
+            log(f"Failed to refresh permissions status: {exc}")
+        self._schedule_refresh()
 
-    def _open_system_settings(self, url: str) -> None:
+    def _is_visible(self) -> bool:
         try:
-            subprocess.run(["open", url], check=False)
-        except Exception as exc:
-            log(f"Failed to open System Settings: {exc}")
+            if self.root.state() == "iconic":
+                return False
+            return bool(self.root.winfo_viewable())
+        except Exception:
+            return False
 
     def _is_alive(self) -> bool:
         try:
@@ -1,10 +1,11 @@
 """Tray menu construction and callbacks."""
 
+import atexit
 import os
 import subprocess
 import pystray
 import threading
-import webbrowser
+from functools import lru_cache
 from typing import Optional
 
 from ... import __version__
@@ -30,8 +31,26 @@ except Exception:  # pragma: no cover
     begin_ui_session = end_ui_session = activate_app = lambda *args, **kwargs: None
 
 
+@lru_cache(maxsize=512)
+def _t_cached(lang: str, key: str, items: tuple) -> str:
+    """按 (语言, key, 参数) 缓存菜单文案，切换语言后需 cache_clear()"""
+    return t(key, **dict(items))
+
+
+def _label(key: str, **kwargs) -> str:
+    """菜单文案翻译（带缓存）"""
+    return _t_cached(get_language(), key, tuple(sorted(kwargs.items())))
+
+
+def _dynamic_label(key: str, **kwargs):
+    """返回菜单项文本回调，切换语言后 update_menu 即可刷新文案"""
+    return lambda item: _label(key, **kwargs)
+
+
 class TrayMenuManager:
     """托盘菜单管理器"""
+
+    _SAVE_DELAY = 0.5  # 配置写盘合并窗口（秒）
     
     def __init__(self, config_loader: ConfigLoader, notification_manager: NotificationManager):
         self.config_loader = config_loader
@@ -44,6 +63,16 @@ class TrayMenuManager:
         self.latest_release_url = None  # 存储最新版本的下载链接
         self.hotkey_dialog = None
         self.settings_dialog = None
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        # 任何退出路径（热键退出、未捕获异常、注销等）都写入待保存的配置
+        atexit.register(self.flush_pending_save)
+        self._menu: Optional[pystray.Menu] = None
+        # checked 回调只创建一次
+        self._no_app_action_checks = {
+            action: (lambda item, action=action: self._get_no_app_action() == action)
+            for action in ("open", "save", "clipboard", "none")
+        }
     
     def set_restart_hotkey_callback(self, callback):
         """设置重启热键的回调函数"""
@@ -58,88 +87,134 @@ class TrayMenuManager:
         self.resume_hotkey_callback = callback
     
     def build_menu(self) -> pystray.Menu:
-        """构建托盘菜单"""
-        config = app_state.config
+        """构建托盘菜单（只构建一次；文本与复选状态均为回调，update_menu 时实时求值）"""
+        if self._menu is None:
+            self._menu = pystray.Menu(*self._build_menu_items())
+        return self._menu
 
+    def _build_menu_items(self) -> tuple:
+        """生成托盘菜单项"""
         # 构建常规菜单项
         normal_menu_items = [
             pystray.MenuItem(
-                t("tray.menu.hotkey_display", hotkey=app_state.config['hotkey']),
-                lambda icon, item: None,
+                # 文本为可调用对象，热键变化时无需重建菜单，update_menu 即可刷新
+                self._hotkey_label,
+                self._noop,
                 enabled=False
             ),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(
-                t("tray.menu.enable_hotkey"),
+                _dynamic_label("tray.menu.enable_hotkey"),
                 self._on_toggle_enabled,
-                checked=lambda item: app_state.enabled
+                checked=self._is_hotkey_enabled
             ),
             pystray.MenuItem(
-                t("tray.menu.show_notifications"),
+                _dynamic_label("tray.menu.show_notifications"),
                 self._on_toggle_notify,
-                checked=lambda item: config.get("notify", True)
+                checked=self._is_notify_enabled
             )
         ]
 
         if is_windows():
             normal_menu_items.append(
                 pystray.MenuItem(
-                    t("tray.menu.move_cursor"),
+                    _dynamic_label("tray.menu.move_cursor"),
                     self._on_toggle_move_cursor,
-                    checked=lambda item: config.get("move_cursor_to_end", True)
+                    checked=self._is_move_cursor_enabled
                 )
             )
 
-        # 构建版本菜单项
+        # 构建版本菜单项（检测到新版本后同一项切换为“新版本”入口）
         version_menu_items = [
             pystray.MenuItem(
-                t("tray.menu.current_version", version=__version__),
-                lambda icon, item: None,
+                _dynamic_label("tray.menu.current_version", version=__version__),
+                self._noop,
                 enabled=False
             ),
+            pystray.MenuItem(self._version_label, self._on_version_item),
         ]
-        if self.latest_version:
-            version_menu_items.append(
-                pystray.MenuItem(
-                    t("tray.menu.new_version", version=self.latest_version),
-                    self._on_open_release_page,
-                    enabled=True
-                )
-            )
-        else:
-            version_menu_items.append(
-                pystray.MenuItem(
-                    t("tray.menu.check_update"),
-                    self._on_check_update
-                )
-            )
 
-        return pystray.Menu(
+        return (
             *normal_menu_items,
             self._build_no_app_action_menu(),
             self._build_html_formatting_menu(),
             pystray.Menu.SEPARATOR,
-            pystray.MenuItem(t("tray.menu.set_hotkey"), self._on_set_hotkey),
+            pystray.MenuItem(_dynamic_label("tray.menu.set_hotkey"), self._on_set_hotkey),
             pystray.Menu.SEPARATOR,
             pystray.MenuItem(
-                t("tray.menu.keep_file"),
+                _dynamic_label("tray.menu.keep_file"),
                 self._on_toggle_keep,
-                checked=lambda item: config.get("keep_file", False)
+                checked=self._is_keep_file_enabled
             ),
             pystray.Menu.SEPARATOR,
-            pystray.MenuItem(t("tray.menu.open_save_dir"), self._on_open_save_dir),
-            pystray.MenuItem(t("tray.menu.open_log"), self._on_open_log),
+            pystray.MenuItem(_dynamic_label("tray.menu.open_save_dir"), self._on_open_save_dir),
+            pystray.MenuItem(_dynamic_label("tray.menu.open_log"), self._on_open_log),
             pystray.Menu.SEPARATOR,
-            pystray.MenuItem(t("settings.dialog.title"), self._on_open_settings),
+            pystray.MenuItem(_dynamic_label("settings.dialog.title"), self._on_open_settings),
             pystray.Menu.SEPARATOR,
             *version_menu_items,
             pystray.MenuItem(
-                t("tray.menu.about"),
+                _dynamic_label("tray.menu.about"),
                 self._on_open_about_page
             ),
-            pystray.MenuItem(t("tray.menu.quit"), self._on_quit)
+            pystray.MenuItem(_dynamic_label("tray.menu.quit"), self._on_quit)
         )
 
+    # 菜单项 text/checked 回调（绑定方法，避免每次构建菜单创建新的闭包）
+    def _noop(self, icon, item):
+        pass
+
+    def _hotkey_label(self, item) -> str:
+        # 文本为可调用对象，热键变化时无需重建菜单，update_menu 即可刷新
+        return _label("tray.menu.hotkey_display", hotkey=app_state.config['hotkey'])
+
+    def _is_hotkey_enabled(self, item) -> bool:
+        return app_state.enabled
+
+    def _version_label(self, item) -> str:
+        if self.latest_version:
+            return _label("tray.menu.new_version", version=self.latest_version)
+        return _label("tray.menu.check_update")
+
+    def _on_version_item(self, icon, item):
+        if self.latest_version:
+            self._on_open_release_page(icon, item)
+        else:
+            self._on_check_update(icon, item)
+
+    def _is_notify_enabled(self, item) -> bool:
+        return app_state.config.get("notify", True)
+
+    def _is_move_cursor_enabled(self, item) -> bool:
+        return app_state.config.get("move_cursor_to_end", True)
+
+    def _is_keep_file_enabled(self, item) -> bool:
+        return app_state.config.get("keep_file", False)
+
+    def _is_html_strikethrough_enabled(self, item) -> bool:
+        return app_state.config["html_formatting"]["strikethrough_to_del"]
+
+    def _run_on_ui(self, func) -> None:
+        """将菜单相关操作投递到主线程 UI 队列（pystray 回调可能来自其他线程）"""
+        ui_queue = getattr(app_state, "ui_queue", None)
+        if ui_queue is not None:
+            ui_queue.put(func)
+        else:
+            func()
+
+    def _refresh_menu(self, icon) -> None:
+        """通知 pystray 重新生成菜单项并求值 checked/text 回调"""
+        if icon is None or not hasattr(icon, "update_menu"):
+            return
+
+        def _apply():
+            try:
+                icon.update_menu()
+            except Exception as e:
+                log(f"Failed to update tray menu: {e}")
+
+        self._run_on_ui(_apply)
+
     # 菜单回调函数
     def _on_toggle_enabled(self, icon, item):
         """切换热键启用状态"""
@@ -147,7 +222,7 @@ class TrayMenuManager:
         icon.icon = create_status_icon(ok=app_state.enabled)
         
         status = t("tray.status.hotkey_enabled") if app_state.enabled else t("tray.status.hotkey_paused")
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         self.notification_manager.notify("PasteMD", status, ok=app_state.enabled)
     
     def _on_set_hotkey(self, icon, item):
@@ -175,9 +250,7 @@ class TrayMenuManager:
                 
                 # 刷新菜单
                 try:
-                    icon.menu = self.build_menu()
-                    if hasattr(icon, "update_menu"):
-                        icon.update_menu()
+                    self._refresh_menu(icon)
                 except Exception as e:
                     log(f"Failed to refresh tray menu after hotkey save: {e}")
 
@@ -260,7 +333,7 @@ class TrayMenuManager:
         current = app_state.config.get("notify", True)
         app_state.config["notify"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         if app_state.config["notify"]:
             self.notification_manager.notify("PasteMD", t("tray.status.notifications_enabled"), ok=True)
         else:
@@ -271,42 +344,26 @@ class TrayMenuManager:
         current = app_state.config.get("move_cursor_to_end", True)
         app_state.config["move_cursor_to_end"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         status = t("tray.status.move_cursor_on") if app_state.config["move_cursor_to_end"] else t("tray.status.move_cursor_off")
         self.notification_manager.notify("PasteMD", status, ok=True)
         
-    def _on_toggle_excel(self, icon, item):
-        """切换启用 Excel 插入"""
-        current = app_state.config.get("enable_excel", True)
-        app_state.config["enable_excel"] = not current
-        self._save_config()
-        icon.menu = self.build_menu()
-        status = t("tray.status.excel_insert_on") if app_state.config["enable_excel"] else t("tray.status.excel_insert_off")
-        self.notification_manager.notify("PasteMD", status, ok=True)
-        
-    def _on_toggle_excel_format(self, icon, item):
-        """切换 Excel 粘贴时是否保留格式"""
-        current = app_state.config.get("excel_keep_format", True)
-        app_state.config["excel_keep_format"] = not current
-        self._save_config()
-        icon.menu = self.build_menu()
-        status = t("tray.status.excel_format_on") if app_state.config["excel_keep_format"] else t("tray.status.excel_format_off")
-        self.notification_manager.notify("PasteMD", status, ok=True)
-    
     def _on_toggle_keep(self, icon, item):
         """切换保留文件状态"""
         current = app_state.config.get("keep_file", False)
         app_state.config["keep_file"] = not current
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         status = t("tray.status.keep_file_on") if app_state.config["keep_file"] else t("tray.status.keep_file_off")
         self.notification_manager.notify("PasteMD", status, ok=True)
     
     def _on_open_save_dir(self, icon, item):
         """打开保存目录"""
-        save_dir = app_state.config.get("save_dir", "")
-        save_dir = os.path.expandvars(save_dir)
-        ensure_dir(save_dir)
+        save_dir = app_state.resolved_save_dir
+        if save_dir is None or not os.path.isdir(save_dir):
+            save_dir = os.path.expandvars(app_state.config.get("save_dir", ""))
+            ensure_dir(save_dir)
+            app_state.resolved_save_dir = save_dir
         open_dir(save_dir)
     
     def _on_open_log(self, icon, item):
@@ -331,12 +388,11 @@ class TrayMenuManager:
             """设置保存后的回调"""
             # 刷新菜单以反映可能的配置更改（如语言）
             set_language(app_state.config.get("language", "en-US"))
+            _t_cached.cache_clear()
+            app_state.resolved_save_dir = None
             try:
                 tray_icon = icon or getattr(app_state, "icon", None)
-                if tray_icon is not None:
-                    tray_icon.menu = self.build_menu()
-                    if hasattr(tray_icon, "update_menu"):
-                        tray_icon.update_menu()
+                self._refresh_menu(tray_icon)
             except Exception as e:
                 log(f"Failed to refresh tray menu after settings save: {e}")
 
@@ -394,12 +450,12 @@ class TrayMenuManager:
     def _build_html_formatting_menu(self) -> pystray.MenuItem:
         """构建 HTML 格式化子菜单"""
         return pystray.MenuItem(
-            t("tray.menu.html_formatting"),
+            _dynamic_label("tray.menu.html_formatting"),
             pystray.Menu(
                 pystray.MenuItem(
-                    t("tray.menu.strikethrough_to_del"),
+                    _dynamic_label("tray.menu.strikethrough_to_del"),
                     self._on_toggle_html_strikethrough,
-                    checked=lambda item: self._get_html_formatting_option("strikethrough_to_del", True),
+                    checked=self._is_html_strikethrough_enabled,
                 ),
             ),
         )
@@ -407,27 +463,27 @@ class TrayMenuManager:
     def _build_no_app_action_menu(self) -> pystray.MenuItem:
         """构建无应用时动作子菜单"""
         return pystray.MenuItem(
-            t("tray.menu.no_app_action"),
+            _dynamic_label("tray.menu.no_app_action"),
             pystray.Menu(
                 pystray.MenuItem(
-                    t("action.open"),
+                    _dynamic_label("action.open"),
                     self._on_set_no_app_action,
-                    checked=lambda item: self._get_no_app_action() == "open",
+                    checked=self._no_app_action_checks["open"],
                 ),
                 pystray.MenuItem(
-                    t("action.save"),
+                    _dynamic_label("action.save"),
                     self._on_set_no_app_action,
-                    checked=lambda item: self._get_no_app_action() == "save",
+                    checked=self._no_app_action_checks["save"],
                 ),
                 pystray.MenuItem(
-                    t("action.clipboard"),
+                    _dynamic_label("action.clipboard"),
                     self._on_set_no_app_action,
-                    checked=lambda item: self._get_no_app_action() == "clipboard",
+                    checked=self._no_app_action_checks["clipboard"],
                 ),
                 pystray.MenuItem(
-                    t("action.none"),
+                    _dynamic_label("action.none"),
                     self._on_set_no_app_action,
-                    checked=lambda item: self._get_no_app_action() == "none",
+                    checked=self._no_app_action_checks["none"],
                 ),
             ),
         )
@@ -449,7 +505,7 @@ class TrayMenuManager:
         new_action = reverse_action_map.get(clicked_text, "open")
         app_state.config["no_app_action"] = new_action
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
         
         # 显示状态通知
         status_map = {
@@ -462,26 +518,15 @@ class TrayMenuManager:
         status = status_map.get(new_action, "")
         self.notification_manager.notify("PasteMD", status, ok=True)
 
-    def _get_html_formatting_option(self, key: str, default: bool) -> bool:
-        options = app_state.config.get("html_formatting", {})
-        if isinstance(options, dict):
-            return bool(options.get(key, default))
-        return default
-
     def _on_toggle_html_strikethrough(self, icon, item):
         """切换删除线转 <del> 的 HTML 格式化配置"""
-        current = self._get_html_formatting_option("strikethrough_to_del", True)
-        if not isinstance(app_state.config.get("html_formatting"), dict):
-            app_state.config["html_formatting"] = {}
-        app_state.config["html_formatting"]["strikethrough_to_del"] = not current
+        html_formatting = app_state.config["html_formatting"]
+        enabled = not html_formatting["strikethrough_to_del"]
+        html_formatting["strikethrough_to_del"] = enabled
         self._save_config()
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
 
-        status = (
-            t("tray.status.html_strike_on")
-            if app_state.config["html_formatting"].get("strikethrough_to_del", True)
-            else t("tray.status.html_strike_off")
-        )
+        status = t("tray.status.html_strike_on") if enabled else t("tray.status.html_strike_off")
         self.notification_manager.notify("PasteMD", status, ok=True)
     
     def _on_check_update(self, icon, item):
@@ -489,11 +534,9 @@ class TrayMenuManager:
         # 在后台线程中检查更新，避免阻塞 UI
         def check_in_background():
             try:
-                # 导入版本号
-                from ... import __version__
-                
-                checker = VersionChecker(__version__)
-                result = checker.check_update()
+                if self.version_checker is None:
+                    self.version_checker = VersionChecker(__version__)
+                result = self.version_checker.check_update()
                 
                 if result is None:
                     # 网络错误或检查失败
@@ -520,6 +563,7 @@ class TrayMenuManager:
                     
                     # 自动打开下载页面
                     try:
+                        import webbrowser
                         webbrowser.open(release_url)
                     except Exception as e:
                         log(f"Failed to open browser: {e}")
@@ -553,6 +597,7 @@ class TrayMenuManager:
         """打开发布页面"""
         if self.latest_release_url:
             try:
+                import webbrowser
                 webbrowser.open(self.latest_release_url)
                 log(f"Opening release page: {self.latest_release_url}")
             except Exception as e:
@@ -564,10 +609,10 @@ class TrayMenuManager:
                 )
 
     def update_version_info(self, icon, latest_version: str, release_url: str):
-        """更新最新版本信息"""
+        """更新最新版本信息（可在后台线程调用，菜单刷新在主线程完成）"""
         self.latest_version = latest_version
         self.latest_release_url = release_url
-        icon.menu = self.build_menu()
+        self._refresh_menu(icon)
     
     def _on_open_about_page(self, icon, item):
         """打开关于页面"""
@@ -577,6 +622,7 @@ class TrayMenuManager:
         else:
             about_url = "http://pastemd.richqaq.cn"
         try:
+            import webbrowser
             webbrowser.open(about_url)
             log(f"Opening about page: {about_url}")
         except Exception as e:
@@ -589,6 +635,7 @@ class TrayMenuManager:
     
     def _on_quit(self, icon, item):
         """退出应用程序"""
+        self.flush_pending_save()
         icon.stop()
         
         # 设置退出事件（AppState 中已经声明了这个属性）
@@ -606,8 +653,26 @@ class TrayMenuManager:
                 log(f"Failed to send quit signal: {e}")
     
     def _save_config(self):
-        """保存配置"""
-        try:
-            self.config_loader.save(app_state.config)
-        except Exception as e:
-            log(f"Failed to save config: {e}")
+        """保存配置（500ms 内的连续修改合并为一次写盘）"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(self._SAVE_DELAY, self._flush_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush_pending_save(self) -> None:
+        """若有尚未写盘的配置修改则立即写入（退出时调用）"""
+        if self._save_timer is not None:
+            self._flush_save()
+
+    def _flush_save(self):
+        """立即写入待保存的配置"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            try:
+                self.config_loader.save(app_state.config)
+            except Exception as e:
+                log(f"Failed to save config: {e}")
@@ -1,24 +1,28 @@
 """Document generator - centralized DOCX generation and conversion."""
 
-from typing import Optional, List
+import logging
+from typing import Optional, List, Tuple
 
 from ...integrations.pandoc import PandocIntegration
 from ...utils.docx_processor import DocxProcessor
-from ...utils.logging import log
+from ...utils.logging import log, is_enabled_for
 from ...core.state import app_state
 from ...core.errors import PandocError
 from ...config.defaults import DEFAULT_CONFIG
 from ...config.loader import ConfigLoader
 
 
-_DEFAULT_PANDOC_REQUEST_HEADERS: List[str] = [
-    "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-]
+_DEFAULT_PANDOC_REQUEST_HEADERS: Tuple[str, ...] = (
+    "User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+)
+
+_MISSING = object()
+_UNSET = object()
 
 
 def _get_pandoc_request_headers(config: dict) -> List[str]:
     if "pandoc_request_headers" not in config:
-        return _DEFAULT_PANDOC_REQUEST_HEADERS
+        return list(_DEFAULT_PANDOC_REQUEST_HEADERS)
 
     headers = config.get("pandoc_request_headers")
     if headers is None:
@@ -128,6 +132,34 @@ class DocumentGenerator:
     
     def __init__(self) -> None:
         self._pandoc_integration: Optional[PandocIntegration] = None
+        # 请求头规范化结果缓存：配置值对象不变（is 比较）时直接复用
+        self._headers_source: object = _UNSET
+        self._headers_cache: List[str] = []
+        self._headers_masked_for: Optional[List[str]] = None
+        self._headers_masked: Optional[str] = None
+
+    def _headers_for(self, config: dict) -> List[str]:
+        """返回规范化后的 pandoc 请求头，仅在配置值被替换时重新计算"""
+        raw = config.get("pandoc_request_headers", _MISSING)
+        if raw is not self._headers_source:
+            self._headers_cache = _get_pandoc_request_headers(config)
+            self._headers_source = raw
+        return self._headers_cache
+
+    def _log_request_headers(self, config: dict, request_headers: List[str]) -> None:
+        """记录生效的自定义请求头（脱敏结果随请求头缓存，仅在日志开启时计算）"""
+        if "pandoc_request_headers" not in config:
+            return
+        if not is_enabled_for(logging.INFO):
+            return
+        if self._headers_masked_for is not request_headers:
+            if tuple(request_headers) != _DEFAULT_PANDOC_REQUEST_HEADERS:
+                self._headers_masked = str(_mask_pandoc_request_headers(request_headers))
+            else:
+                self._headers_masked = None
+            self._headers_masked_for = request_headers
+        if self._headers_masked is not None:
+            log(f"pandoc_request_headers (effective): {self._headers_masked}")
     
     def _ensure_pandoc_integration(self) -> None:
         """
@@ -143,6 +175,11 @@ class DocumentGenerator:
         if self._pandoc_integration is not None:
             return
         
+        self._init_pandoc_integration()
+        if app_state.config.get("pandoc_server_mode", False):
+            self._pandoc_integration.enable_server()
+
+    def _init_pandoc_integration(self) -> None:
         pandoc_path = app_state.config.get("pandoc_path", "pandoc")
         try:
             self._pandoc_integration = PandocIntegration(pandoc_path)
@@ -181,11 +218,8 @@ class DocumentGenerator:
         """
         # 1. 转换为 DOCX 字节流
         self._ensure_pandoc_integration()
-        request_headers = _get_pandoc_request_headers(config)
-        if "pandoc_request_headers" in config and request_headers != _DEFAULT_PANDOC_REQUEST_HEADERS:
-            log(
-                f"pandoc_request_headers (effective): {_mask_pandoc_request_headers(request_headers)}"
-            )
+        request_headers = self._headers_for(config)
+        self._log_request_headers(config, request_headers)
         docx_bytes = self._pandoc_integration.convert_to_docx_bytes(
             md_text=md_text,
             reference_docx=config.get("reference_docx"),
@@ -234,11 +268,8 @@ class DocumentGenerator:
         """
         # 1. 转换为 DOCX 字节流
         self._ensure_pandoc_integration()
-        request_headers = _get_pandoc_request_headers(config)
-        if "pandoc_request_headers" in config and request_headers != _DEFAULT_PANDOC_REQUEST_HEADERS:
-            log(
-                f"pandoc_request_headers (effective): {_mask_pandoc_request_headers(request_headers)}"
-            )
+        request_headers = self._headers_for(config)
+        self._log_request_headers(config, request_headers)
         docx_bytes = self._pandoc_integration.convert_html_to_docx_bytes(
             html_text=html_text,
             reference_docx=config.get("reference_docx"),
@@ -307,11 +338,8 @@ class DocumentGenerator:
         将 Markdown 文本转换为 RTF 字节流（用于富文本粘贴兜底）。
         """
         self._ensure_pandoc_integration()
-        request_headers = _get_pandoc_request_headers(config)
-        if "pandoc_request_headers" in config and request_headers != _DEFAULT_PANDOC_REQUEST_HEADERS:
-            log(
-                f"pandoc_request_headers (effective): {_mask_pandoc_request_headers(request_headers)}"
-            )
+        request_headers = self._headers_for(config)
+        self._log_request_headers(config, request_headers)
         return self._pandoc_integration.convert_markdown_to_rtf_bytes(  # type: ignore[union-attr]
             md_text,
             Keep_original_formula=config.get("Keep_original_formula", True),
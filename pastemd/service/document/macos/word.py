@@ -7,6 +7,51 @@ from ....core.types import PlacementResult
 from ....utils.logging import log
 from ....i18n import t
 from ....config.paths import get_user_data_dir
+from ....utils.macos.osascript import error_output, run_compiled_applescript
+
+# 文件路径通过 argv 传入，脚本源码保持不变
+_INSERT_FILE_SCRIPT = """
+on run argv
+    set docPath to item 1 of argv
+    tell application "Microsoft Word"
+        activate
+        if (count of documents) is 0 then
+            make new document
+        end if
+
+        -- 如果当前有选区，先删除再插入（否则 insert file 会“插入”而不是“替换”）
+        try
+            set selRange to text object of selection
+            if (start of selRange) is not (end of selRange) then
+                delete selRange
+            end if
+        on error
+            try
+                delete selection
+            end try
+        end try
+
+        -- 在当前光标位置插入文件（插入后 selection 通常会选中新内容）
+        set targetRange to text object of selection
+        insert file at targetRange file name docPath
+    end tell
+end run
+"""
+_INSERT_FILE_SCRIPT_NAME = "pastemd_word_insert"
+
+# 小于该大小的文档直接覆盖写入固定路径
+_DIRECT_WRITE_LIMIT = 64 * 1024
+
+
+def _write_all(path: str, data: bytes) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
 
 
 class WordPlacer(BaseDocumentPlacer):
@@ -20,13 +65,14 @@ class WordPlacer(BaseDocumentPlacer):
         os.makedirs(temp_dir, exist_ok=True)
         self._fixed_temp_path = os.path.join(temp_dir, "pastemd_word_insert.docx")
         log(f"Word 临时文件路径: {self._fixed_temp_path}")
+        # 插入脚本在首次粘贴时于后台预编译，之后直接执行 .scpt
+        self._script_dir = temp_dir
     
     def place(self, docx_bytes: bytes, config: dict) -> PlacementResult:
         """通过 AppleScript 插入,失败不降级"""
         try:
             # 使用固定路径写入临时文件（覆盖之前的）
-            with open(self._fixed_temp_path, 'wb') as f:
-                f.write(docx_bytes)
+            self._write_temp_file(docx_bytes)
             
             # 默认移动光标到末尾
             move_cursor_to_end = config.get("move_cursor_to_end", True)
@@ -45,6 +91,21 @@ class WordPlacer(BaseDocumentPlacer):
                 error=t("placer.macos_word.insert_failed", error=str(e))
             )
     
+    def _write_temp_file(self, docx_bytes: bytes) -> None:
+        """
+        写入固定路径的临时文件
+
+        小文件直接用无缓冲的 os.write 覆盖；较大的文件先写入相邻的 .part 文件，
+        再通过 os.replace 原子替换，避免 Word 读到写了一半的文件。
+        """
+        if len(docx_bytes) < _DIRECT_WRITE_LIMIT:
+            _write_all(self._fixed_temp_path, docx_bytes)
+            return
+
+        part_path = self._fixed_temp_path + ".part"
+        _write_all(part_path, docx_bytes)
+        os.replace(part_path, self._fixed_temp_path)
+
     def _applescript_insert(self, docx_path: str, move_cursor_to_end: bool = True) -> bool:
         """
         使用 AppleScript 在当前光标/选中位置插入文档
@@ -53,46 +114,19 @@ class WordPlacer(BaseDocumentPlacer):
         # 将路径转换为 POSIX 格式
         posix_path = os.path.abspath(docx_path)
 
-        script = f'''
-        tell application "Microsoft Word"
-            activate
-            if (count of documents) is 0 then
-                make new document
-            end if
-            
-            -- 如果当前有选区，先删除再插入（否则 insert file 会“插入”而不是“替换”）
-            try
-                set selRange to text object of selection
-                if (start of selRange) is not (end of selRange) then
-                    delete selRange
-                end if
-            on error
-                try
-                    delete selection
-                end try
-            end try
-
-            -- 在当前光标位置插入文件（插入后 selection 通常会选中新内容）
-            set targetRange to text object of selection
-            insert file at targetRange file name "{posix_path}"
-        end tell
-        '''
-        
         try:
-            subprocess.run(
-                ["osascript", "-e", script],
-                check=True,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                timeout=30
+            run_compiled_applescript(
+                _INSERT_FILE_SCRIPT,
+                posix_path,
+                output_dir=self._script_dir,
+                name=_INSERT_FILE_SCRIPT_NAME,
+                timeout=30,
             )
             log(f"AppleScript 插入成功: {docx_path} ")
             return True
         except subprocess.CalledProcessError as e:
             # 捕获更详细的错误输出
-            error_msg = e.stderr.strip()
+            error_msg = error_output(e)
             log(f"AppleScript 执行失败: {error_msg}")
             
             # 特殊处理：如果 Word 弹窗导致超时或失败（如宏警告），给提示
@@ -78,6 +78,10 @@ if is_macos():
 
 
 
+# 该时间窗口内完全相同的重复通知只发送一次（秒）
+_COALESCE_WINDOW = 0.03
+
+
 def _icon_or_none(path: Optional[str]) -> Optional[str]:
     return path if path and os.path.exists(path) else None
 
@@ -157,6 +161,7 @@ class NotificationManager:
 
     # ---- 后台线程主体 ----
     def _worker_loop(self):
+        carry = None  # 合并窗口内取出、但内容不同的下一条通知
         while not self._stop.is_set():
             if app_state.config.get("notify", True) is False:
                 # 清空队列
@@ -169,11 +174,16 @@ class NotificationManager:
                         self._q.task_done()
                 time.sleep(0.25)
                 continue
-            try:
-                title, message, ok = self._q.get(timeout=0.25)
-            except queue.Empty:
-                continue
-
+            if carry is not None:
+                item, carry = carry, None
+            else:
+                try:
+                    item = self._q.get(timeout=0.25)
+                except queue.Empty:
+                    continue
+
+            title, message, ok = item
+            carry = self._drop_duplicates(item)
             try:
                 self._send_one(title, message)
             except Exception as e:
@@ -183,6 +193,27 @@ class NotificationManager:
                 time.sleep(0.01)
                 self._q.task_done()
 
+    def _drop_duplicates(self, item: tuple) -> Optional[tuple]:
+        """
+        在短时间窗口内丢弃与 item 完全相同的重复通知；内容不同的通知不合并
+
+        Returns:
+            窗口内遇到的第一条不同通知（由调用方随后单独发送）或 None
+        """
+        deadline = time.monotonic() + _COALESCE_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                nxt = self._q.get(timeout=remaining)
+            except queue.Empty:
+                return None
+            if nxt != item:
+                # 该条目的 task_done 在其发送后调用
+                return nxt
+            self._q.task_done()
+
     # ---- 具体发送实现（macOS Native→Win11→Win10→pync→plyer）----
     def _send_one(self, title: str, message: str, **kwargs) -> None:
         # 1) Win11
@@ -1,9 +1,20 @@
 """Native macOS notification using osascript (most compatible)."""
 
+import os
 import subprocess
 from typing import Optional
 
+from ...config.paths import get_user_data_dir
 from ...utils.logging import log
+from ...utils.macos.osascript import error_output, run_compiled_applescript
+
+# 标题与内容通过 argv 传入，无需在脚本中转义
+_NOTIFY_SCRIPT = """
+on run argv
+    display notification (item 2 of argv) with title (item 1 of argv)
+end run
+"""
+_NOTIFY_SCRIPT_NAME = "pastemd_notify"
 
 
 class NativeMacOSNotifier:
@@ -31,20 +42,14 @@ class NativeMacOSNotifier:
             是否成功发送
         """
         try:
-            # 转义引号以避免 AppleScript 语法错误
-            safe_title = title.replace('"', '\\"').replace('\\', '\\\\')
-            safe_message = message.replace('"', '\\"').replace('\\', '\\\\')
-            
             # 使用 osascript 发送通知（兼容所有 macOS 版本）
-            script = f'display notification "{safe_message}" with title "{safe_title}"'
-            
-            subprocess.run(
-                ["osascript", "-e", script],
-                check=True,
-                capture_output=True,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
+            # 首次调用时预编译为 .scpt，之后直接执行编译产物
+            run_compiled_applescript(
+                _NOTIFY_SCRIPT,
+                title,
+                message,
+                output_dir=os.path.join(get_user_data_dir(), "temp"),
+                name=_NOTIFY_SCRIPT_NAME,
                 timeout=2,
             )
             
@@ -55,7 +60,7 @@ class NativeMacOSNotifier:
             log("macOS notification timeout")
             return False
         except subprocess.CalledProcessError as e:
-            log(f"macOS notification error: {e.stderr.strip() if e.stderr else str(e)}")
+            log(f"macOS notification error: {error_output(e)}")
             return False
         except Exception as e:
             log(f"macOS notification error: {e}")
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 """Base classes for paste-based content placement."""
 
+import time
 from abc import ABC, abstractmethod
+from typing import Callable
 from ...core.types import PlacementResult
+from ...utils.clipboard import simulate_paste, paste_session
 
 
 class BasePastePlacer(ABC):
@@ -26,3 +29,21 @@ class BasePastePlacer(ABC):
             PlacementResult: 落地结果
         """
         pass
+
+    @staticmethod
+    def _paste_via_clipboard(
+        write_clipboard: Callable[[], None],
+        config: dict,
+    ) -> None:
+        """
+        写入剪贴板并模拟粘贴，期间保留用户原有剪贴板内容
+
+        Args:
+            write_clipboard: 写入剪贴板的回调
+            config: 配置字典（读取 paste_delay_s 作为写入后的等待时间）
+        """
+        paste_delay_s = config.get("paste_delay_s", 0.3)
+        with paste_session():
+            write_clipboard()
+            time.sleep(paste_delay_s)
+            simulate_paste()
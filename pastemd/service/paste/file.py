@@ -1,8 +1,7 @@
-import time
 from typing import Optional
 
 from ...core.types import PlacementResult
-from ...utils.clipboard import copy_files_to_clipboard, simulate_paste, preserve_clipboard
+from ...utils.clipboard import copy_files_to_clipboard
 from ...utils.logging import log
 from .base import BasePastePlacer
 
@@ -43,11 +42,10 @@ class FilePastePlacer(BasePastePlacer):
             )
 
         try:
-            paste_delay_s = config.get("paste_delay_s", 0.3)
-            with preserve_clipboard():
-                copy_files_to_clipboard(paths)
-                time.sleep(paste_delay_s)
-                simulate_paste()
+            self._paste_via_clipboard(
+                lambda: copy_files_to_clipboard(paths),
+                config,
+            )
 
             return PlacementResult(
                 success=True,
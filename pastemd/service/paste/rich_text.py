@@ -1,7 +1,6 @@
-import time
 from typing import Optional
 from ...core.types import PlacementResult
-from ...utils.clipboard import set_clipboard_rich_text, simulate_paste, preserve_clipboard
+from ...utils.clipboard import set_clipboard_rich_text
 from ...utils.logging import log
 from .base import BasePastePlacer
 
@@ -30,11 +29,10 @@ class RichTextPastePlacer(BasePastePlacer):
             PlacementResult: 落地结果
         """
         try:
-            paste_delay_s = config.get("paste_delay_s", 0.3)
-            with preserve_clipboard():
-                set_clipboard_rich_text(html=html, text=content)
-                time.sleep(paste_delay_s)
-                simulate_paste()
+            self._paste_via_clipboard(
+                lambda: set_clipboard_rich_text(html=html, text=content),
+                config,
+            )
 
             return PlacementResult(
                 success=True,
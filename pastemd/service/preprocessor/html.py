@@ -19,6 +19,14 @@ PRESERVE_NEWLINE_WHITE_SPACE_RE = re.compile(
     re.IGNORECASE,
 )
 NEWLINE_EXCLUDED_TAGS = {"script", "style", "textarea", "pre", "code"}
+# 命中任一特征时 HTML 可能需要清理（SVG、KaTeX/$$ 公式中的 br、CSS 保留换行、Obsidian 公式）
+_NEEDS_CLEANUP_RE = re.compile(
+    r"<svg|\.svg|katex|\$\$|white-space|" + re.escape(OBSIDIAN_CLIPBOARD_MARKER),
+    re.IGNORECASE,
+)
+_DOCTYPE_HEADER = "<!DOCTYPE html>\n<meta charset='utf-8'>\n"
+# 前导注释（如 Obsidian 标记）可能排在 DOCTYPE 之前，因此检查一段前缀而非严格 startswith
+_DOCTYPE_SCAN_CHARS = 256
 
 
 def _wrap_obsidian_math_latex(soup: BeautifulSoup, html: str) -> None:
@@ -91,29 +99,43 @@ class HtmlPreprocessor(BasePreprocessor):
         """
         log("Preprocessing HTML content")
 
+        html_formatting = config.get("html_formatting") or config.get("Html_formatting") or {}
+        if not isinstance(html_formatting, dict):
+            html_formatting = {}
+        strikethrough_to_del = html_formatting.get("strikethrough_to_del", True)
+        css_font_to_semantic = html_formatting.get("css_font_to_semantic", True)
+        bold_first_row_to_header = html_formatting.get("bold_first_row_to_header", False)
+
+        # 快速路径：格式化选项全部关闭且没有需要清理的内容时，跳过 HTML 解析
+        if not (
+            strikethrough_to_del
+            or css_font_to_semantic
+            or bold_first_row_to_header
+            or _NEEDS_CLEANUP_RE.search(html)
+        ):
+            return self._ensure_doctype(html)
+
         # 使用 html_formatter 进行清理
         soup = BeautifulSoup(html, "html.parser")
         _wrap_obsidian_math_latex(soup, html)
         clean_html_content(soup, config)
         _convert_preserved_newlines_to_br(soup)
 
-        html_formatting = config.get("html_formatting") or config.get("Html_formatting") or {}
-        if not isinstance(html_formatting, dict):
-            html_formatting = {}
-        if html_formatting.get("strikethrough_to_del", True):
+        if strikethrough_to_del:
             convert_strikethrough_to_del(soup)
-        if html_formatting.get("css_font_to_semantic", True):
+        if css_font_to_semantic:
             convert_css_font_to_semantic(soup)
-        if html_formatting.get("bold_first_row_to_header", False):
+        if bold_first_row_to_header:
             promote_bold_first_row_to_header(soup)
 
         # unwrap_li_paragraphs(soup)
         # remove_empty_paragraphs(soup)
 
-        html_output = str(soup)
-        
-        # 仅在 HTML 不包含 DOCTYPE 时才添加
-        if "<!DOCTYPE" not in html_output.upper():
-            html_output = f"<!DOCTYPE html>\n<meta charset='utf-8'>\n{html_output}"
-        
+        return self._ensure_doctype(str(soup))
+
+    @staticmethod
+    def _ensure_doctype(html_output: str) -> str:
+        # 仅在 HTML 不包含 DOCTYPE 时才添加；DOCTYPE 只会出现在开头，只检查前缀即可
+        if "<!DOCTYPE" not in html_output[:_DOCTYPE_SCAN_CHARS].upper():
+            html_output = _DOCTYPE_HEADER + html_output
         return html_output
@@ -7,8 +7,8 @@ from typing import List
 from ...core.types import PlacementResult
 from ...utils.logging import log
 from ...i18n import t
-from ...utils.clipboard import set_clipboard_rich_text, simulate_paste, preserve_clipboard
-from .html_converter import table_to_html, table_to_tsv
+from ...utils.clipboard import set_clipboard_rich_text, simulate_paste, paste_session
+from .html_converter import table_to_html_and_tsv
 
 
 class BaseSpreadsheetPlacer(ABC):
@@ -47,11 +47,10 @@ class ClipboardHTMLSpreadsheetPlacer(BaseSpreadsheetPlacer):
             paste_delay_s = config.get("paste_delay_s", 0.3)
             
             # 使用共享的 HTML 和 TSV 转换工具
-            html_text = table_to_html(table_data, keep_format=keep_format)
-            tsv_text = table_to_tsv(table_data)
+            html_text, tsv_text = table_to_html_and_tsv(table_data, keep_format=keep_format)
 
             # Excel/WPS 可以处理 HTML table；Plain TSV 作为兜底
-            with preserve_clipboard():
+            with paste_session():
                 set_clipboard_rich_text(html=html_text, text=tsv_text)
                 time.sleep(paste_delay_s)
                 simulate_paste()
@@ -1,9 +1,14 @@
 """Cell formatting utilities for spreadsheet insertion."""
 
 import re
+from functools import lru_cache
 from typing import List, Optional
 
 
+# 行内 Markdown 语法可能用到的字符；不含这些字符的文本无需逐字符解析
+_INLINE_MARKUP_RE = re.compile(r"[\\`~*_\[]")
+
+
 class TextSegment:
     """文本片段,带有格式信息"""
     def __init__(self, text: str, bold: bool = False, italic: bool = False,
@@ -30,13 +35,16 @@ class CellFormat:
         """解析 Markdown 格式并生成文本片段(字符级解析)"""
         text = self.text
         
-        # 处理 HTML 标签和换行
-        text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
+        # 处理 HTML 标签和换行（不含 "<" 时无需匹配标签）
+        has_tag = '<' in text
+        if has_tag:
+            text = re.sub(r'<br\s*/?>', '\n', text, flags=re.IGNORECASE)
         if '\n' in text:
             self.has_newline = True
         
         # 检查是否包含代码块标签
-        if '<pre>' in text.lower() or '<code>' in text.lower():
+        lowered = text.lower() if has_tag else ''
+        if '<pre>' in lowered or '<code>' in lowered:
             self.is_code_block = True
             # 提取代码块内容
             text = re.sub(r'<pre>(.*?)</pre>',
@@ -65,6 +73,10 @@ class CellFormat:
             italic: 当前是否在斜体环境中
             strikethrough: 当前是否在删除线环境中
         """
+        # 快速路径：没有任何行内语法字符时整段即为一个片段
+        if not _INLINE_MARKUP_RE.search(text):
+            return [TextSegment(text, bold, italic, strikethrough)] if text else []
+        
         segments = []
         i = 0
         current_text = []
@@ -224,3 +236,16 @@ class CellFormat:
         
         flush_current()
         return segments
+
+
+@lru_cache(maxsize=8192)
+def parse_cell(text: str) -> CellFormat:
+    """
+    解析单元格并缓存结果
+
+    表格中常有大量重复值（空单元格、表头片段、枚举值），相同内容只解析一次。
+    返回的 CellFormat 在调用方之间共享，只能读取、不要修改。
+    """
+    cell_format = CellFormat(text)
+    cell_format.parse()
+    return cell_format
@@ -1,5 +1,6 @@
 """Spreadsheet file generator - creates XLSX files from table data."""
 
+from functools import lru_cache
 from typing import List
 from io import BytesIO
 from openpyxl import Workbook
@@ -10,7 +11,19 @@ from openpyxl.cell.rich_text import TextBlock, CellRichText
 
 from ...utils.logging import log
 from ...core.errors import InsertError
-from .formatting import CellFormat
+from .formatting import parse_cell
+
+
+@lru_cache(maxsize=None)
+def _inline_font(bold: bool, italic: bool, strike: bool, code: bool) -> InlineFont:
+    """按样式组合复用富文本片段字体（最多 16 种组合）"""
+    return InlineFont(b=bold, i=italic, strike=strike, rFont="Consolas" if code else None)
+
+
+@lru_cache(maxsize=None)
+def _segment_font(bold: bool, italic: bool, strike: bool, code: bool) -> Font:
+    """按样式组合复用单片段单元格字体"""
+    return Font(bold=bold, italic=italic, strike=strike, name="Consolas" if code else None)
 
 
 class SpreadsheetGenerator:
@@ -53,19 +66,32 @@ class SpreadsheetGenerator:
             # 设置样式
             header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
             code_fill = PatternFill(start_color="F0F0F0", end_color="F0F0F0", fill_type="solid")
+            header_font = Font(bold=True)
+            code_font = Font(name="Consolas")
+            link_font = Font(color="0563C1", underline="single")  # Excel 默认超链接颜色
+            wrap_alignment = Alignment(wrap_text=True, vertical="top")
+            center_alignment = Alignment(horizontal="center", vertical="center")
+            
+            # 写入时顺便统计各列最长行的长度，用于之后调整列宽
+            column_count = len(table_data[0])
+            max_lengths = [0] * column_count
             
-            # 写入数据
+            # 写入数据：先确定每个单元格最终的值和样式，再一次性写入，
+            # 避免表头等情况下先写入格式样式又被覆盖的重复赋值
             for row_idx, row_data in enumerate(table_data, start=1):
+                is_header = row_idx == 1
                 for col_idx, cell_value in enumerate(row_data, start=1):
-                    cell = ws.cell(row=row_idx, column=col_idx)
+                    font = None
+                    fill = None
+                    alignment = center_alignment  # 默认居中对齐
+                    hyperlink_url = None
                     
                     if keep_format:
-                        # 解析 Markdown 格式
-                        cell_format = CellFormat(cell_value)
-                        clean_text = cell_format.parse()
+                        # 解析 Markdown 格式（相同内容复用解析结果）
+                        cell_format = parse_cell(cell_value)
+                        value = cell_format.clean_text
                         
                         # 检查是否有超链接
-                        hyperlink_url = None
                         if cell_format.segments:
                             # 查找第一个超链接
                             for seg in cell_format.segments:
@@ -75,20 +101,18 @@ class SpreadsheetGenerator:
                         
                         # 应用格式
                         if cell_format.has_newline:
-                            cell.alignment = Alignment(wrap_text=True, vertical="top")
+                            alignment = wrap_alignment
                         
                         if cell_format.is_code_block:
                             # 代码块样式
-                            cell.value = clean_text
-                            cell.font = Font(name="Consolas")
-                            cell.fill = code_fill
-                            cell.alignment = Alignment(wrap_text=True, vertical="top")
+                            font = code_font
+                            fill = code_fill
+                            alignment = wrap_alignment
+                            hyperlink_url = None
                         elif hyperlink_url:
                             # 有超链接：添加超链接并设置蓝色下划线样式
-                            cell.value = clean_text
-                            cell.hyperlink = hyperlink_url
-                            cell.font = Font(color="0563C1", underline="single")  # Excel 默认超链接颜色
-                            cell.alignment = Alignment(horizontal="center", vertical="center")
+                            font = link_font
+                            alignment = center_alignment
                         elif len(cell_format.segments) > 1:
                             # 多个片段，使用富文本
                             rich_text_parts = []
@@ -102,79 +126,61 @@ class SpreadsheetGenerator:
                                 if seg.is_code:
                                     has_inline_code = True
                                 
-                                # 创建内联字体样式
-                                inline_font = InlineFont(
-                                    b=seg.bold,
-                                    i=seg.italic,
-                                    strike=seg.strikethrough,
-                                    rFont="Consolas" if seg.is_code else None
+                                # 相同样式组合共用同一个内联字体对象
+                                inline_font = _inline_font(
+                                    seg.bold, seg.italic, seg.strikethrough, seg.is_code
                                 )
                                 
                                 # 添加文本块
                                 rich_text_parts.append(TextBlock(inline_font, seg.text))
                             
                             # 设置富文本
-                            if rich_text_parts:
-                                cell.value = CellRichText(*rich_text_parts)
-                                
-                                # 如果有行内代码，设置背景色
-                                if has_inline_code:
-                                    cell.fill = code_fill
+                            value = CellRichText(*rich_text_parts) if rich_text_parts else None
+                            
+                            # 如果有行内代码，设置背景色
+                            if has_inline_code:
+                                fill = code_fill
                         elif len(cell_format.segments) == 1:
                             # 单个片段
                             seg = cell_format.segments[0]
-                            cell.value = clean_text
                             
                             # 检查是否有行内代码
-                            has_inline_code = seg.is_code
-                            if has_inline_code:
-                                cell.fill = code_fill
+                            if seg.is_code:
+                                fill = code_fill
                             
                             # 应用整体格式
                             if seg.bold or seg.italic or seg.strikethrough or seg.is_code:
-                                cell.font = Font(
-                                    bold=seg.bold,
-                                    italic=seg.italic,
-                                    strike=seg.strikethrough,
-                                    name="Consolas" if seg.is_code else None
+                                font = _segment_font(
+                                    seg.bold, seg.italic, seg.strikethrough, seg.is_code
                                 )
-                        else:
-                            # 没有格式片段，直接设置值
-                            cell.value = clean_text
                     else:
                         # 不保留格式，清除 Markdown 符号
-                        cell_format = CellFormat(cell_value)
-                        cell.value = cell_format.parse()
+                        value = parse_cell(cell_value).clean_text
                     
                     # 第一行应用表头样式
-                    if row_idx == 1:
-                        cell.fill = header_fill
-                        cell.font = Font(bold=True)
+                    if is_header:
+                        fill = header_fill
+                        font = header_font
+                    
+                    cell = ws.cell(row=row_idx, column=col_idx, value=value)
+                    if hyperlink_url:
+                        cell.hyperlink = hyperlink_url
+                    if font is not None:
+                        cell.font = font
+                    if fill is not None:
+                        cell.fill = fill
+                    cell.alignment = alignment
                     
-                    # 默认居中对齐
-                    if not cell.alignment or not cell.alignment.wrap_text:
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
+                    if value and col_idx <= column_count:
+                        # 考虑换行符
+                        line_length = max(len(line) for line in str(value).split('\n'))
+                        if line_length > max_lengths[col_idx - 1]:
+                            max_lengths[col_idx - 1] = line_length
             
-            # 自动调整列宽
-            for col_idx in range(1, len(table_data[0]) + 1):
-                col_letter = get_column_letter(col_idx)
-                max_length = 0
-                
-                for row_idx in range(1, len(table_data) + 1):
-                    cell = ws.cell(row=row_idx, column=col_idx)
-                    try:
-                        if cell.value:
-                            # 考虑换行符
-                            lines = str(cell.value).split('\n')
-                            max_line_length = max(len(line) for line in lines) if lines else 0
-                            if max_line_length > max_length:
-                                max_length = max_line_length
-                    except Exception:
-                        pass
-                
-                # 设置列宽（最小10，最大50）
+            # 自动调整列宽（最小10，最大50）
+            for col_idx, max_length in enumerate(max_lengths, start=1):
                 adjusted_width = min(max(max_length + 2, 10), 50)
-                ws.column_dimensions[col_letter].width = adjusted_width
+                ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
             
             # 保存到内存
             buffer = BytesIO()
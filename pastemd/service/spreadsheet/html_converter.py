@@ -2,10 +2,42 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from html import escape
 from typing import List, Tuple
 
-from .formatting import CellFormat
+from .formatting import CellFormat, parse_cell
+
+_HTML_HEAD = (
+    "<!--StartFragment-->"
+    "<html><head><meta charset=\"utf-8\" />"
+    "<style>"
+    "table{border-collapse:collapse}"
+    "td,th{border:1px solid #D0D0D0}"
+    "a{color:#0563C1;text-decoration:underline}"
+    "</style>"
+    "</head><body>"
+    "<table>"
+)
+_HTML_TAIL = "</table></body></html><!--EndFragment-->"
+
+_CELL_STYLE = "padding:2px 6px;vertical-align:middle"
+_HEADER_STYLE = ";font-weight:bold;background-color:#D3D3D3"
+_CODE_STYLE = ";background-color:#F0F0F0;font-family:Menlo,Consolas,monospace"
+
+# Cell opening tags indexed by needs_code_bg: (plain, code background)
+_TD_OPEN = (
+    f'<td style="{_CELL_STYLE}">',
+    f'<td style="{_CELL_STYLE}{_CODE_STYLE}">',
+)
+_TH_OPEN = (
+    f'<th style="{_CELL_STYLE}{_HEADER_STYLE}">',
+    f'<th style="{_CELL_STYLE}{_HEADER_STYLE}{_CODE_STYLE}">',
+)
+_TD_CLOSE = "</td>"
+_TH_CLOSE = "</th>"
+
+_TSV_TRANS = str.maketrans({"\r": " ", "\n": " ", "\t": " "})
 
 
 def wrap_tag(tag: str, content: str) -> str:
@@ -26,9 +58,29 @@ def cell_to_html(cell_value: str, *, keep_format: bool) -> Tuple[str, bool]:
         - html_content: The HTML representation of the cell.
         - needs_code_bg: Whether the cell needs code background styling.
     """
-    cf = CellFormat(cell_value)
-    clean_text = cf.parse()
+    content_html, needs_code_bg, _ = _render_cell(cell_value, keep_format)
+    return content_html, needs_code_bg
 
+
+@lru_cache(maxsize=4096)
+def _render_cell(cell_value: str, keep_format: bool) -> Tuple[str, bool, str]:
+    """
+    Parse a cell once and render it for both outputs.
+
+    Tables often repeat the same values (empty cells, enum-like values),
+    so results are cached by (cell_value, keep_format).
+
+    Returns:
+        A tuple of (html_content, needs_code_bg, tsv_text).
+    """
+    cf = parse_cell(cell_value)
+    clean_text = cf.clean_text
+    content_html, needs_code_bg = _format_to_html(cf, clean_text, keep_format=keep_format)
+    return content_html, needs_code_bg, _tsv_cell(clean_text)
+
+
+def _format_to_html(cf: CellFormat, clean_text: str, *, keep_format: bool) -> Tuple[str, bool]:
+    """Render an already parsed CellFormat to HTML (see cell_to_html)."""
     # If not keeping format, just escape and convert newlines
     if not keep_format:
         return escape(clean_text).replace("\n", "<br />"), False
@@ -45,18 +97,25 @@ def cell_to_html(cell_value: str, *, keep_format: bool) -> Tuple[str, bool]:
 
     for seg in cf.segments:
         seg_text = escape(seg.text or "").replace("\n", "<br />")
-        chunk = seg_text
 
-        # Apply formatting in order: code -> strikethrough -> italic -> bold -> hyperlink
+        # Nesting from outermost to innermost: hyperlink -> bold -> italic -> strikethrough -> code
+        opens = ""
+        closes = ""
+        if seg.bold:
+            opens += "<b>"
+            closes = "</b>" + closes
+        if seg.italic:
+            opens += "<i>"
+            closes = "</i>" + closes
+        if seg.strikethrough:
+            opens += "<s>"
+            closes = "</s>" + closes
         if seg.is_code:
             needs_code_bg = True
-            chunk = wrap_tag("code", chunk)
-        if seg.strikethrough:
-            chunk = wrap_tag("s", chunk)
-        if seg.italic:
-            chunk = wrap_tag("i", chunk)
-        if seg.bold:
-            chunk = wrap_tag("b", chunk)
+            opens += "<code>"
+            closes = "</code>" + closes
+        chunk = opens + seg_text + closes if opens else seg_text
+
         if seg.hyperlink_url:
             url = escape(seg.hyperlink_url, quote=True)
             chunk = f'<a href="{url}">{chunk}</a>'
@@ -66,6 +125,49 @@ def cell_to_html(cell_value: str, *, keep_format: bool) -> Tuple[str, bool]:
     return "".join(parts) or escape(clean_text), needs_code_bg
 
 
+def clear_cell_cache() -> None:
+    """Clear the per-cell rendering cache."""
+    _render_cell.cache_clear()
+
+
+def table_to_html_and_tsv(
+    table_data: List[List[str]], *, keep_format: bool
+) -> Tuple[str, str]:
+    """
+    Convert table data to both HTML and TSV in a single pass.
+
+    Each cell is parsed once and the result feeds both outputs.
+
+    Args:
+        table_data: 2D list of cell values.
+        keep_format: Whether to preserve formatting in the HTML output.
+
+    Returns:
+        A tuple of (html_document, tsv_text).
+    """
+    # Append everything in document order and join once at the end
+    out: List[str] = [_HTML_HEAD]
+    tsv: List[str] = []
+
+    for r, row in enumerate(table_data):
+        cell_open, cell_close = (_TH_OPEN, _TH_CLOSE) if r == 0 else (_TD_OPEN, _TD_CLOSE)
+        out.append("<tr>")
+        if r:
+            tsv.append("\n")
+
+        for c, cell_value in enumerate(row):
+            content_html, needs_code_bg, tsv_text = _render_cell(cell_value, keep_format)
+            out += (cell_open[needs_code_bg], content_html, cell_close)
+            if c:
+                tsv.append("\t")
+            tsv.append(tsv_text)
+
+        out.append("</tr>")
+
+    out.append(_HTML_TAIL)
+    return "".join(out), "".join(tsv)
+
+
 def table_to_html(table_data: List[List[str]], *, keep_format: bool) -> str:
     """
     Convert table data to HTML table format.
@@ -77,56 +179,7 @@ def table_to_html(table_data: List[List[str]], *, keep_format: bool) -> str:
     Returns:
         Complete HTML document with table.
     """
-    rows_html: List[str] = []
-    start_marker = "<!--StartFragment-->"
-    end_marker = "<!--EndFragment-->"
-
-    for r, row in enumerate(table_data):
-        cell_tag = "th" if r == 0 else "td"
-        cell_html: List[str] = []
-
-        for cell_value in row:
-            content_html, needs_code_bg = cell_to_html(
-                cell_value, keep_format=keep_format
-            )
-            
-            # Build style attributes
-            style_parts = ["padding:2px 6px", "vertical-align:middle"]
-            
-            # Header row styling
-            if r == 0:
-                style_parts.extend(["font-weight:bold", "background-color:#D3D3D3"])
-            
-            # Code background styling
-            if needs_code_bg:
-                style_parts.extend([
-                    "background-color:#F0F0F0",
-                    "font-family:Menlo,Consolas,monospace"
-                ])
-            
-            style_attr = ";".join(style_parts)
-            cell_html.append(
-                f"<{cell_tag} style=\"{style_attr}\">{content_html}</{cell_tag}>"
-            )
-
-        rows_html.append("<tr>" + "".join(cell_html) + "</tr>")
-
-    # Build complete HTML document
-    return (
-        start_marker +
-        "<html><head><meta charset=\"utf-8\" />"
-        "<style>"
-        "table{border-collapse:collapse}"
-        "td,th{border:1px solid #D0D0D0}"
-        "a{color:#0563C1;text-decoration:underline}"
-        "</style>"
-        "</head><body>"
-        "<table>"
-        + "".join(rows_html)
-        + "</table>"
-        "</body></html>"
-        + end_marker
-    )
+    return table_to_html_and_tsv(table_data, keep_format=keep_format)[0]
 
 
 def table_to_tsv(table_data: List[List[str]]) -> str:
@@ -139,16 +192,22 @@ def table_to_tsv(table_data: List[List[str]]) -> str:
     Returns:
         TSV formatted string.
     """
-    lines: List[str] = []
-    
-    for row in table_data:
-        out_cells: List[str] = []
-        for cell_value in row:
-            cf = CellFormat(cell_value)
-            text = cf.parse()
-            # Replace newlines with spaces for TSV format
-            text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\n", " ")
-            out_cells.append(text)
-        lines.append("\t".join(out_cells))
-    
-    return "\n".join(lines)
+    # Separators are inserted inline so the whole document is joined once
+    out: List[str] = []
+    for r, row in enumerate(table_data):
+        if r:
+            out.append("\n")
+        for c, cell_value in enumerate(row):
+            if c:
+                out.append("\t")
+            out.append(_render_cell(cell_value, False)[2])
+    return "".join(out)
+
+
+def _tsv_cell(text: str) -> str:
+    # Replace newlines (and tabs, which would shift columns) with spaces for TSV format
+    if "\n" not in text and "\r" not in text and "\t" not in text:
+        return text
+    if "\r\n" in text:
+        text = text.replace("\r\n", "\n")
+    return text.translate(_TSV_TRANS)
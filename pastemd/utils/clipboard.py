@@ -4,51 +4,59 @@ This module provides a unified interface for clipboard operations across differe
 It automatically detects the operating system and imports the appropriate implementation.
 """
 
+import contextlib
+import importlib
 import sys
+import time
+from contextvars import ContextVar
 from ..core.errors import ClipboardError
 
 
-# 根据操作系统导入对应的实现
-if sys.platform == "darwin":
-    from .macos.clipboard import (
-        get_clipboard_text,
-        set_clipboard_text,
-        is_clipboard_empty,
-        is_clipboard_html,
-        get_clipboard_html,
-        set_clipboard_rich_text,
-        copy_files_to_clipboard,
-        is_clipboard_files,
-        get_clipboard_files,
-        get_markdown_files_from_clipboard,
-        read_markdown_files_from_clipboard,
-        preserve_clipboard,
-    )
-    from .macos.keystroke import simulate_paste
-    # read_file_with_encoding 从共享模块导入
-    from .clipboard_file_utils import read_file_with_encoding
-elif sys.platform == "win32":
-    from .win32.clipboard import (
-        get_clipboard_text,
-        set_clipboard_text,
-        is_clipboard_empty,
-        is_clipboard_html,
-        get_clipboard_html,
-        set_clipboard_rich_text,
-        copy_files_to_clipboard,
-        is_clipboard_files,
-        get_clipboard_files,
-        get_markdown_files_from_clipboard,
-        read_markdown_files_from_clipboard,
-        preserve_clipboard,
-    )
-    from .win32.keystroke import simulate_paste
+# 平台实现按需导入：首次访问某个接口时才加载对应模块（PEP 562），
+# 避免仅读取文本时也要在启动阶段导入完整的 pyobjc / pywin32 依赖
+_CLIPBOARD_NAMES = (
+    "get_clipboard_text",
+    "set_clipboard_text",
+    "is_clipboard_empty",
+    "is_clipboard_html",
+    "get_clipboard_html",
+    "set_clipboard_rich_text",
+    "copy_files_to_clipboard",
+    "is_clipboard_files",
+    "get_clipboard_files",
+    "get_markdown_files_from_clipboard",
+    "read_markdown_files_from_clipboard",
+    "preserve_clipboard",
+)
+_PLATFORM_MODULES = {
+    "darwin": (".macos.clipboard", ".macos.keystroke"),
+    "win32": (".win32.clipboard", ".win32.keystroke"),
+}
+
+if sys.platform in _PLATFORM_MODULES:
+    _clipboard_module, _keystroke_module = _PLATFORM_MODULES[sys.platform]
+    _LAZY_ATTRS = {name: _clipboard_module for name in _CLIPBOARD_NAMES}
+    _LAZY_ATTRS["simulate_paste"] = _keystroke_module
     # read_file_with_encoding 从共享模块导入
-    from .clipboard_file_utils import read_file_with_encoding
+    _LAZY_ATTRS["read_file_with_encoding"] = ".clipboard_file_utils"
+
+    def __getattr__(name: str):
+        module_name = _LAZY_ATTRS.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, __package__), name)
+        # 缓存到模块全局，后续访问不再经过 __getattr__
+        globals()[name] = value
+        return value
 else:
     # 其他平台的后备实现（仅支持基本文本功能）
     import pyperclip
 
+    # pyperclip 每次读取都要启动 xclip/xsel 等外部进程，短时间内的重复读取
+    # （如 is_clipboard_empty 之后紧接着 get_clipboard_text）复用上一次结果
+    _TEXT_CACHE_TTL_S = 0.05
+    _last_text = {"ts": float("-inf"), "text": ""}
+
     def get_clipboard_text() -> str:
         """
         获取剪贴板文本内容
@@ -59,13 +67,31 @@ else:
         Raises:
             ClipboardError: 剪贴板操作失败时
         """
+        now = time.monotonic()
+        if now - _last_text["ts"] < _TEXT_CACHE_TTL_S:
+            return _last_text["text"]
         try:
             text = pyperclip.paste()
-            if text is None:
-                return ""
-            return text
         except Exception as e:
             raise ClipboardError(f"Failed to read clipboard: {e}")
+        if text is None:
+            text = ""
+        _last_text["ts"] = now
+        _last_text["text"] = text
+        return text
+
+    def set_clipboard_text(text: str) -> None:
+        """
+        设置剪贴板文本内容
+
+        Raises:
+            ClipboardError: 剪贴板操作失败时
+        """
+        _last_text["ts"] = float("-inf")
+        try:
+            pyperclip.copy(text)
+        except Exception as e:
+            raise ClipboardError(f"Failed to set clipboard text: {e}")
 
     def is_clipboard_empty() -> bool:
         """
@@ -76,7 +102,7 @@ else:
         """
         try:
             text = get_clipboard_text()
-            return not text or not text.strip()
+            return not text or text.isspace()
         except ClipboardError:
             return True
 
@@ -118,6 +144,42 @@ else:
     def simulate_paste(*, timeout_s: float = 5.0) -> None:
         raise ClipboardError(f"Paste keystroke not supported on {sys.platform}")
 
+    @contextlib.contextmanager
+    def preserve_clipboard(*, restore_delay_s: float = 0.25):
+        """不支持的平台不保存/恢复剪贴板"""
+        yield
+
+
+def _platform_attr(name: str):
+    """模块内部访问平台实现（模块内的裸名称查找不会触发 __getattr__）"""
+    try:
+        return globals()[name]
+    except KeyError:
+        return __getattr__(name)
+
+
+_paste_session_active: ContextVar[bool] = ContextVar("paste_session_active", default=False)
+
+
+@contextlib.contextmanager
+def paste_session(*, restore_delay_s: float = 0.25):
+    """
+    可重入的剪贴板保留作用域
+
+    最外层进入时读取一次剪贴板快照、退出时恢复；嵌套的 paste_session 直接复用外层快照，
+    避免多次粘贴（如降级重试）重复读取整个剪贴板。
+    """
+    if _paste_session_active.get():
+        yield
+        return
+
+    token = _paste_session_active.set(True)
+    try:
+        with _platform_attr("preserve_clipboard")(restore_delay_s=restore_delay_s):
+            yield
+    finally:
+        _paste_session_active.reset(token)
+
 
 # 导出公共接口
 __all__ = [
@@ -141,4 +203,5 @@ if sys.platform in ("win32", "darwin"):
         "read_markdown_files_from_clipboard",
         "read_file_with_encoding",
         "preserve_clipboard",
+        "paste_session",
     ])
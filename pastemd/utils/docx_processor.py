@@ -2,7 +2,8 @@
 
 import io
 import zipfile
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 from xml.sax.saxutils import quoteattr
 from xml.etree import ElementTree as ET
 
@@ -17,6 +18,28 @@ _MIN_TABLE_COLUMN_TWIPS = 900
 _MAX_LABEL_COLUMN_TWIPS = 2200
 
 
+@lru_cache(maxsize=16)
+def _style_ids_for_name(styles_xml: bytes, style_name: str) -> tuple[tuple[str, ...], bool]:
+    """
+    从 styles.xml 中查找指定样式名对应的 styleId，以及该样式是否为默认样式。
+
+    styles.xml 来自 reference docx，内容在多次转换之间基本不变，因此按内容缓存。
+    """
+    w = f"{{{_WORD_NS}}}"
+    root = ET.fromstring(styles_xml)
+    ids = []
+    is_default = False
+    for style in root.iter(f"{w}style"):
+        name = style.find(f"{w}name")
+        if name is not None and name.get(f"{w}val") == style_name:
+            style_id = style.get(f"{w}styleId")
+            if style_id:
+                ids.append(style_id)
+            if style.get(f"{w}default") in ("1", "true", "on"):
+                is_default = True
+    return tuple(ids), is_default
+
+
 class DocxProcessor:
     """DOCX 文档后处理器 - 用于修改已生成的 DOCX 文档样式"""
     
@@ -35,6 +58,11 @@ class DocxProcessor:
         Returns:
             修改后的 DOCX 文件字节流
         """
+        # 快速路径：文档中没有使用 First Paragraph 样式时，跳过 python-docx 的完整解析与重新打包
+        if not DocxProcessor._uses_paragraph_style(docx_bytes, "First Paragraph"):
+            log("No 'First Paragraph' style found in document")
+            return docx_bytes
+
         try:
             # 从字节流加载文档
             doc = Document(io.BytesIO(docx_bytes))
@@ -69,6 +97,27 @@ class DocxProcessor:
             # 如果处理失败，返回原始字节流
             return docx_bytes
 
+    @staticmethod
+    def _uses_paragraph_style(docx_bytes: bytes, style_name: str) -> bool:
+        """
+        判断 document.xml 是否引用了指定名称的样式。
+
+        只做字节级查找，结果偏保守：无法判断时返回 True，交由完整处理流程决定。
+        """
+        try:
+            with zipfile.ZipFile(io.BytesIO(docx_bytes), "r") as archive:
+                styles_xml = archive.read("word/styles.xml")
+                document_xml = archive.read("word/document.xml")
+            style_ids, is_default = _style_ids_for_name(styles_xml, style_name)
+        except Exception as e:
+            log(f"Failed to inspect DOCX styles: {type(e).__name__}: {e}")
+            return True
+
+        if is_default:
+            # 默认样式无需显式 pStyle 引用，无法通过字节查找判断
+            return True
+        return any(f'"{style_id}"'.encode("utf-8") in document_xml for style_id in style_ids)
+
     @staticmethod
     def replace_horizontal_rules_with_paragraph_borders(docx_bytes: bytes) -> bytes:
         """
@@ -78,20 +127,34 @@ class DocxProcessor:
         ``<w:pict><v:rect ... o:hr="t" /></w:pict>``。WPS 可能把这个结构显示
         成矩形块；段落边框更接近 Word/WPS 手动输入 ``---`` 后回车的结果。
         """
-        namespaces = {
-            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-            "m": "http://schemas.openxmlformats.org/officeDocument/2006/math",
-            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-            "pic": "http://schemas.openxmlformats.org/drawingml/2006/picture",
-            "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
-            "v": "urn:schemas-microsoft-com:vml",
-            "o": "urn:schemas-microsoft-com:office:office",
-            "w10": "urn:schemas-microsoft-com:office:word",
-        }
-        for prefix, uri in namespaces.items():
-            ET.register_namespace(prefix, uri)
+        return DocxProcessor._rewrite_document_xml(
+            docx_bytes,
+            [DocxProcessor._replace_horizontal_rules_in_root],
+        )
 
+    @staticmethod
+    def auto_layout_tables(docx_bytes: bytes) -> bytes:
+        """
+        根据单元格文本长度调整 DOCX 普通表格列宽。
+
+        该处理主要改善「左侧短标签、右侧长内容」的两列表格，让 Word/WPS
+        打开后右侧内容列获得更多空间，减少不必要换行。
+        """
+        return DocxProcessor._rewrite_document_xml(
+            docx_bytes,
+            [DocxProcessor._auto_layout_tables_in_root],
+        )
+
+    @staticmethod
+    def _rewrite_document_xml(
+        docx_bytes: bytes,
+        transforms: list[Callable[[ET.Element], int]],
+    ) -> bytes:
+        """
+        解析一次 word/document.xml，依次应用各变换后重新打包。
+
+        每个变换就地修改 XML 根节点并返回修改数量；全部为 0 时返回原始字节流。
+        """
         document_path = "word/document.xml"
 
         try:
@@ -105,28 +168,14 @@ class DocxProcessor:
                 root = ET.fromstring(document_xml)
 
                 modified_count = 0
-                for paragraph in root.findall(".//w:p", namespaces):
-                    rects = paragraph.findall(".//v:rect", namespaces)
-                    if not any(rect.get(f"{{{namespaces['o']}}}hr") == "t" for rect in rects):
-                        continue
-
-                    paragraph.clear()
-                    ppr = ET.SubElement(paragraph, f"{{{namespaces['w']}}}pPr")
-                    spacing = ET.SubElement(ppr, f"{{{namespaces['w']}}}spacing")
-                    spacing.set(f"{{{namespaces['w']}}}before", "0")
-                    spacing.set(f"{{{namespaces['w']}}}after", "0")
-                    pbdr = ET.SubElement(ppr, f"{{{namespaces['w']}}}pBdr")
-                    bottom = ET.SubElement(pbdr, f"{{{namespaces['w']}}}bottom")
-                    bottom.set(f"{{{namespaces['w']}}}val", "single")
-                    bottom.set(f"{{{namespaces['w']}}}sz", "6")
-                    bottom.set(f"{{{namespaces['w']}}}space", "1")
-                    bottom.set(f"{{{namespaces['w']}}}color", "auto")
-                    modified_count += 1
+                for transform in transforms:
+                    modified_count += transform(root)
 
                 if modified_count == 0:
-                    log("No VML horizontal rule found in DOCX")
                     return docx_bytes
 
+                # 变换内部可能注册了通用前缀，序列化前以文档自身的命名空间为准
+                DocxProcessor._register_xml_namespaces(xml_namespaces)
                 updated_document_xml = ET.tostring(root, encoding="utf-8", xml_declaration=True)
                 updated_document_xml = DocxProcessor._preserve_ignorable_namespaces(
                     updated_document_xml,
@@ -140,68 +189,72 @@ class DocxProcessor:
                         zout.writestr(item, data)
 
             output_stream.seek(0)
-            log(f"Replaced {modified_count} DOCX horizontal rule(s) with paragraph border(s)")
             return output_stream.read()
 
         except Exception as e:
-            log(f"Failed to replace DOCX horizontal rules: {type(e).__name__}: {e}")
+            log(f"Failed to post-process DOCX document.xml: {type(e).__name__}: {e}")
             return docx_bytes
 
     @staticmethod
-    def auto_layout_tables(docx_bytes: bytes) -> bytes:
-        """
-        根据单元格文本长度调整 DOCX 普通表格列宽。
-
-        该处理主要改善「左侧短标签、右侧长内容」的两列表格，让 Word/WPS
-        打开后右侧内容列获得更多空间，减少不必要换行。
-        """
+    def _replace_horizontal_rules_in_root(root: ET.Element) -> int:
         namespaces = {
-            "w": _WORD_NS,
+            "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+            "m": "http://schemas.openxmlformats.org/officeDocument/2006/math",
+            "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+            "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+            "pic": "http://schemas.openxmlformats.org/drawingml/2006/picture",
+            "wp": "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing",
+            "v": "urn:schemas-microsoft-com:vml",
+            "o": "urn:schemas-microsoft-com:office:office",
+            "w10": "urn:schemas-microsoft-com:office:word",
         }
         for prefix, uri in namespaces.items():
             ET.register_namespace(prefix, uri)
 
-        document_path = "word/document.xml"
-
-        try:
-            input_stream = io.BytesIO(docx_bytes)
-            output_stream = io.BytesIO()
-
-            with zipfile.ZipFile(input_stream, "r") as zin:
-                document_xml = zin.read(document_path)
-                xml_namespaces = DocxProcessor._extract_xml_namespaces(document_xml)
-                DocxProcessor._register_xml_namespaces(xml_namespaces)
-                root = ET.fromstring(document_xml)
+        modified_count = 0
+        for paragraph in root.findall(".//w:p", namespaces):
+            rects = paragraph.findall(".//v:rect", namespaces)
+            if not any(rect.get(f"{{{namespaces['o']}}}hr") == "t" for rect in rects):
+                continue
 
-                modified_count = DocxProcessor._auto_layout_tables_in_element(
-                    root,
-                    namespaces,
-                    _DOCX_TABLE_WIDTH_TWIPS,
-                )
+            paragraph.clear()
+            ppr = ET.SubElement(paragraph, f"{{{namespaces['w']}}}pPr")
+            spacing = ET.SubElement(ppr, f"{{{namespaces['w']}}}spacing")
+            spacing.set(f"{{{namespaces['w']}}}before", "0")
+            spacing.set(f"{{{namespaces['w']}}}after", "0")
+            pbdr = ET.SubElement(ppr, f"{{{namespaces['w']}}}pBdr")
+            bottom = ET.SubElement(pbdr, f"{{{namespaces['w']}}}bottom")
+            bottom.set(f"{{{namespaces['w']}}}val", "single")
+            bottom.set(f"{{{namespaces['w']}}}sz", "6")
+            bottom.set(f"{{{namespaces['w']}}}space", "1")
+            bottom.set(f"{{{namespaces['w']}}}color", "auto")
+            modified_count += 1
 
-                if modified_count == 0:
-                    log("No eligible DOCX table found for auto layout")
-                    return docx_bytes
+        if modified_count == 0:
+            log("No VML horizontal rule found in DOCX")
+        else:
+            log(f"Replaced {modified_count} DOCX horizontal rule(s) with paragraph border(s)")
+        return modified_count
 
-                updated_document_xml = ET.tostring(root, encoding="utf-8", xml_declaration=True)
-                updated_document_xml = DocxProcessor._preserve_ignorable_namespaces(
-                    updated_document_xml,
-                    root,
-                    xml_namespaces,
-                )
+    @staticmethod
+    def _auto_layout_tables_in_root(root: ET.Element) -> int:
+        namespaces = {
+            "w": _WORD_NS,
+        }
+        for prefix, uri in namespaces.items():
+            ET.register_namespace(prefix, uri)
 
-                with zipfile.ZipFile(output_stream, "w") as zout:
-                    for item in zin.infolist():
-                        data = updated_document_xml if item.filename == document_path else zin.read(item.filename)
-                        zout.writestr(item, data)
+        modified_count = DocxProcessor._auto_layout_tables_in_element(
+            root,
+            namespaces,
+            _DOCX_TABLE_WIDTH_TWIPS,
+        )
 
-            output_stream.seek(0)
+        if modified_count == 0:
+            log("No eligible DOCX table found for auto layout")
+        else:
             log(f"Auto-layout applied to {modified_count} DOCX table(s)")
-            return output_stream.read()
-
-        except Exception as e:
-            log(f"Failed to auto-layout DOCX tables: {type(e).__name__}: {e}")
-            return docx_bytes
+        return modified_count
 
     @staticmethod
     def _extract_xml_namespaces(xml_bytes: bytes) -> dict[str, str]:
@@ -648,12 +701,13 @@ class DocxProcessor:
                 target_style
             )
         
+        # document.xml 级别的处理共用一次解压、解析与重新打包
+        transforms = []
         if horizontal_rule_style == "paragraph_border":
-            docx_bytes = DocxProcessor.replace_horizontal_rules_with_paragraph_borders(
-                docx_bytes
-            )
-
+            transforms.append(DocxProcessor._replace_horizontal_rules_in_root)
         if auto_layout_tables:
-            docx_bytes = DocxProcessor.auto_layout_tables(docx_bytes)
-        
+            transforms.append(DocxProcessor._auto_layout_tables_in_root)
+        if transforms:
+            docx_bytes = DocxProcessor._rewrite_document_xml(docx_bytes, transforms)
+
         return docx_bytes
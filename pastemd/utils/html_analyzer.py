@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Iterable, Set
+import re
+from typing import FrozenSet, Iterable, Set
 
 try:
     from bs4 import BeautifulSoup, FeatureNotFound  # type: ignore
@@ -10,12 +11,17 @@ except Exception:  # pragma: no cover - BeautifulSoup is in requirements
     BeautifulSoup = None  # type: ignore
     FeatureNotFound = None  # type: ignore
 
+try:
+    from lxml import etree as _lxml_etree  # type: ignore
+except Exception:  # pragma: no cover - lxml is in requirements
+    _lxml_etree = None  # type: ignore
+
 from .logging import log
 from .clipboard import get_clipboard_text
 from .markdown_utils import is_markdown
 
 # HTML 标签中能提供语义结构的元素集合
-SEMANTIC_TAGS: Set[str] = {
+SEMANTIC_TAGS: FrozenSet[str] = frozenset({
     "p",
     "h1",
     "h2",
@@ -51,10 +57,10 @@ SEMANTIC_TAGS: Set[str] = {
     "aside",
     "nav",
     "hr",
-}
+})
 
 # 复制按钮常见的包裹标签（通常不包含真实结构）
-INLINE_WRAPPER_TAGS: Set[str] = {
+INLINE_WRAPPER_TAGS: FrozenSet[str] = frozenset({
     "span",
     "font",
     "strong",
@@ -68,7 +74,7 @@ INLINE_WRAPPER_TAGS: Set[str] = {
     "del",
     "mark",
     "a",
-}
+})
 
 # Markdown 语法特征，用于辅助判断 HTML 是否只是 Markdown 文本
 MARKDOWN_HINTS: Iterable[str] = (
@@ -92,36 +98,99 @@ MARKDOWN_HINTS: Iterable[str] = (
 )
 
 
-def _count_semantic_tags(html_soup) -> int:
-    """统计 HTML 中带有语义结构的标签数量。"""
+# 原始 HTML 中语义标签开始标记的粗筛；命中也可能位于注释、<style>/<script> 或属性值中，需再确认
+_SEMANTIC_TAG_RE = re.compile(
+    r"<(?:%s)(?=[\s/>])" % "|".join(sorted(SEMANTIC_TAGS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+
+class _SemanticTagFound(Exception):
+    pass
+
+
+class _SemanticTagTarget:
+    """lxml 解析器 target：遇到第一个语义标签即中止解析，不构建树"""
+
+    def start(self, tag, attrib):
+        if isinstance(tag, str) and tag.lower() in SEMANTIC_TAGS:
+            raise _SemanticTagFound
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        return False
+
+
+def _confirm_semantic_tags(html: str) -> bool:
+    """
+    用 lxml 的事件解析确认是否存在语义标签（与 BeautifulSoup(html, "lxml") 的标签判定一致）
+
+    注释、<style>/<script> 内容和属性值不会产生开始标签事件，因此不会误判。
+    lxml 不可用或解析出错时返回 False，交给完整解析路径处理。
+    """
+    if _lxml_etree is None:
+        return False
+    parser = _lxml_etree.HTMLParser(target=_SemanticTagTarget())
+    try:
+        parser.feed(html)
+        return parser.close()
+    except _SemanticTagFound:
+        return True
+    except Exception:
+        return False
+
+
+# wrapper 判定时忽略的文档骨架标签
+_SKELETON_TAGS: FrozenSet[str] = frozenset({"html", "head", "body", "meta", "style"})
+_ALLOWED_WRAPPER_TAGS: FrozenSet[str] = INLINE_WRAPPER_TAGS | _SKELETON_TAGS
+
+
+def _has_semantic_tags(html_soup) -> bool:
+    """
+    是否包含任意语义标签（由 bs4 按名称过滤，命中第一个即返回）。
+    """
     body = html_soup.body or html_soup
-    count = 0
-    for tag in body.find_all(True):
-        name = tag.name.lower()
-        if name in SEMANTIC_TAGS:
-            count += 1
-    return count
+    return body.find(SEMANTIC_TAGS) is not None
 
 
 def _only_contains_inline_wrappers(html_soup) -> bool:
-    """判断 HTML 是否只包含 wrapper / inline 标签。"""
+    """
+    是否只包含 wrapper / inline 标签，遇到第一个其他标签即返回。
+    """
     body = html_soup.body or html_soup
-    for tag in body.find_all(True):
-        name = tag.name.lower()
-        if name in ("html", "head", "body", "meta", "style"):
-            continue
-        if name not in INLINE_WRAPPER_TAGS:
-            return False
-    return True
+    return body.find(lambda tag: tag.name not in _ALLOWED_WRAPPER_TAGS) is None
+
+
+# 按长度降序排列，保证 "\n##" 优先于 "\n#" 匹配
+_MARKDOWN_HINT_RE = re.compile(
+    "|".join(re.escape(hint) for hint in sorted(MARKDOWN_HINTS, key=len, reverse=True))
+)
+
+
+# 匹配到较长特征时，其中包含的较短特征（如 "```" 中的 "`"）同样计分
+_MARKDOWN_HINT_IMPLIES = {
+    hint: frozenset(other for other in MARKDOWN_HINTS if other in hint)
+    for hint in MARKDOWN_HINTS
+}
 
 
 def _markdown_hint_score(text: str) -> int:
-    """根据 Markdown 语法特征粗略打分。"""
-    score = 0
-    for hint in MARKDOWN_HINTS:
-        if hint in text:
-            score += 1
-    return score
+    """根据 Markdown 语法特征粗略打分（命中的不同特征数量）。"""
+    found: Set[str] = set()
+    for match in _MARKDOWN_HINT_RE.finditer(text):
+        found |= _MARKDOWN_HINT_IMPLIES[match.group()]
+        if len(found) >= 2:
+            # 调用方只关心是否达到 2 分，提前结束扫描
+            break
+    return len(found)
 
 
 def _has_yuanbao_formula_tags(soup) -> bool:
@@ -160,6 +229,10 @@ def is_plain_html_fragment(html: str) -> bool:
         lowered = html.lower()
         return not any(tag in lowered for tag in ("<p", "<h1", "<ul", "<table", "<pre", "<code", "<blockquote"))
 
+    # 快速路径：确认含语义标签且不涉及元宝公式检测时直接判定为结构化 HTML，跳过构建 soup
+    if "ybc" not in html and _SEMANTIC_TAG_RE.search(html) and _confirm_semantic_tags(html):
+        return False
+
     try:
         soup = BeautifulSoup(html, "lxml")
     except Exception as exc:  # pragma: no cover - depends on env parser
@@ -178,9 +251,7 @@ def is_plain_html_fragment(html: str) -> bool:
             except Exception as e:
                 log(f"检测元宝公式时获取剪切板文本失败: {e}")
 
-    semantic_count = _count_semantic_tags(soup)
-
-    if semantic_count > 0:
+    if _has_semantic_tags(soup):
         return False
 
     if _only_contains_inline_wrappers(soup):
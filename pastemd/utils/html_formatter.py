@@ -2,24 +2,58 @@
 
 from __future__ import annotations
 
+import html as html_lib
 import re
+from functools import lru_cache
 from typing import Dict, Optional
 
 from bs4 import BeautifulSoup, NavigableString, Tag
 
 _CSS_CLASS_RE = re.compile(r"\.(?P<class>[A-Za-z0-9_-]+)\s*\{(?P<body>[^}]*)\}", re.DOTALL)
+_FONT_PROP_RE = re.compile(r"font-(weight|style)\s*:\s*([^;]+)")
+_FONT_PROP_HINT_RE = re.compile(r"font-(?:weight|style)", re.IGNORECASE)
+_STRIKE_RE = re.compile(r"~~([^~]+?)~~")
+_PANDOC_ATTR_RE = re.compile(r"^\{[^}]+\}\s*(.+)$", re.DOTALL)
+_INDENT_RE = re.compile(r"    +")
+_FENCED_DIV_RE = re.compile(r"^:+\s*\{[^}]*\}")
+
+_BODY_CONTENT_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.DOTALL | re.IGNORECASE)
+_DOCTYPE_RE = re.compile(r"<!DOCTYPE[^>]*>", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"<html[^>]*>|</html>", re.IGNORECASE)
+_HEAD_RE = re.compile(r"<head[^>]*>.*?</head>", re.DOTALL | re.IGNORECASE)
+_BODY_TAG_RE = re.compile(r"<body[^>]*>|</body>", re.IGNORECASE)
+
+_COL_TAG_RE = re.compile(r"<col\b[^>]*>|</col\s*>", re.IGNORECASE)
+# 标签 / 注释 / DOCTYPE 等标记，用于在原始 HTML 中区分文本片段
+# <script>/<style> 内容为原始文本（html.parser 不解码其中的实体），整体作为一个片段单独处理
+_MARKUP_RE = re.compile(
+    r"(<(script|style)\b[^>]*>)(.*?)(</\2\s*>)|<!--.*?-->|<[A-Za-z/!?][^>]*>",
+    re.DOTALL | re.IGNORECASE,
+)
+# 可能拼出 "[" 的字符引用（&#91; / &#x5b; / &lsqb; / &lbrack;）
+_OPEN_BRACKET_REF_RE = re.compile(r"&(?:#0*91;?|#[xX]0*5[bB];?|lsqb;|lbrack;)")
+
+# postprocess_pandoc_html_macwps 中各修复步骤关心的标签
+_WPS_POSTPROCESS_TAGS = ["del", "strong", "em", "div", "p", "input"]
+
+
+def _iter_text_nodes(root):
+    """遍历 root 下的所有文本节点，不经过 find_all 的逐节点过滤匹配，也不构造中间列表"""
+    for node in root.descendants:
+        if isinstance(node, NavigableString):
+            yield node
 
 
 def extract_html_body(html: str) -> str:
     """Extract body content from a standalone HTML document."""
-    body_match = re.search(r"<body[^>]*>(.*?)</body>", html, re.DOTALL | re.IGNORECASE)
+    body_match = _BODY_CONTENT_RE.search(html)
     if body_match:
         return body_match.group(1).strip()
 
-    html = re.sub(r"<!DOCTYPE[^>]*>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<html[^>]*>|</html>", "", html, flags=re.IGNORECASE)
-    html = re.sub(r"<head[^>]*>.*?</head>", "", html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r"<body[^>]*>|</body>", "", html, flags=re.IGNORECASE)
+    html = _DOCTYPE_RE.sub("", html)
+    html = _HTML_TAG_RE.sub("", html)
+    html = _HEAD_RE.sub("", html)
+    html = _BODY_TAG_RE.sub("", html)
     return html.strip()
 
 
@@ -50,6 +84,36 @@ def clean_html_content(soup: BeautifulSoup, options: Optional[Dict[str, object]]
     _clean_latex_br_tags(soup)
 
 
+@lru_cache(maxsize=64)
+def _parse_css_font_classes(css_text: str) -> tuple[tuple[str, tuple[bool, bool]], ...]:
+    """解析样式表中带粗体/斜体的 class，返回 ((class_name, (bold, italic)), ...)"""
+    class_styles: dict[str, tuple[bool, bool]] = {}
+    for match in _CSS_CLASS_RE.finditer(css_text):
+        class_name = match.group("class")
+        body = match.group("body").lower()
+
+        bold = None
+        italic = None
+        # 一次扫描同时取出 font-weight / font-style，各自以首次出现为准
+        for prop_match in _FONT_PROP_RE.finditer(body):
+            prop = prop_match.group(1)
+            value = prop_match.group(2).strip()
+            if prop == "weight":
+                if bold is None:
+                    bold = value in ("bold", "bolder") or (
+                        len(value) <= 4 and value.isdigit() and int(value) >= 600
+                    )
+            elif italic is None:
+                italic = "italic" in value or "oblique" in value
+            if bold is not None and italic is not None:
+                break
+
+        if bold or italic:
+            class_styles[class_name] = (bool(bold), bool(italic))
+
+    return tuple(class_styles.items())
+
+
 def convert_css_font_to_semantic(soup: BeautifulSoup) -> None:
     """
     将 CSS 中的粗体/斜体类映射为 <strong>/<em>，以便 Pandoc 保留样式。
@@ -57,36 +121,19 @@ def convert_css_font_to_semantic(soup: BeautifulSoup) -> None:
     主要用于 Excel/WPS 复制的 HTML：样式往往只写在 <style> 的 class 中，
     直接转 Markdown 会丢失加粗/斜体信息。
     """
-    css_text_parts = []
-    for style in soup.find_all("style"):
-        css_text_parts.append(style.get_text() or "")
-    css_text = "\n".join(css_text_parts)
-    if not css_text.strip():
-        return
-
     class_styles: dict[str, tuple[bool, bool]] = {}
-    for match in _CSS_CLASS_RE.finditer(css_text):
-        class_name = match.group("class")
-        body = match.group("body").lower()
-
-        bold = False
-        italic = False
-        weight_match = re.search(r"font-weight\s*:\s*([^;]+)", body)
-        if weight_match:
-            value = weight_match.group(1).strip()
-            if value in ("bold", "bolder"):
-                bold = True
-            elif value.isdigit() and int(value) >= 600:
-                bold = True
-
-        style_match = re.search(r"font-style\s*:\s*([^;]+)", body)
-        if style_match:
-            value = style_match.group(1).strip()
-            if "italic" in value or "oblique" in value:
-                italic = True
-
-        if bold or italic:
-            class_styles[class_name] = (bold, italic)
+    for style in soup.find_all("style"):
+        # 常见情况下 <style> 只有一个文本子节点，直接取 .string，不必递归拼接
+        contents = style.contents
+        if len(contents) == 1 and isinstance(contents[0], NavigableString):
+            css_text = str(contents[0])
+        else:
+            css_text = style.get_text()
+        # 没有任何 font-weight / font-style 声明（如普通网页样式）时无需逐条解析
+        if not css_text or not _FONT_PROP_HINT_RE.search(css_text):
+            continue
+        # 同一模板复制出的 HTML 样式表相同，按样式表文本缓存解析结果
+        class_styles.update(_parse_css_font_classes(css_text))
 
     if not class_styles:
         return
@@ -103,15 +150,24 @@ def convert_css_font_to_semantic(soup: BeautifulSoup) -> None:
         em = soup.new_tag("em")
         return em, em
 
-    for tag in soup.find_all(class_=True):
+    # 大表格中大量单元格共用同一组 class，按 class 组合缓存合并后的样式
+    combined_styles: dict[tuple, tuple[bool, bool]] = {}
+
+    # 只取出带有粗体/斜体 class 的标签，其余带 class 的标签由 bs4 直接过滤掉
+    for tag in soup.find_all(class_=list(class_styles)):
         classes = tag.get("class") or []
-        bold = False
-        italic = False
-        for class_name in classes:
-            if class_name in class_styles:
-                class_bold, class_italic = class_styles[class_name]
-                bold = bold or class_bold
-                italic = italic or class_italic
+        key = tuple(classes) if isinstance(classes, list) else (classes,)
+        cached = combined_styles.get(key)
+        if cached is None:
+            bold = False
+            italic = False
+            for class_name in key:
+                if class_name in class_styles:
+                    class_bold, class_italic = class_styles[class_name]
+                    bold = bold or class_bold
+                    italic = italic or class_italic
+            cached = combined_styles[key] = (bold, italic)
+        bold, italic = cached
 
         if not (bold or italic):
             continue
@@ -123,8 +179,7 @@ def convert_css_font_to_semantic(soup: BeautifulSoup) -> None:
             if not tag.contents:
                 continue
             wrapper, inner = _build_wrapper(bold, italic)
-            for child in list(tag.contents):
-                inner.append(child.extract())
+            inner.extend(tag)
             tag.append(wrapper)
             continue
 
@@ -136,20 +191,28 @@ def convert_css_font_to_semantic(soup: BeautifulSoup) -> None:
             # 需要补充另一种样式，直接包裹内容
             if tag.name == "strong" and italic:
                 wrapper = soup.new_tag("em")
-                for child in list(tag.contents):
-                    wrapper.append(child.extract())
+                wrapper.extend(tag)
                 tag.append(wrapper)
             elif tag.name == "em" and bold:
                 wrapper = soup.new_tag("strong")
-                for child in list(tag.contents):
-                    wrapper.append(child.extract())
+                wrapper.extend(tag)
                 tag.append(wrapper)
             continue
 
-        wrapper, inner = _build_wrapper(bold, italic)
-        for child in list(tag.contents):
-            inner.append(child.extract())
-        tag.replace_with(wrapper)
+        if tag.can_be_empty_element:
+            wrapper, inner = _build_wrapper(bold, italic)
+            inner.extend(tag)
+            tag.replace_with(wrapper)
+            continue
+
+        # 直接把原标签改成 <strong>/<em>（粗斜体时再套一层 <strong>），
+        # 子节点原地保留，不必逐个搬到新建的包裹标签中
+        tag.attrs = {}
+        if bold and italic:
+            tag.name = "em"
+            tag.wrap(soup.new_tag("strong"))
+        else:
+            tag.name = "strong" if bold else "em"
 
 
 def promote_bold_first_row_to_header(soup: BeautifulSoup) -> None:
@@ -213,39 +276,27 @@ def convert_strikethrough_to_del(soup) -> None:
     Args:
         soup: BeautifulSoup 对象，会被原地修改。
     """
-    # 递归处理所有文本节点
-    for element in soup.find_all(text=True):
-        if isinstance(element, NavigableString):
-            if "~~" not in element:
-                continue
-            pattern = r'~~([^~]+?)~~'
-            if not re.search(pattern, element):
-                continue
+    # 先收集候选文本节点，避免边遍历边修改树
+    for element in [node for node in _iter_text_nodes(soup) if "~~" in node]:
 
-            new_content = []
-            last_end = 0
-            for match in re.finditer(pattern, element):
-                if match.start() > last_end:
-                    new_content.append(element[last_end:match.start()])
+        new_content = []
+        last_end = 0
+        for match in _STRIKE_RE.finditer(element):
+            if match.start() > last_end:
+                new_content.append(NavigableString(element[last_end:match.start()]))
 
-                del_tag = soup.new_tag("del")
-                del_tag.string = match.group(1)
-                new_content.append(del_tag)
-                last_end = match.end()
+            del_tag = soup.new_tag("del")
+            del_tag.string = match.group(1)
+            new_content.append(del_tag)
+            last_end = match.end()
 
-            if last_end < len(element):
-                new_content.append(element[last_end:])
+        if not new_content or element.parent is None:
+            continue
+        if last_end < len(element):
+            new_content.append(NavigableString(element[last_end:]))
 
-            parent = element.parent
-            if not parent:
-                continue
-            index = parent.contents.index(element)
-            element.extract()
-            for i, item in enumerate(new_content):
-                if isinstance(item, str):
-                    parent.insert(index + i, NavigableString(item))
-                else:
-                    parent.insert(index + i, item)
+        # replace_with 通过兄弟指针原地替换，无需 parent.contents.index 线性查找
+        element.replace_with(*new_content)
 
 
 def _clean_latex_br_tags(soup) -> None:
@@ -258,16 +309,10 @@ def _clean_latex_br_tags(soup) -> None:
     Args:
         soup: BeautifulSoup 对象，会被原地修改。
     """  
-    # 查找所有包含 katex 的元素（行内公式和块级公式）
-    katex_elements = soup.find_all(class_=re.compile(r'katex'))
-    
-    for katex_elem in katex_elements:
-        # 在 katex 元素内查找所有 <br> 标签
-        br_tags = katex_elem.find_all('br')
-        
-        for br in br_tags:
-            # 删除 <br> 标签
-            br.replace_with('')
+    # 删除 katex 元素（行内公式和块级公式）内的所有 <br> 标签；
+    # 用 CSS 子串选择器代替对每个标签的 class 做正则匹配
+    for br in soup.select('[class*="katex"] br'):
+        br.extract()
 
     # 处理 $$ ... $$ 包裹的内容
     # 遍历可能的容器元素
@@ -304,7 +349,7 @@ def unwrap_all_p_div_inside_li(soup, unwrap_tags=("p", "div")) -> None:
     wrappers = soup.select(",".join(f"li {t}" for t in unwrap_tags))
 
     # 从深到浅排序：父链越长越深，先 unwrap 深层更安全
-    wrappers.sort(key=lambda node: len(list(node.parents)), reverse=True)
+    wrappers.sort(key=lambda node: sum(1 for _ in node.parents), reverse=True)
 
     for node in wrappers:
         # node 可能已被前面的 unwrap 影响而脱离树，做个保护
@@ -324,10 +369,11 @@ def remove_empty_paragraphs(soup) -> None:
       - 或只包含空白的 span/br 等（尽量温和：只在“可判定为空”时删除）
     """
     for p in soup.find_all("p"):
-        text = p.get_text(strip=True).replace("\u00a0", "").strip()
-        # 如果完全没内容，并且没有 img/iframe 等“非文本但有意义”的元素
-        has_meaningful_media = bool(p.find(["img", "iframe", "video", "audio", "svg"]))
-        if (not text) and (not has_meaningful_media):
+        # 遇到第一个非空白文本即可判定非空（str.strip 同样会去掉 \u00a0），无需拼接整段文本
+        if any(text.strip() for text in p.strings):
+            continue
+        # 完全没内容时，还要确认没有 img/iframe 等“非文本但有意义”的元素
+        if p.find(["img", "iframe", "video", "audio", "svg"]) is None:
             p.decompose()
 
 
@@ -364,14 +410,28 @@ def postprocess_pandoc_html_macwps(html: str) -> str:
     # 清理列表中的 p/div 包装
     unwrap_all_p_div_inside_li(soup)
 
+    # 一次遍历收集后续各步骤需要的标签，代替每个步骤各自 find_all 整棵树
+    tags: Dict[str, list] = {name: [] for name in _WPS_POSTPROCESS_TAGS}
+    for tag in soup.find_all(_WPS_POSTPROCESS_TAGS):
+        tags[tag.name].append(tag)
+    # 注：被前面步骤替换掉的子树中的标签仍在列表里，对它们的修改不会影响输出
+
     # 替换 del 为 s 标签（WPS 兼容）
-    _replace_del_with_s(soup)
+    for tag in tags["del"]:
+        tag.name = "s"
 
     # 修复粗体加斜体的嵌套标签（WPS 兼容性）
-    _fix_bold_italic_nesting(soup)
+    for strong in tags["strong"]:
+        _fix_bold_italic_tag(soup, strong, "em")
+    for em in tags["em"]:
+        _fix_bold_italic_tag(soup, em, "strong")
     
     # 修复代码块格式
-    _fix_pandoc_code_blocks(soup)
+    for div in tags["div"]:
+        if "sourceCode" in (div.get("class") or ()):
+            _fix_source_code_div(soup, div)
+    for p in tags["p"]:
+        _fix_attr_code_paragraph(soup, p)
     
     # 清理 Pandoc 扩展语法残留（如 ::: 语法块）
     # _clean_pandoc_fenced_divs(soup)
@@ -379,7 +439,9 @@ def postprocess_pandoc_html_macwps(html: str) -> str:
     # 清理多余的属性（style, class, data-* 等）
     # _clean_pandoc_attributes(soup)
 
-    _fix_task_list_math_issue(soup)
+    # 恢复任务列表标记
+    for checkbox in tags["input"]:
+        _replace_checkbox_with_text(checkbox)
     
     return str(soup)
 
@@ -399,33 +461,26 @@ def _fix_bold_italic_nesting(soup) -> None:
     """
     # 处理 <strong><em>text</em></strong> 模式
     for strong in soup.find_all('strong'):
-        # 检查 strong 标签是否只包含一个 em 标签
-        children = [c for c in strong.children if c.name or (isinstance(c, NavigableString) and c.strip())]
-        if len(children) == 1 and children[0].name == 'em':
-            em = children[0]
-            text = em.get_text()
-            
-            # 创建新的 span 标签，使用 inline style
-            span = soup.new_tag('span', style='font-weight: bold; font-style: italic;')
-            span.string = text
-            
-            # 替换原来的 strong 标签
-            strong.replace_with(span)
+        _fix_bold_italic_tag(soup, strong, 'em')
     
     # 处理 <em><strong>text</strong></em> 模式
     for em in soup.find_all('em'):
-        # 检查 em 标签是否只包含一个 strong 标签
-        children = [c for c in em.children if c.name or (isinstance(c, NavigableString) and c.strip())]
-        if len(children) == 1 and children[0].name == 'strong':
-            strong = children[0]
-            text = strong.get_text()
-            
-            # 创建新的 span 标签，使用 inline style
-            span = soup.new_tag('span', style='font-weight: bold; font-style: italic;')
-            span.string = text
-            
-            # 替换原来的 em 标签
-            em.replace_with(span)
+        _fix_bold_italic_tag(soup, em, 'strong')
+
+
+def _fix_bold_italic_tag(soup, outer: Tag, inner_name: str) -> None:
+    """若 outer 只包含一个 inner_name 标签，则替换为同时带粗体和斜体样式的 span"""
+    # 检查 outer 标签是否只包含一个 inner 标签
+    children = [c for c in outer.children if c.name or (isinstance(c, NavigableString) and c.strip())]
+    if len(children) == 1 and children[0].name == inner_name:
+        text = children[0].get_text()
+        
+        # 创建新的 span 标签，使用 inline style
+        span = soup.new_tag('span', style='font-weight: bold; font-style: italic;')
+        span.string = text
+        
+        # 替换原来的 outer 标签
+        outer.replace_with(span)
 
 
 def _fix_pandoc_code_blocks(soup) -> None:
@@ -446,58 +501,68 @@ def _fix_pandoc_code_blocks(soup) -> None:
     """
     # 处理 Pandoc 生成的 div.sourceCode 复杂结构
     for div in soup.find_all('div', class_='sourceCode'):
-        # 查找内部的 pre > code 结构
-        pre = div.find('pre')
-        if pre:
-            code = pre.find('code')
-            if code:
-                # 提取所有文本内容（自动合并所有 span 标签中的文本）
-                code_text = code.get_text()
-                
-                # 创建新的简化 pre > code 结构
-                new_pre = soup.new_tag('pre', style='white-space: pre-wrap;')
-                new_code = soup.new_tag('code')
-                new_code.string = code_text
-                new_pre.append(new_code)
-                
-                # 替换整个 div.sourceCode
-                div.replace_with(new_pre)
+        _fix_source_code_div(soup, div)
     
     # 处理 <p> 标签中包含 <code> 的情况（属性标记格式）
     for p in soup.find_all('p'):
-        # 获取 p 标签的所有子节点（排除纯空白文本节点）
-        meaningful_contents = [
-            c for c in p.contents 
-            if c.name or (isinstance(c, NavigableString) and c.strip())
-        ]
-        
-        # 检查 p 是否只包含一个 code 标签
-        code_tags = p.find_all('code', recursive=False)
-        if len(code_tags) == 1 and len(meaningful_contents) == 1:
-            code = code_tags[0]
+        _fix_attr_code_paragraph(soup, p)
+
+
+def _fix_source_code_div(soup, div: Tag) -> None:
+    """将 div.sourceCode 复杂结构替换为简化的 pre > code"""
+    # 查找内部的 pre > code 结构
+    pre = div.find('pre')
+    if pre:
+        code = pre.find('code')
+        if code:
+            # 提取所有文本内容（自动合并所有 span 标签中的文本）
             code_text = code.get_text()
             
-            # 检查是否包含 Pandoc 属性标记（以 { 开头）
-            if code_text.strip().startswith('{'):
-                # 尝试提取属性和实际代码
-                # 格式：{.class! attr="value"} actual code here
-                match = re.match(r'^\{[^}]+\}\s*(.+)$', code_text, re.DOTALL)
-                if match:
-                    actual_code = match.group(1)
-                    
-                    # 恢复代码中的换行
-                    # Pandoc 将多行代码压缩成单行，用多个空格代替换行
-                    # 检测连续的多个空格（通常是 4+ 空格），替换为换行+缩进
-                    actual_code = re.sub(r'    +', '\n    ', actual_code)
-                    
-                    # 创建新的 pre > code 结构，添加 white-space: pre-wrap
-                    pre = soup.new_tag('pre', style='white-space: pre-wrap;')
-                    new_code = soup.new_tag('code')
-                    new_code.string = actual_code
-                    pre.append(new_code)
-                    
-                    # 替换原来的 p 标签
-                    p.replace_with(pre)
+            # 创建新的简化 pre > code 结构
+            new_pre = soup.new_tag('pre', style='white-space: pre-wrap;')
+            new_code = soup.new_tag('code')
+            new_code.string = code_text
+            new_pre.append(new_code)
+            
+            # 替换整个 div.sourceCode
+            div.replace_with(new_pre)
+
+
+def _fix_attr_code_paragraph(soup, p: Tag) -> None:
+    """将只包含带 Pandoc 属性标记的 <code> 的 <p> 替换为 pre > code"""
+    # 获取 p 标签的所有子节点（排除纯空白文本节点）
+    meaningful_contents = [
+        c for c in p.contents 
+        if c.name or (isinstance(c, NavigableString) and c.strip())
+    ]
+    
+    # 检查 p 是否只包含一个 code 标签
+    code_tags = p.find_all('code', recursive=False)
+    if len(code_tags) == 1 and len(meaningful_contents) == 1:
+        code = code_tags[0]
+        code_text = code.get_text()
+        
+        # 检查是否包含 Pandoc 属性标记（以 { 开头）
+        if code_text.strip().startswith('{'):
+            # 尝试提取属性和实际代码
+            # 格式：{.class! attr="value"} actual code here
+            match = _PANDOC_ATTR_RE.match(code_text)
+            if match:
+                actual_code = match.group(1)
+                
+                # 恢复代码中的换行
+                # Pandoc 将多行代码压缩成单行，用多个空格代替换行
+                # 检测连续的多个空格（通常是 4+ 空格），替换为换行+缩进
+                actual_code = _INDENT_RE.sub('\n    ', actual_code)
+                
+                # 创建新的 pre > code 结构，添加 white-space: pre-wrap
+                pre = soup.new_tag('pre', style='white-space: pre-wrap;')
+                new_code = soup.new_tag('code')
+                new_code.string = actual_code
+                pre.append(new_code)
+                
+                # 替换原来的 p 标签
+                p.replace_with(pre)
 
 
 def _clean_pandoc_attributes(soup) -> None:
@@ -565,16 +630,15 @@ def _clean_pandoc_fenced_divs(soup) -> None:
         soup: BeautifulSoup 对象，会被原地修改。
     """
     # 查找包含 Pandoc 扩展语法的文本节点
-    for text_node in soup.find_all(text=True):
-        if isinstance(text_node, NavigableString):
-            text = str(text_node)
-            # 匹配以 : 开头的 Pandoc 扩展语法
-            if re.match(r'^:+\s*\{[^}]*\}', text.strip()):
-                # 完全移除这类文本
-                text_node.extract()
-            elif text.strip().startswith(':::'):
-                # 移除包含 ::: 的行
-                text_node.extract()
+    for text_node in [node for node in _iter_text_nodes(soup) if ':' in node]:
+        text = str(text_node).strip()
+        # 匹配以 : 开头的 Pandoc 扩展语法
+        if _FENCED_DIV_RE.match(text):
+            # 完全移除这类文本
+            text_node.extract()
+        elif text.startswith(':::'):
+            # 移除包含 ::: 的行
+            text_node.extract()
 
 
 def clean_html_for_wps(html: str) -> str:
@@ -627,13 +691,25 @@ def clean_html_for_wps(html: str) -> str:
     return str(soup)
 
 
-def _remove_col_tags(soup) -> None:
+def _replace_task_markers(text: str) -> str:
+    return text.replace('[x]', '{{TASK_CHECKED}}').replace('[ ]', '{{TASK_UNCHECKED}}')
+
+
+def _protect_task_list_text(text: str) -> str:
     """
-    移除 HTML 中的 <col> 标签。
-    Pandoc 处理带有 span 属性的 <col> 标签时可能会导致表格转换错误。
+    将一段 HTML 文本（标签之间的内容）中的任务列表标记替换为特殊标记
+
+    与按文本节点处理一致：先解码字符引用（如 &#91;x&#93;），替换后再转义 & < >。
     """
-    for col in soup.find_all("col"):
-        col.decompose()
+    if '&' in text:
+        decoded = html_lib.unescape(text)
+        if decoded != text:
+            if '[x]' not in decoded and '[ ]' not in decoded:
+                return text
+            return html_lib.escape(_replace_task_markers(decoded), quote=False)
+    if '[x]' not in text and '[ ]' not in text:
+        return text
+    return _replace_task_markers(text)
 
 
 def protect_brackets(html: str) -> str:
@@ -653,10 +729,29 @@ def protect_brackets(html: str) -> str:
     Returns:
         处理后的 HTML 字符串
     """
-    soup = BeautifulSoup(html, "html.parser")
-    _remove_col_tags(soup)
-    _protect_task_list_brackets(soup)
-    return str(soup)
+    # 直接在原始字符串上处理，省去一次完整的解析 + 序列化。
+    # 移除 <col> 标签：Pandoc 处理带有 span 属性的 <col> 标签时可能会导致表格转换错误
+    html = _COL_TAG_RE.sub("", html)
+    if '[x]' not in html and '[ ]' not in html:
+        # 标记也可能以字符引用形式出现（如 &#91;x&#93;、[&#32;]）
+        if '&' not in html or ('[' not in html and not _OPEN_BRACKET_REF_RE.search(html)):
+            return html
+
+    # 只替换标签之外的文本，避免改动属性值
+    parts = []
+    last_end = 0
+    for match in _MARKUP_RE.finditer(html):
+        parts.append(_protect_task_list_text(html[last_end:match.start()]))
+        if match.group(1) is not None:
+            # <script>/<style> 内容不解码实体，直接替换
+            parts.append(match.group(1))
+            parts.append(_replace_task_markers(match.group(3)))
+            parts.append(match.group(4))
+        else:
+            parts.append(match.group())
+        last_end = match.end()
+    parts.append(_protect_task_list_text(html[last_end:]))
+    return "".join(parts)
 
 
 def _protect_task_list_brackets(soup) -> None:
@@ -672,16 +767,15 @@ def _protect_task_list_brackets(soup) -> None:
     Args:
         soup: BeautifulSoup 对象，会被原地修改。
     """
-    # 遍历所有文本节点
-    for text_node in soup.find_all(text=True):
-        if isinstance(text_node, NavigableString):
-            text = str(text_node)
-            # 只处理包含任务列表标记的文本
-            if '[x]' in text or '[ ]' in text or '[X]' in text:
-                # 替换为特殊标记
-                text = text.replace('[x]', '{{TASK_CHECKED}}')
-                text = text.replace('[ ]', '{{TASK_UNCHECKED}}')
-                text_node.replace_with(text)
+    # 遍历所有含 "[" 的文本节点（先收集，避免边遍历边替换）
+    for text_node in [node for node in _iter_text_nodes(soup) if '[' in node]:
+        text = str(text_node)
+        # 只处理包含任务列表标记的文本
+        if '[x]' in text or '[ ]' in text or '[X]' in text:
+            # 替换为特殊标记
+            text = text.replace('[x]', '{{TASK_CHECKED}}')
+            text = text.replace('[ ]', '{{TASK_UNCHECKED}}')
+            text_node.replace_with(text)
 
 
 def _restore_task_list_brackets(soup) -> None:
@@ -690,15 +784,20 @@ def _restore_task_list_brackets(soup) -> None:
     """
     # 1. 寻找所有的 input 标签
     for checkbox in soup.find_all('input'):
-        # 更加鲁棒的判断：如果是 checkbox 或者它带有 checked 属性
-        is_checkbox = checkbox.get('type') == 'checkbox'
-        if is_checkbox:
-            # 判断是否选中
-            is_checked = checkbox.has_attr('checked')
-            replacement_text = "[x] " if is_checked else "[ ] "
-            
-            # 核心修复：使用 NavigableString 确保替换为纯文本
-            checkbox.replace_with(NavigableString(replacement_text))
+        _replace_checkbox_with_text(checkbox)
+
+
+def _replace_checkbox_with_text(checkbox: Tag) -> None:
+    """将 checkbox 类型的 input 标签替换为 [x] 或 [ ] 文本"""
+    # 更加鲁棒的判断：如果是 checkbox 或者它带有 checked 属性
+    is_checkbox = checkbox.get('type') == 'checkbox'
+    if is_checkbox:
+        # 判断是否选中
+        is_checked = checkbox.has_attr('checked')
+        replacement_text = "[x] " if is_checked else "[ ] "
+        
+        # 核心修复：使用 NavigableString 确保替换为纯文本
+        checkbox.replace_with(NavigableString(replacement_text))
 
 
 def _fix_task_list_math_issue(soup) -> None:
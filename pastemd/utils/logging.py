@@ -59,3 +59,11 @@ def log(message: str, level: int = logging.INFO) -> None:
     except Exception:
         # 记录日志失败时静默处理，避免递归错误
         pass
+
+
+def is_enabled_for(level: int) -> bool:
+    """判断指定级别的日志是否会被记录，用于跳过昂贵的日志参数构造"""
+    try:
+        return _get_logger().isEnabledFor(level)
+    except Exception:
+        return False
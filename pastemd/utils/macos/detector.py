@@ -11,7 +11,9 @@ macOS application detection utilities.
 """
 
 from __future__ import annotations
+import re
 import subprocess
+import time
 
 from AppKit import NSWorkspace, NSRunningApplication
 from Quartz import (
@@ -21,6 +23,34 @@ from Quartz import (
 )
 
 from ..logging import log
+from .osascript import OSASCRIPT
+
+
+# WPS 窗口标题识别规则（匹配小写标题），按子串匹配
+_EXCEL_EXT_RE = re.compile(r"\.(?:et|xlsx?|csv)")
+_WORD_EXT_RE = re.compile(r"\.(?:docx?|wps)")
+_EXCEL_KEYWORD_RE = re.compile(r"wps spreadsheets|表格|工作簿|spreadsheet|sheet")
+_WORD_KEYWORD_RE = re.compile(r"wps writer|文字|文档|writer|document")
+
+# 前台进程的 pid、bundle id、名称，按行输出；bundle id 可能为 missing value
+_FRONTMOST_PROCESS_SCRIPT = """
+tell application "System Events"
+    set frontProc to first application process whose frontmost is true
+    set procId to (unix id of frontProc) as text
+    set procBundle to ""
+    try
+        set bundleValue to bundle identifier of frontProc
+        if bundleValue is not missing value then set procBundle to bundleValue
+    end try
+    set procName to name of frontProc
+end tell
+return procId & linefeed & procBundle & linefeed & procName
+"""
+
+# 一次粘贴会多次查询前台应用（应用检测、WPS 类型判断、路由取窗口标题），
+# 每次都要启动 osascript；短时间内复用上一次结果
+_FRONTMOST_APP_TTL_S = 0.2
+_frontmost_app_cache: tuple[float, dict | None] = (float("-inf"), None)
 
 
 def detect_active_app() -> str:
@@ -90,42 +120,26 @@ def detect_wps_type() -> str:
     title_l = window_title.lower()
 
     # 优先级1: 文件后缀判断（最明确）
-    excel_extensions = [".et", ".xls", ".xlsx", ".csv"]
-    for ext in excel_extensions:
-        if ext in title_l:
-            log(f"通过窗口标题后缀 '{ext}' 识别为 WPS 表格")
-            return "wps_excel"
-
-    word_extensions = [".doc", ".docx", ".wps"]
-    for ext in word_extensions:
-        if ext in title_l:
-            log(f"通过窗口标题后缀 '{ext}' 识别为 WPS 文字")
-            return "wps"
+    match = _EXCEL_EXT_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题后缀 '{match.group()}' 识别为 WPS 表格")
+        return "wps_excel"
+
+    match = _WORD_EXT_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题后缀 '{match.group()}' 识别为 WPS 文字")
+        return "wps"
 
     # 优先级2: 关键词判断（不同语言/版本的 WPS 可能不同，可按你用户群继续补充）
-    excel_keywords = [
-        "wps spreadsheets",
-        "表格",
-        "工作簿",
-        "spreadsheet",
-        "sheet",
-    ]
-    for kw in excel_keywords:
-        if kw.lower() in title_l:
-            log(f"通过窗口标题关键词 '{kw}' 识别为 WPS 表格")
-            return "wps_excel"
-
-    word_keywords = [
-        "wps writer",
-        "文字",
-        "文档",
-        "writer",
-        "document",
-    ]
-    for kw in word_keywords:
-        if kw.lower() in title_l:
-            log(f"通过窗口标题关键词 '{kw}' 识别为 WPS 文字")
-            return "wps"
+    match = _EXCEL_KEYWORD_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题关键词 '{match.group()}' 识别为 WPS 表格")
+        return "wps_excel"
+
+    match = _WORD_KEYWORD_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题关键词 '{match.group()}' 识别为 WPS 文字")
+        return "wps"
 
     log("无明确标识,默认识别为 WPS 文字")
     return "wps"
@@ -149,39 +163,38 @@ def _get_frontmost_app() -> dict | None:
 
 
 def _get_frontmost_app_via_osascript() -> dict | None:
+    """
+    通过 AppleScript 获取 frontmost app，_FRONTMOST_APP_TTL_S 内的重复调用直接复用上次结果
+    """
+    global _frontmost_app_cache
+    cached_at, app = _frontmost_app_cache
+    if time.monotonic() - cached_at < _FRONTMOST_APP_TTL_S:
+        return dict(app) if app else None
+
+    app = _query_frontmost_app_via_osascript()
+    _frontmost_app_cache = (time.monotonic(), app)
+    return dict(app) if app else None
+
+
+def _query_frontmost_app_via_osascript() -> dict | None:
     """
     兜底方案：通过 AppleScript 获取 frontmost app 名称（非常稳定）
     通过 pid 反查 NSRunningApplication，获取更准确的 localizedName/bundle_id
     """
     try:
-        pid_cmd = [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get unix id of first application process whose frontmost is true'
-        ]
-        pid_str = subprocess.check_output(
-            pid_cmd,
+        # 一次 osascript 同时取回 pid / bundle id / 名称，每行一个字段
+        output = subprocess.check_output(
+            [OSASCRIPT, "-e", _FRONTMOST_PROCESS_SCRIPT],
             text=True,
             encoding="utf-8",
             errors="replace",
-        ).strip()
-        bundle_id = ""
-        bundle_cmd = [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get bundle identifier of first application process whose frontmost is true'
-        ]
-        try:
-            bundle_id = subprocess.check_output(
-                bundle_cmd,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-            ).strip()
-        except Exception:
-            bundle_id = ""
-        if pid_str:
-            pid = int(pid_str)
+        )
+        pid_str, bundle_id, name = (output.strip("\n").split("\n", 2) + ["", ""])[:3]
+        pid_str = pid_str.strip()
+        bundle_id = bundle_id.strip()
+        name = name.strip()
+        pid = int(pid_str) if pid_str else None
+        if pid is not None:
             app = NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
             if app:
                 app_name = str(app.localizedName() or "")
@@ -201,20 +214,10 @@ def _get_frontmost_app_via_osascript() -> dict | None:
                     "pid": int(app.processIdentifier()),
                 }
 
-        name_cmd = [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get name of first application process whose frontmost is true'
-        ]
-        name = subprocess.check_output(
-            name_cmd,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        ).strip()
         if not name:
             return None
-        return {"name": name, "bundle_id": bundle_id, "pid": None}
+        # NSRunningApplication 查不到时仍保留 osascript 给出的 pid，窗口标题检测依赖它
+        return {"name": name, "bundle_id": bundle_id, "pid": pid}
     except Exception as e:
         log(f"获取前台应用失败(osascript): {e}")
         return None
@@ -223,51 +226,33 @@ def _get_frontmost_app_via_osascript() -> dict | None:
 def get_frontmost_window_title() -> str:
     """
     尝试获取前台窗口标题
-    先通过 osascript 获取前台应用的 pid，再查询该进程的窗口
+    先获取前台应用的 pid（与应用检测共用缓存），再查询该进程的窗口
     """
     try:
-        # 先获取前台应用的 pid
-        cmd = [
-            "osascript",
-            "-e",
-            'tell application "System Events" to get unix id of first application process whose frontmost is true'
-        ]
-        pid_str = subprocess.check_output(
-            cmd,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-        ).strip()
-        if not pid_str:
+        app = _get_frontmost_app_via_osascript()
+        frontmost_pid = app.get("pid") if app else None
+        if frontmost_pid is None:
             return ""
         
-        frontmost_pid = int(pid_str)
-        
         # 获取屏幕上所有窗口的基本信息（不包含桌面元素）
         options = kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements
         win_list = CGWindowListCopyWindowInfo(options, 0) or []
 
-        # 只看前台进程的窗口
-        candidates = []
+        # 只看前台进程的窗口，返回第一个有标题的普通窗口
+        # （pyobjc 返回的 NSNumber 可直接与 int 比较，无需逐个转换）
         for w in win_list:
             try:
-                owner_pid = int(w.get("kCGWindowOwnerPID", -1))
-                layer = int(w.get("kCGWindowLayer", 999))
-                title = w.get("kCGWindowName", "") or ""
-
-                if layer != 0:
+                if w.get("kCGWindowOwnerPID") != frontmost_pid:
                     continue
-                if owner_pid != frontmost_pid:
+                if w.get("kCGWindowLayer") != 0:
                     continue
 
+                title = w.get("kCGWindowName") or ""
                 if title.strip():
-                    candidates.append(title)
+                    return str(title)
             except Exception:
                 continue
 
-        if candidates:
-            return str(candidates[0])
-
         return ""
     except Exception as e:
         log(f"获取前台窗口标题失败: {e}")
@@ -0,0 +1,147 @@
+"""Shared helper for running AppleScript through osascript."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import subprocess
+import threading
+from typing import Optional
+
+from ..logging import log
+
+# 使用绝对路径，跳过每次调用时的 PATH 查找
+OSASCRIPT = "/usr/bin/osascript" if os.path.exists("/usr/bin/osascript") else "osascript"
+OSACOMPILE = "/usr/bin/osacompile" if os.path.exists("/usr/bin/osacompile") else "osacompile"
+
+# 源码 -> .scpt 路径；None 表示预编译失败，之后不再重试
+_compiled_scripts: dict[str, Optional[str]] = {}
+_compiling: set[str] = set()
+_compile_lock = threading.Lock()
+
+
+def run_applescript(script: str, *args: str, timeout: float) -> subprocess.CompletedProcess:
+    """
+    执行一段 AppleScript 并返回结果
+
+    Args:
+        script: AppleScript 源码；需要参数时使用 ``on run argv`` 读取
+        *args: 传给脚本 run handler 的参数，避免把动态内容拼进脚本源码
+        timeout: 超时时间（秒）
+
+    Note:
+        osascript 从 stdin 读取脚本时要等到 EOF 才会编译执行，无法作为常驻协处理器
+        复用，因此每次调用仍是一次独立进程；所有调用统一经过这里，便于集中优化。
+
+    Raises:
+        subprocess.CalledProcessError: 脚本执行失败
+        subprocess.TimeoutExpired: 执行超时
+    """
+    # 脚本通过 stdin 传入（"-"），命令行只保留参数；"-" 之后的参数不再被当作选项解析
+    # 调用方不使用 stdout；stderr 保留原始字节，仅在出错时解码
+    return subprocess.run(
+        [OSASCRIPT, "-", *args],
+        input=script.encode("utf-8"),
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+    )
+
+
+def error_output(e: subprocess.CalledProcessError) -> str:
+    """解码 run_applescript 失败时的 stderr"""
+    if not e.stderr:
+        return str(e)
+    return e.stderr.decode("utf-8", "replace").strip()
+
+
+def compile_applescript(script: str, output_dir: str, name: str) -> Optional[str]:
+    """
+    将 AppleScript 预编译为 .scpt 文件并返回路径，失败返回 None
+
+    文件名包含源码摘要，脚本内容变化后会自动重新编译；编译产物被删除时也会重新生成。
+    预编译失败会被记住，之后直接返回 None，不再重复调用 osacompile。
+    """
+    digest = hashlib.blake2b(script.encode("utf-8"), digest_size=8).hexdigest()
+    path = os.path.join(output_dir, f"{name}-{digest}.scpt")
+    with _compile_lock:
+        if script in _compiled_scripts:
+            cached = _compiled_scripts[script]
+            if cached is None or os.path.exists(cached):
+                return cached
+        try:
+            if not os.path.exists(path):
+                os.makedirs(output_dir, exist_ok=True)
+                # osacompile 未指定源文件时从 stdin 读取脚本
+                subprocess.run(
+                    [OSACOMPILE, "-o", path],
+                    input=script.encode("utf-8"),
+                    check=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=10,
+                )
+        except subprocess.CalledProcessError as e:
+            log(f"AppleScript 预编译失败: {error_output(e)}")
+            path = None
+        except Exception as e:
+            log(f"AppleScript 预编译失败: {e}")
+            path = None
+        _compiled_scripts[script] = path
+        return path
+
+
+def _compile_in_background(script: str, output_dir: str, name: str) -> None:
+    """在后台线程预编译脚本（同一脚本只发起一次）"""
+    with _compile_lock:
+        if script in _compiling:
+            return
+        _compiling.add(script)
+
+    def _worker() -> None:
+        try:
+            compile_applescript(script, output_dir, name)
+        finally:
+            with _compile_lock:
+                _compiling.discard(script)
+
+    threading.Thread(target=_worker, name="AppleScriptCompile", daemon=True).start()
+
+
+def run_compiled_applescript(
+    script: str,
+    *args: str,
+    output_dir: str,
+    name: str,
+    timeout: float,
+) -> subprocess.CompletedProcess:
+    """
+    执行预编译的 AppleScript，省去每次调用时的词法分析与编译
+
+    首次调用时在后台线程预编译，本次及编译完成前的调用直接执行源码；
+    预编译失败后始终执行源码，不再重试，调用线程从不等待 osacompile。
+
+    Raises:
+        subprocess.CalledProcessError: 脚本执行失败
+        subprocess.TimeoutExpired: 执行超时
+    """
+    with _compile_lock:
+        known = script in _compiled_scripts
+        path = _compiled_scripts.get(script)
+    if path is not None and not os.path.exists(path):
+        # 编译产物被删除：重新在后台编译
+        with _compile_lock:
+            _compiled_scripts.pop(script, None)
+        known, path = False, None
+    if not known:
+        _compile_in_background(script, output_dir, name)
+    if path is None:
+        return run_applescript(script, *args, timeout=timeout)
+    return subprocess.run(
+        [OSASCRIPT, path, *args],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        timeout=timeout,
+    )
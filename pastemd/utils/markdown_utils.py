@@ -4,6 +4,46 @@
 import re
 
 
+# ``` 围栏代码块：起始/结束围栏成对出现
+_FENCE_RE = re.compile(
+    r'^\s{0,3}(`{3,})[^\n]*\n'   # 开始：``` 或更多反引号，允许 ```python
+    r'[\s\S]*?\n'               # 内容（非贪婪）
+    r'^\s{0,3}\1\s*$',          # 结束：同样数量的反引号
+    re.MULTILINE
+)
+
+# LaTeX 数学公式，合并为一个交替正则，整段文本只需扫描一次
+_LATEX_ANY = re.compile(
+    r'\$\$[\s\S]*?\$\$'                           # 块级：$$...$$（允许跨行）
+    r'|\\\[[\s\S]*?\\\]'                          # 块级：\[...\]（允许跨行）
+    r'|\\\([^\n]*?\\\)'                           # 行内：\(...\)（不跨行）
+    r'|(?<!\$)\$(?!\$)[^\n$]+(?<!\$)\$(?!\$)'     # 行内：$...$（不跨行；排除 $$...$$）
+)
+
+# 常见 Markdown 语法特征，合并为一个交替正则，整段文本只需扫描一次
+_MD_ANY = re.compile(
+    "|".join(
+        f"(?:{p})"
+        for p in (
+            r'^\s{0,3}#{1,6}\s+',        # 标题
+            r'\[.+?\]\(.+?\)',           # 链接
+            r'^\s*[-*+]\s+',             # 无序列表
+            r'^\s*\d+\.\s+',             # 有序列表
+            r'^>\s+',                    # 引用
+            r'`[^`]+`',                  # 行内代码
+            r'!\[.*?\]\(.+?\)',          # 图片
+            r'(\*\*|__).+?(\*\*|__)',    # 粗体
+            r'(\*|_).+?(\*|_)',          # 斜体（可能误判）
+        )
+    ),
+    re.MULTILINE,
+)
+
+# 上述任一语法（含围栏代码块、公式）都至少包含其中一个字符；
+# 一个都没有的纯文本可直接判定为非 Markdown，无需进入正则引擎
+_MD_TRIGGER = frozenset("#`*_[]()>$\\-+!0123456789")
+
+
 def merge_markdown_contents(files_data: list[tuple[str, str]]) -> str:
     """
     合并多个 MD 文件内容
@@ -35,16 +75,10 @@ def has_backtick_fenced_code_block(text: str) -> bool:
     """
     检测 ``` 这种 fenced code block，并要求起始/结束围栏成对出现。
     """
-    if not text:
+    if not text or '`' not in text:
         return False
 
-    pattern = re.compile(
-        r'^\s{0,3}(`{3,})[^\n]*\n'   # 开始：``` 或更多反引号，允许 ```python
-        r'[\s\S]*?\n'               # 内容（非贪婪）
-        r'^\s{0,3}\1\s*$',          # 结束：同样数量的反引号
-        re.MULTILINE
-    )
-    return bool(pattern.search(text))
+    return bool(_FENCE_RE.search(text))
 
 
 def has_latex_math(text: str) -> bool:
@@ -54,50 +88,22 @@ def has_latex_math(text: str) -> bool:
     块级：$$...$$ 或 \\[ ... \\]
     这里对 $...$ 不做内容限制（更宽松，误判风险也更高，比如 $100）。
     """
-    if not text:
+    if not text or ('$' not in text and '\\' not in text):
         return False
 
-    # 块级：$$...$$（允许跨行）
-    if re.search(r'\$\$[\s\S]*?\$\$', text):
-        return True
-
-    # 块级：\[...\]（允许跨行）
-    if re.search(r'\\\[[\s\S]*?\\\]', text):
-        return True
-
-    # 行内：\(...\)（不跨行）
-    if re.search(r'\\\([^\n]*?\\\)', text):
-        return True
-
-    # 行内：$...$（不跨行；排除 $$...$$）
-    if re.search(r'(?<!\$)\$(?!\$)[^\n$]+(?<!\$)\$(?!\$)', text):
-        return True
-
-    return False
+    return _LATEX_ANY.search(text) is not None
 
 def is_markdown(text: str) -> bool:
     if not text or not isinstance(text, str):
         return False
 
+    if _MD_TRIGGER.isdisjoint(text):
+        return False
+
     if has_backtick_fenced_code_block(text):
         return True
 
     if has_latex_math(text):
         return True
 
-    md_patterns = [
-        r'^\s{0,3}#{1,6}\s+',        # 标题
-        r'\[.+?\]\(.+?\)',           # 链接
-        r'^\s*[-*+]\s+',             # 无序列表
-        r'^\s*\d+\.\s+',             # 有序列表
-        r'^>\s+',                    # 引用
-        r'`[^`]+`',                  # 行内代码
-        r'!\[.*?\]\(.+?\)',          # 图片
-        r'(\*\*|__).+?(\*\*|__)',    # 粗体
-        r'(\*|_).+?(\*|_)',          # 斜体（可能误判）
-    ]
-
-    for p in md_patterns:
-        if re.search(p, text, re.MULTILINE):
-            return True
-    return False
\ No newline at end of file
+    return bool(_MD_ANY.search(text))
@@ -8,15 +8,50 @@ Office-compatible HTML with formula support.
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from html.entities import name2codepoint
 from typing import Callable
 
 from .logging import log
 
 
+_MATHML_ELEMENT_RE = re.compile(r'<math[^>]*>.*?</math>', re.DOTALL | re.IGNORECASE)
+_TAG_STRIP_RE = re.compile(r'<[^>]+>')
+
+# MathML and table blocks matched in one scan; MathML inside a table is consumed
+# by the table match, so it never shows up as a standalone formula
+_MATH_OR_TABLE_RE = re.compile(
+    r'(<math[^>]*>.*?</math>)|(<table[^>]*>.*?</table>)',
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+_mathml2omml = None
+
+
+def _load_mathml2omml():
+    """Import mathml2omml on first use and keep the module for later calls."""
+    global _mathml2omml
+    if _mathml2omml is None:
+        try:
+            import mathml2omml
+        except ImportError:
+            raise ImportError("mathml2omml library is required. Install with: pip install mathml2omml")
+        _mathml2omml = mathml2omml
+    return _mathml2omml
+
+
+@lru_cache(maxsize=512)
+def _convert_with_default_entities(mathml: str) -> str:
+    return _load_mathml2omml().convert(mathml, name2codepoint)
+
+
 def convert_mathml_to_omml(mathml: str, entity_map: dict | None = None) -> str:
     """Convert MathML to OMML using mathml2omml library.
     
+    Conversions using the default entity map are cached, so repeated
+    formulas are only converted once.
+
     Args:
         mathml: MathML XML string
         entity_map: Optional entity name to codepoint mapping (default: html.entities.name2codepoint)
@@ -28,14 +63,14 @@ def convert_mathml_to_omml(mathml: str, entity_map: dict | None = None) -> str:
         ImportError: If mathml2omml library is not installed
         ValueError: If conversion fails
     """
-    try:
-        import mathml2omml
-    except ImportError:
-        raise ImportError("mathml2omml library is required. Install with: pip install mathml2omml")
-    
     if entity_map is None:
-        entity_map = name2codepoint
-    
+        _load_mathml2omml()
+        try:
+            return _convert_with_default_entities(mathml)
+        except Exception as e:
+            raise ValueError(f"Failed to convert MathML to OMML: {e}")
+
+    mathml2omml = _load_mathml2omml()
     try:
         return mathml2omml.convert(mathml, entity_map)
     except Exception as e:
@@ -51,11 +86,10 @@ def extract_mathml_elements(html: str) -> list[tuple[str, int, int]]:
     Returns:
         List of (mathml_string, start_pos, end_pos) tuples
     """
-    pattern = r'<math[^>]*>.*?</math>'
-    matches = []
-    for match in re.finditer(pattern, html, re.DOTALL | re.IGNORECASE):
-        matches.append((match.group(0), match.start(), match.end()))
-    return matches
+    return [
+        (match.group(0), match.start(), match.end())
+        for match in _MATHML_ELEMENT_RE.finditer(html)
+    ]
 
 
 def wrap_omml_conditional(omml: str, fallback_text: str = "") -> str:
@@ -74,29 +108,6 @@ def wrap_omml_conditional(omml: str, fallback_text: str = "") -> str:
     return result
 
 
-def _extract_table_ranges(html: str) -> list[tuple[int, int]]:
-    """Extract table ranges from HTML.
-
-    Args:
-        html: HTML string containing table elements
-
-    Returns:
-        List of (start_pos, end_pos) tuples for table blocks
-    """
-    pattern = r'<table[^>]*>.*?</table>'
-    ranges = []
-    for match in re.finditer(pattern, html, re.DOTALL | re.IGNORECASE):
-        ranges.append((match.start(), match.end()))
-    return ranges
-
-
-def _is_within_ranges(start: int, end: int, ranges: list[tuple[int, int]]) -> bool:
-    for range_start, range_end in ranges:
-        if start >= range_start and end <= range_end:
-            return True
-    return False
-
-
 def convert_html_mathml_to_omml(html: str, *, skip_table_mathml: bool = False) -> str:
     """Replace MathML elements in HTML with OMML conditional comments.
 
@@ -107,31 +118,35 @@ def convert_html_mathml_to_omml(html: str, *, skip_table_mathml: bool = False) -
     Returns:
         HTML with MathML replaced by OMML conditional comments
     """
-    mathml_elements = extract_mathml_elements(html)
+    if skip_table_mathml:
+        mathml_elements = [
+            (match.group(1), match.start(), match.end())
+            for match in _MATH_OR_TABLE_RE.finditer(html)
+            if match.lastindex == 1
+        ]
+    else:
+        mathml_elements = extract_mathml_elements(html)
     if not mathml_elements:
         return html
 
-    table_ranges: list[tuple[int, int]] = []
-    if skip_table_mathml:
-        table_ranges = _extract_table_ranges(html)
-
-    # Process in reverse order to preserve positions
-    result = html
-    for mathml, start, end in reversed(mathml_elements):
-        if table_ranges and _is_within_ranges(start, end, table_ranges):
-            continue
+    # Build the output in a single forward pass instead of re-splicing the string
+    parts: list[str] = []
+    cursor = 0
+    for mathml, start, end in mathml_elements:
+        parts.append(html[cursor:start])
+        cursor = end
         try:
             omml = convert_mathml_to_omml(mathml)
             # Extract original text content as fallback
-            fallback = re.sub(r'<[^>]+>', '', mathml)
-            replacement = wrap_omml_conditional(omml, fallback)
-            result = result[:start] + replacement + result[end:]
+            fallback = _TAG_STRIP_RE.sub('', mathml)
+            parts.append(wrap_omml_conditional(omml, fallback))
         except Exception as e:
             log(f"Failed to convert MathML element: {e}")
             # Keep original MathML if conversion fails
-            continue
+            parts.append(mathml)
+    parts.append(html[cursor:])
 
-    return result
+    return "".join(parts)
 
 
 def generate_office_html(
@@ -16,13 +16,24 @@ from ...utils.logging import log
 from ...core.constants import CLIPBOARD_HTML_WAIT_MS, CLIPBOARD_POLL_INTERVAL_MS
 
 
-def _snapshot_clipboard() -> dict[int, bytes]:
+# 注册型剪贴板格式的 ID 在会话内固定，导入时注册一次即可（失败时为 0，调用处再注册）
+try:
+    _CF_HTML_FORMAT = wc.RegisterClipboardFormat("HTML Format")
+    _CF_RTF_FORMAT = wc.RegisterClipboardFormat("Rich Text Format")
+except Exception:
+    _CF_HTML_FORMAT = _CF_RTF_FORMAT = 0
+
+_ClipboardValue = bytes | str | tuple[str, ...]
+
+
+def _snapshot_clipboard() -> dict[int, _ClipboardValue]:
     """
     Best-effort snapshot of all clipboard formats.
     
-    Returns a dict of {format_id: data_bytes}.
+    Returns a dict of {format_id: data}. 数据保持 GetClipboardData 返回的原始形态
+    （bytes / 文本 str / CF_HDROP 路径元组），恢复时无需再编码、解码一轮。
     """
-    snapshot: dict[int, bytes] = {}
+    snapshot: dict[int, _ClipboardValue] = {}
     try:
         wc.OpenClipboard(None)
         try:
@@ -35,14 +46,11 @@ def _snapshot_clipboard() -> dict[int, bytes]:
                 try:
                     data = wc.GetClipboardData(fmt)
                     if data is not None:
-                        # 转换为 bytes
-                        if isinstance(data, bytes):
+                        if isinstance(data, (bytes, str)):
                             snapshot[fmt] = data
-                        elif isinstance(data, str):
-                            snapshot[fmt] = data.encode('utf-16le')
                         elif isinstance(data, (list, tuple)):
                             # CF_HDROP 文件列表
-                            snapshot[fmt] = "\0".join(data).encode('utf-16le') + b'\0\0'
+                            snapshot[fmt] = tuple(data)
                         else:
                             # 尝试转换其他类型
                             try:
@@ -60,7 +68,7 @@ def _snapshot_clipboard() -> dict[int, bytes]:
     return snapshot
 
 
-def _restore_clipboard(snapshot: dict[int, bytes]) -> None:
+def _restore_clipboard(snapshot: dict[int, _ClipboardValue]) -> None:
     """
     Restore clipboard from snapshot.
     """
@@ -71,8 +79,15 @@ def _restore_clipboard(snapshot: dict[int, bytes]) -> None:
             
             for fmt, data in snapshot.items():
                 try:
-                    # 特殊处理某些格式
-                    if fmt == wc.CF_UNICODETEXT:
+                    if isinstance(data, str):
+                        # 文本格式按原样写回
+                        wc.SetClipboardData(fmt, data.rstrip('\0'))
+                    elif isinstance(data, tuple):
+                        # 文件列表，需要重建 DROPFILES 结构
+                        files = [f for f in data if f]
+                        if files:
+                            wc.SetClipboardData(fmt, _build_hdrop_data(files))
+                    elif fmt == wc.CF_UNICODETEXT:
                         # Unicode 文本需要解码后设置
                         text = data.decode('utf-16le', errors='ignore').rstrip('\0')
                         wc.SetClipboardData(fmt, text)
@@ -80,13 +95,6 @@ def _restore_clipboard(snapshot: dict[int, bytes]) -> None:
                         # ANSI 文本
                         text = data.decode('cp1252', errors='ignore').rstrip('\0')
                         wc.SetClipboardData(fmt, text)
-                    elif fmt == wc.CF_HDROP:
-                        # 文件列表，需要重建 DROPFILES 结构
-                        files_str = data.decode('utf-16le', errors='ignore').rstrip('\0')
-                        files = [f for f in files_str.split('\0') if f]
-                        if files:
-                            hdrop_data = _build_hdrop_data(files)
-                            wc.SetClipboardData(fmt, hdrop_data)
                     else:
                         # 其他格式直接设置原始字节
                         wc.SetClipboardData(fmt, data)
@@ -106,7 +114,7 @@ def preserve_clipboard(*, restore_delay_s: float = 0.25):
     
     Useful for apps that require clipboard-based rich-text paste.
     """
-    snapshot: dict[int, bytes] | None = None
+    snapshot: dict[int, _ClipboardValue] | None = None
     try:
         snapshot = _snapshot_clipboard()
         yield
@@ -120,6 +128,21 @@ def preserve_clipboard(*, restore_delay_s: float = 0.25):
                 log(f"Failed to restore clipboard: {exc}")
 
 
+_CF_HTML_START_MARKER = "<!--StartFragment-->"
+_CF_HTML_END_MARKER = "<!--EndFragment-->"
+_CF_HTML_WRAPPER_PREFIX = "<html><head><meta charset=\"utf-8\"></head><body>"
+_CF_HTML_WRAPPER_SUFFIX = "</body></html>"
+_CF_HTML_HEADER_TEMPLATE = (
+    "Version:1.0\r\n"
+    "StartHTML:{:010d}\r\n"
+    "EndHTML:{:010d}\r\n"
+    "StartFragment:{:010d}\r\n"
+    "EndFragment:{:010d}\r\n"
+)
+# Header length is stable because we always format 10-digit offsets.
+_CF_HTML_HEADER_LEN = len(_CF_HTML_HEADER_TEMPLATE.format(0, 0, 0, 0).encode("ascii"))
+
+
 def _build_cf_html(html: str) -> bytes:
     """
     Build CF_HTML payload bytes for the Windows clipboard ("HTML Format").
@@ -127,47 +150,40 @@ def _build_cf_html(html: str) -> bytes:
     CF_HTML is an ASCII header + UTF-8 HTML. Offsets are byte offsets from the
     start of the payload.
     """
-    start_marker = "<!--StartFragment-->"
-    end_marker = "<!--EndFragment-->"
+    start_html = _CF_HTML_HEADER_LEN
 
-    if start_marker in html and end_marker in html:
-        html_doc = html
-    else:
-        html_doc = (
-            "<html><head><meta charset=\"utf-8\"></head><body>"
-            f"{start_marker}{html}{end_marker}"
-            "</body></html>"
-        )
-
-    html_bytes = html_doc.encode("utf-8")
-
-    header_template = (
-        "Version:1.0\r\n"
-        "StartHTML:{:010d}\r\n"
-        "EndHTML:{:010d}\r\n"
-        "StartFragment:{:010d}\r\n"
-        "EndFragment:{:010d}\r\n"
-    )
-
-    # Header length is stable because we always format 10-digit offsets.
-    header_placeholder = header_template.format(0, 0, 0, 0).encode("ascii")
-    start_html = len(header_placeholder)
-    end_html = start_html + len(html_bytes)
-
-    start_marker_b = start_marker.encode("ascii")
-    end_marker_b = end_marker.encode("ascii")
-    sf_index = html_bytes.find(start_marker_b)
-    ef_index = html_bytes.find(end_marker_b)
-    if sf_index == -1 or ef_index == -1 or ef_index < sf_index:
-        start_fragment = start_html
-        end_fragment = end_html
-    else:
-        start_fragment = start_html + sf_index + len(start_marker_b)
-        end_fragment = start_html + ef_index
+    if _CF_HTML_START_MARKER in html and _CF_HTML_END_MARKER in html:
+        html_bytes = html.encode("utf-8")
+        end_html = start_html + len(html_bytes)
 
-    header = header_template.format(start_html, end_html, start_fragment, end_fragment).encode(
-        "ascii"
-    )
+        # 在 str 中定位标记；前缀为纯 ASCII 时字符偏移即字节偏移，否则只编码前缀求字节偏移
+        sf_index = html.find(_CF_HTML_START_MARKER)
+        ef_index = html.find(_CF_HTML_END_MARKER)
+        if ef_index < sf_index:
+            start_fragment = start_html
+            end_fragment = end_html
+        else:
+            if not html[:ef_index].isascii():
+                sf_bytes = len(html[:sf_index].encode("utf-8"))
+                ef_index = sf_bytes + len(html[sf_index:ef_index].encode("utf-8"))
+                sf_index = sf_bytes
+            start_fragment = start_html + sf_index + len(_CF_HTML_START_MARKER)
+            end_fragment = start_html + ef_index
+    else:
+        # 自行包装时片段位置已知，无需再查找标记
+        fragment_bytes = html.encode("utf-8")
+        html_bytes = b"".join((
+            (_CF_HTML_WRAPPER_PREFIX + _CF_HTML_START_MARKER).encode("ascii"),
+            fragment_bytes,
+            (_CF_HTML_END_MARKER + _CF_HTML_WRAPPER_SUFFIX).encode("ascii"),
+        ))
+        end_html = start_html + len(html_bytes)
+        start_fragment = start_html + len(_CF_HTML_WRAPPER_PREFIX) + len(_CF_HTML_START_MARKER)
+        end_fragment = start_fragment + len(fragment_bytes)
+
+    header = _CF_HTML_HEADER_TEMPLATE.format(
+        start_html, end_html, start_fragment, end_fragment
+    ).encode("ascii")
     return header + html_bytes
 
 
@@ -186,8 +202,8 @@ def set_clipboard_rich_text(
         - `docx_bytes` is currently ignored on Windows (no reliable standard clipboard format).
     """
     try:
-        fmt_html = wc.RegisterClipboardFormat("HTML Format")
-        fmt_rtf = wc.RegisterClipboardFormat("Rich Text Format")
+        fmt_html = _CF_HTML_FORMAT or wc.RegisterClipboardFormat("HTML Format")
+        fmt_rtf = _CF_RTF_FORMAT or wc.RegisterClipboardFormat("Rich Text Format")
 
         wc.OpenClipboard(None)
         try:
@@ -224,10 +240,12 @@ def _try_read_cf_html(wait_ms: int, interval_ms: int) -> bytes | str | None:
     Returns:
         CF_HTML 原始数据（bytes 或 str），失败返回 None（不抛异常）。
     """
-    try:
-        fmt = wc.RegisterClipboardFormat("HTML Format")
-    except Exception:
-        return None
+    fmt = _CF_HTML_FORMAT
+    if not fmt:
+        try:
+            fmt = wc.RegisterClipboardFormat("HTML Format")
+        except Exception:
+            return None
 
     deadline = time.monotonic() + (wait_ms / 1000.0)
     interval_s = max(1, interval_ms) / 1000.0
@@ -273,6 +291,48 @@ def _try_read_cf_html(wait_ms: int, interval_ms: int) -> bytes | str | None:
     return None
 
 
+_CLIPBOARD_OPEN_ATTEMPTS = 3
+_CLIPBOARD_RETRY_DELAY_S = 0.03
+
+
+def _get_text_direct() -> str:
+    """通过 win32clipboard 直接读取 CF_UNICODETEXT（剪贴板被占用时做几次轻量重试）"""
+    last_error: Exception | None = None
+    for _ in range(_CLIPBOARD_OPEN_ATTEMPTS):
+        try:
+            wc.OpenClipboard(None)
+        except Exception as e:
+            last_error = e
+            time.sleep(_CLIPBOARD_RETRY_DELAY_S)
+            continue
+        try:
+            if not wc.IsClipboardFormatAvailable(wc.CF_UNICODETEXT):
+                return ""
+            return wc.GetClipboardData(wc.CF_UNICODETEXT) or ""
+        finally:
+            wc.CloseClipboard()
+    raise last_error
+
+
+def _set_text_direct(text: str) -> None:
+    """通过 win32clipboard 直接写入 CF_UNICODETEXT（剪贴板被占用时做几次轻量重试）"""
+    last_error: Exception | None = None
+    for _ in range(_CLIPBOARD_OPEN_ATTEMPTS):
+        try:
+            wc.OpenClipboard(None)
+        except Exception as e:
+            last_error = e
+            time.sleep(_CLIPBOARD_RETRY_DELAY_S)
+            continue
+        try:
+            wc.EmptyClipboard()
+            wc.SetClipboardData(wc.CF_UNICODETEXT, text)
+            return
+        finally:
+            wc.CloseClipboard()
+    raise last_error
+
+
 def get_clipboard_text() -> str:
     """
     获取剪贴板文本内容
@@ -284,10 +344,7 @@ def get_clipboard_text() -> str:
         ClipboardError: 剪贴板操作失败时
     """
     try:
-        text = pyperclip.paste()
-        if text is None:
-            return ""
-        return text
+        return _get_text_direct()
     except Exception as e:
         raise ClipboardError(f"Failed to read clipboard: {e}")
 
@@ -303,7 +360,7 @@ def set_clipboard_text(text: str) -> None:
         ClipboardError: 剪贴板操作失败时
     """
     try:
-        pyperclip.copy(text)
+        _set_text_direct(text)
     except Exception as e:
         raise ClipboardError(f"Failed to set clipboard text: {e}")
 
@@ -367,6 +424,19 @@ def get_clipboard_html(config: dict | None = None) -> str:
         raise ClipboardError(f"Failed to read HTML from clipboard: {e}") from e
 
 
+# CF_HTML 头部的偏移量字段（每行一个 Key:数字）
+_CF_HTML_HEADER_RE = re.compile(
+    rb"^[ \t]*(StartHTML|EndHTML|StartFragment|EndFragment)[ \t]*:[ \t]*(\d+)[ \t]*\r?$",
+    re.M,
+)
+_CF_HTML_HEADER_STR_RE = re.compile(
+    r"^[ \t]*(StartHTML|EndHTML|StartFragment|EndFragment)[ \t]*:[ \t]*(\d+)[ \t]*\r?$",
+    re.M,
+)
+_FRAGMENT_ANCHOR_RE_BYTES = re.compile(rb"<!--StartFragment-->(.*)<!--EndFragment-->", re.S)
+_FRAGMENT_ANCHOR_RE = re.compile(r"<!--StartFragment-->(.*)<!--EndFragment-->", re.S)
+
+
 def _extract_html_fragment_bytes(cf_html_bytes: bytes) -> str:
     """
     从 CF_HTML bytes 中提取完整 HTML（优先使用 StartHTML/EndHTML）。
@@ -375,17 +445,13 @@ def _extract_html_fragment_bytes(cf_html_bytes: bytes) -> str:
     - 失败时回退到 StartFragment/EndFragment
     - 最后兜底返回全部内容
     """
-    meta: dict[str, str] = {}
-    for raw_line in cf_html_bytes.splitlines():
-        stripped = raw_line.strip()
-        if stripped.startswith(b"<!--"):
-            break
-        if b":" in raw_line:
-            k, v = raw_line.split(b":", 1)
-            key = k.decode("ascii", errors="ignore").strip()
-            val = v.decode("ascii", errors="ignore").strip()
-            if key:
-                meta[key] = val
+    # 头部位于第一个 "<" 之前，只扫描这一小段而不是整个 HTML 正文
+    header_end = cf_html_bytes.find(b"<")
+    header = cf_html_bytes if header_end < 0 else cf_html_bytes[:header_end]
+    meta: dict[str, str] = {
+        m.group(1).decode("ascii"): m.group(2).decode("ascii")
+        for m in _CF_HTML_HEADER_RE.finditer(header)
+    }
 
     # 优先使用 StartHTML/EndHTML 返回完整 HTML
     start_html = meta.get("StartHTML", "")
@@ -412,11 +478,7 @@ def _extract_html_fragment_bytes(cf_html_bytes: bytes) -> str:
             pass
 
     # 尝试通过锚点提取
-    m = re.search(
-        rb"<!--StartFragment-->(.*)<!--EndFragment-->",
-        cf_html_bytes,
-        flags=re.S,
-    )
+    m = _FRAGMENT_ANCHOR_RE_BYTES.search(cf_html_bytes)
     if m:
         return m.group(1).decode("utf-8", errors="ignore")
 
@@ -434,14 +496,10 @@ def _extract_html_fragment(cf_html: str) -> str:
     Returns:
         完整 HTML 内容
     """
-    # 提取元数据
-    meta = {}
-    for line in cf_html.splitlines():
-        if line.strip().startswith("<!--"):
-            break
-        if ":" in line:
-            k, v = line.split(":", 1)
-            meta[k.strip()] = v.strip()
+    # 提取元数据（头部位于第一个 "<" 之前）
+    header_end = cf_html.find("<")
+    header = cf_html if header_end < 0 else cf_html[:header_end]
+    meta = {m.group(1): m.group(2) for m in _CF_HTML_HEADER_STR_RE.finditer(header)}
     
     # 优先使用 StartHTML/EndHTML 提取完整 HTML
     start_html = meta.get("StartHTML")
@@ -466,7 +524,7 @@ def _extract_html_fragment(cf_html: str) -> str:
             pass
     
     # 兜底：使用注释锚点提取
-    m = re.search(r"<!--StartFragment-->(.*)<!--EndFragment-->", cf_html, flags=re.S)
+    m = _FRAGMENT_ANCHOR_RE.search(cf_html)
     if m:
         return m.group(1)
     
@@ -510,15 +568,15 @@ def _build_hdrop_data(file_paths: list) -> bytes:
         ]
 
     # 准备文件列表数据 (UTF-16LE, double-null terminated)
-    # 路径之间用 \0 分隔，整个列表以 \0\0 结尾
-    files_text = "\0".join(file_paths) + "\0\0"
-    files_data = files_text.encode("utf-16le")
+    # 每个路径单独编码后直接写入缓冲区，路径之间用 \0 分隔，整个列表以 \0\0 结尾
+    encoded_paths = [path.encode("utf-16le") for path in file_paths]
+    files_size = sum(len(data) for data in encoded_paths) + 2 * max(len(encoded_paths) + 1, 2)
     
     # 计算结构体大小
     struct_size = ctypes.sizeof(DROPFILES)
     
-    # 创建缓冲区
-    total_size = struct_size + len(files_data)
+    # 创建缓冲区（create_string_buffer 已清零，分隔符与结尾的 \0 无需另写）
+    total_size = struct_size + files_size
     buf = ctypes.create_string_buffer(total_size)
     
     # 填充结构体
@@ -530,7 +588,10 @@ def _build_hdrop_data(file_paths: list) -> bytes:
     
     # 填充文件数据
     # 使用 ctypes.memmove 确保数据正确复制到缓冲区指定偏移位置
-    ctypes.memmove(ctypes.byref(buf, struct_size), files_data, len(files_data))
+    offset = struct_size
+    for data in encoded_paths:
+        ctypes.memmove(ctypes.byref(buf, offset), data, len(data))
+        offset += len(data) + 2
     
     return buf.raw
 
@@ -595,6 +656,36 @@ def _copy_files_as_text(file_paths: list) -> None:
 # 剪贴板文件检测与读取（仅 Windows）
 # ============================================================
 
+def _probe_clipboard_files(*, read_paths: bool) -> tuple[bool, list[str]]:
+    """
+    在一次 OpenClipboard 会话内检测 CF_HDROP，并按需读取文件路径
+
+    Args:
+        read_paths: 是否同时读取文件路径列表
+
+    Returns:
+        (是否包含文件, 文件路径列表)；剪贴板多次打开失败时返回 (False, [])
+    """
+    # 某些应用会暂时占用剪贴板，这里做几次轻量重试
+    for attempt in range(_CLIPBOARD_OPEN_ATTEMPTS):
+        try:
+            wc.OpenClipboard(None)
+            try:
+                if not wc.IsClipboardFormatAvailable(wc.CF_HDROP):
+                    return False, []
+                if not read_paths:
+                    return True, []
+                # data 是一个包含文件路径的元组
+                data = wc.GetClipboardData(wc.CF_HDROP)
+                return True, list(data) if data else []
+            finally:
+                wc.CloseClipboard()
+        except Exception as e:
+            log(f"Clipboard files probe attempt {attempt + 1} failed: {e}")
+            time.sleep(_CLIPBOARD_RETRY_DELAY_S)
+    return False, []
+
+
 def is_clipboard_files() -> bool:
     """
     检测剪贴板是否包含文件（CF_HDROP 格式）
@@ -603,20 +694,9 @@ def is_clipboard_files() -> bool:
         True 如果剪贴板中存在文件；否则 False
     """
     try:
-        # 某些应用会暂时占用剪贴板，这里做几次轻量重试
-        for attempt in range(3):
-            try:
-                wc.OpenClipboard(None)
-                try:
-                    result = bool(wc.IsClipboardFormatAvailable(wc.CF_HDROP))
-                    log(f"Clipboard files check: {result}")
-                    return result
-                finally:
-                    wc.CloseClipboard()
-            except Exception as e:
-                log(f"Clipboard files check attempt {attempt + 1} failed: {e}")
-                time.sleep(0.03)
-        return False
+        result = _probe_clipboard_files(read_paths=False)[0]
+        log(f"Clipboard files check: {result}")
+        return result
     except Exception as e:
         log(f"Failed to check clipboard files: {e}")
         return False
@@ -631,28 +711,14 @@ def get_clipboard_files() -> list[str]:
     Returns:
         文件绝对路径列表
     """
-    file_paths = []
     try:
-        for attempt in range(3):
-            try:
-                wc.OpenClipboard(None)
-                try:
-                    if wc.IsClipboardFormatAvailable(wc.CF_HDROP):
-                        data = wc.GetClipboardData(wc.CF_HDROP)
-                        # data 是一个包含文件路径的元组
-                        if data:
-                            file_paths = list(data)
-                            log(f"Got {len(file_paths)} files from clipboard")
-                        break
-                finally:
-                    wc.CloseClipboard()
-            except Exception as e:
-                log(f"Get clipboard files attempt {attempt + 1} failed: {e}")
-                time.sleep(0.03)
+        file_paths = _probe_clipboard_files(read_paths=True)[1]
+        if file_paths:
+            log(f"Got {len(file_paths)} files from clipboard")
+        return file_paths
     except Exception as e:
         log(f"Failed to get clipboard files: {e}")
-    
-    return file_paths
+        return []
 
 
 # ============================================================
@@ -1,6 +1,8 @@
 """Windows application detection utilities."""
 
-import win32com.client
+import re
+from functools import lru_cache
+
 from .window import (
     get_foreground_process_name,
     get_foreground_process_path,
@@ -9,6 +11,35 @@ from .window import (
 from ..logging import log
 
 
+# WPS 窗口标题识别规则：后缀匹配小写标题，关键词区分大小写，均按子串匹配
+_EXCEL_EXT_RE = re.compile(r"\.(?:et|xlsx?|csv)")
+_WORD_EXT_RE = re.compile(r"\.(?:docx?|wps)")
+_EXCEL_KEYWORD_RE = re.compile(r"WPS 表格| - WPS Spreadsheets| ET |工作簿")
+_WORD_KEYWORD_RE = re.compile(r"文字文稿|WPS 文字| - WPS Writer")
+
+# 进程名（小写）-> 应用类型；WPS 统一进程需再区分文字/表格，不在表中
+_PROCESS_APP_MAP = {
+    "winword.exe": "word",
+    "excel.exe": "excel",
+    "onenote.exe": "onenote",
+    "powerpnt.exe": "powerpoint",
+    "有道云笔记.exe": "youdao",
+    "et.exe": "wps_excel",  # 独立的 WPS 表格进程(较少见)
+}
+
+
+_win32com_client = None
+
+
+def _get_active_object(prog_id: str):
+    """GetActiveObject 的包装：首次使用时才导入 win32com.client（启动阶段无需加载 COM 支持）"""
+    global _win32com_client
+    if _win32com_client is None:
+        import win32com.client
+        _win32com_client = win32com.client
+    return _win32com_client.GetActiveObject(prog_id)
+
+
 def detect_active_app() -> str:
     """
     检测当前活跃的插入目标应用
@@ -17,9 +48,14 @@ def detect_active_app() -> str:
         "word", "wps", "excel", "wps_excel" 或前台进程路径（用于可扩展工作流匹配）
     """
     process_name = get_foreground_process_name()
-    process_path = get_foreground_process_path()
     log(f"前台进程名称: {process_name}")
     
+    # 常见进程名直接查表
+    app = _PROCESS_APP_MAP.get(process_name)
+    if app:
+        return app
+    
+    # 其余按子串匹配（兼容带前后缀的进程名）
     if "winword" in process_name:
         return "word"
     elif "excel" in process_name:
@@ -28,15 +64,12 @@ def detect_active_app() -> str:
         return "onenote"
     elif "powerpnt" in process_name:
         return "powerpoint"
-    elif process_name == "有道云笔记.exe":
-        return "youdao"
-    elif process_name == "et.exe":  # 独立的 WPS 表格进程(较少见)
-        return "wps_excel"
     elif "wps" in process_name:  # WPS Office 统一进程
         # 需要进一步区分是文字还是表格
         return detect_wps_type()
     else:
         # 兜底：返回进程路径（用于可扩展工作流匹配）
+        process_path = get_foreground_process_path()
         if process_path:
             return process_path.lower()
         return process_name or ""
@@ -52,19 +85,20 @@ def detect_wps_type() -> str:
     """
     window_title = get_foreground_window_title()
     log(f"WPS 窗口标题: {window_title}")
+    normalized_title = _normalize_title(window_title)
     
     # 方法1: 通过 COM 对象判断(最准确)
     # 尝试获取 WPS 表格的 COM 对象,并检查当前激活的窗口是否匹配
     excel_prog_ids = ["ket.Application", "ET.Application"]
     for prog_id in excel_prog_ids:
         try:
-            app = win32com.client.GetActiveObject(prog_id)
+            app = _get_active_object(prog_id)
             # 检查 COM 对象的活动窗口标题是否与前台窗口标题匹配
             try:
                 com_caption = app.ActiveDocument.Name
                 log(f"WPS 表格 COM 窗口标题: {com_caption}")
                 # 比较窗口标题(去除空格和换行符)
-                if _normalize_title(com_caption) in _normalize_title(window_title):
+                if _normalize_title(com_caption) in normalized_title:
                     log("通过 COM 窗口标题匹配,确认为 WPS 表格")
                     return "wps_excel"
                 else:
@@ -76,91 +110,45 @@ def detect_wps_type() -> str:
         except Exception:
             continue
     
-    # 方法2: 尝试获取 WPS 文字的 COM 对象
-    word_prog_ids = ["kwps.Application", "KWPS.Application"]
-    for prog_id in word_prog_ids:
-        try:
-            app = win32com.client.GetActiveObject(prog_id)
-            # 检查 COM 对象的活动窗口标题是否与前台窗口标题匹配
-            try:
-                # WPS 文字可能使用 Caption
-                com_caption = app.ActiveDocument.Name
-                log(f"WPS 文字 COM Caption: {com_caption}")
-                # WPS 文字的 Caption 通常是 "Microsoft Word",不太有用
-                # 但我们可以验证 ProgID 是否可用
-                # 如果能连接到,说明 WPS 文字在运行
-                log(f"成功连接到 {prog_id}")
-                # 不能直接判断是否在前台,需要依靠窗口标题
-                break
-            except Exception as e:
-                log(f"无法获取 {prog_id} 的 Caption: {e}")
-        except Exception:
-            continue
+    # WPS 文字的 COM 对象只能说明 WPS 文字在运行，无法判断是否在前台，
+    # 因此不再逐个探测其 ProgID，直接依靠窗口标题判断
     
-    # 方法3: 通过窗口标题关键词判断
+    # 方法2: 通过窗口标题关键词判断
     log("COM 检测失败,使用窗口标题判断")
     
-    # 优先级1: 文件后缀判断（最明确）
-    # WPS 表格的文件后缀
-    excel_extensions = [
-        ".et",
-        ".xls",
-        ".xlsx",
-        ".csv",
-    ]
-    
-    # 先检查表格文件后缀
-    for ext in excel_extensions:
-        if ext in window_title.lower():
-            log(f"通过窗口标题后缀 '{ext}' 识别为 WPS 表格")
-            return "wps_excel"
-    
-    # WPS 文字的文件后缀
-    word_extensions = [
-        ".doc",
-        ".docx",
-        ".wps",
-    ]
-    
-    # 检查文字文件后缀
-    for ext in word_extensions:
-        if ext in window_title.lower():
-            log(f"通过窗口标题后缀 '{ext}' 识别为 WPS 文字")
-            return "wps"
-    
-    # 优先级2: 关键词判断
-    # WPS 表格的关键词
-    excel_keywords = [
-        "WPS 表格",
-        " - WPS Spreadsheets",
-        " ET ",
-        "工作簿",
-    ]
+    # 优先级1: 文件后缀判断（最明确），先表格后文字
+    title_l = window_title.lower()
+    match = _EXCEL_EXT_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题后缀 '{match.group()}' 识别为 WPS 表格")
+        return "wps_excel"
     
-    # 检查是否是 WPS 表格
-    for keyword in excel_keywords:
-        if keyword in window_title:
-            log(f"通过窗口标题关键词 '{keyword}' 识别为 WPS 表格")
-            return "wps_excel"
+    match = _WORD_EXT_RE.search(title_l)
+    if match:
+        log(f"通过窗口标题后缀 '{match.group()}' 识别为 WPS 文字")
+        return "wps"
     
-    # WPS 文字的关键词
-    word_keywords = [
-        "文字文稿",
-        "WPS 文字",
-        " - WPS Writer",
-    ]
+    # 优先级2: 关键词判断（区分大小写），先表格后文字
+    match = _EXCEL_KEYWORD_RE.search(window_title)
+    if match:
+        log(f"通过窗口标题关键词 '{match.group()}' 识别为 WPS 表格")
+        return "wps_excel"
     
-    # 检查是否是 WPS 文字
-    for keyword in word_keywords:
-        if keyword in window_title:
-            log(f"通过窗口标题关键词 '{keyword}' 识别为 WPS 文字")
-            return "wps"
+    match = _WORD_KEYWORD_RE.search(window_title)
+    if match:
+        log(f"通过窗口标题关键词 '{match.group()}' 识别为 WPS 文字")
+        return "wps"
     
     # 默认认为是 WPS 文字
     log("无明确标识,默认识别为 WPS 文字")
     return "wps"
 
 
+# 标准化标题时需要去掉的字符：空格、换行
+_TITLE_STRIP_MAP = str.maketrans("", "", " \n\r")
+
+
+@lru_cache(maxsize=128)
 def _normalize_title(title: str) -> str:
     """
     标准化窗口标题(去除空格、换行等)
@@ -173,7 +161,7 @@ def _normalize_title(title: str) -> str:
     """
     if not title:
         return ""
-    return title.replace(" ", "").replace("\n", "").replace("\r", "").lower()
+    return title.translate(_TITLE_STRIP_MAP).lower()
 
 
 def _verify_wps_excel_running() -> bool:
@@ -186,7 +174,7 @@ def _verify_wps_excel_running() -> bool:
     excel_prog_ids = ["ket.Application", "ET.Application"]
     for prog_id in excel_prog_ids:
         try:
-            app = win32com.client.GetActiveObject(prog_id)
+            app = _get_active_object(prog_id)
             # 验证确实有活动工作表
             try:
                 _ = app.ActiveSheet
@@ -1,8 +1,12 @@
 """Windows window and process API utilities."""
 
+import ctypes
 import os
-from time import sleep
+import time
+from collections import OrderedDict
+from ctypes import wintypes
 import psutil
+from win32con import GW_OWNER, GWL_EXSTYLE, GWL_STYLE, WS_CAPTION, WS_EX_APPWINDOW, WS_EX_TOOLWINDOW
 import win32gui
 import win32process
 from ..logging import log
@@ -22,6 +26,103 @@ def get_foreground_window() -> int:
         return 0
 
 
+# 一次热键触发会依次查询前台进程名、路径和窗口标题，短时间内同一前台窗口复用查询结果
+_FOREGROUND_CACHE_TTL_S = 0.25
+_foreground_cache: dict = {"hwnd": 0, "ts": float("-inf")}
+
+
+# (pid, 进程创建时间) -> (exe 路径, 进程名)；带上创建时间可识别 pid 复用
+_PROCESS_INFO_CACHE_MAX = 256
+_process_info_cache: "OrderedDict[tuple[int, float], tuple[str, str]]" = OrderedDict()
+
+
+def _get_process_info(pid: int) -> tuple[str, str]:
+    """
+    获取进程的可执行文件路径和进程名，同一进程重复查询时复用缓存
+
+    Raises:
+        psutil.Error: 进程不存在或无权访问时
+    """
+    proc = psutil.Process(pid)
+    try:
+        # 构造 Process 时已读取创建时间，这里不会再发起系统调用
+        key = (pid, proc.create_time())
+    except psutil.AccessDenied:
+        return proc.exe(), proc.name()
+
+    info = _process_info_cache.get(key)
+    if info is not None:
+        _process_info_cache.move_to_end(key)
+        return info
+
+    info = (proc.exe(), proc.name())
+    _process_info_cache[key] = info
+    if len(_process_info_cache) > _PROCESS_INFO_CACHE_MAX:
+        _process_info_cache.popitem(last=False)
+    return info
+
+
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_MAX_IMAGE_PATH = 32768
+
+_kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+_kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+_kernel32.OpenProcess.restype = wintypes.HANDLE
+_kernel32.QueryFullProcessImageNameW.argtypes = (
+    wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+)
+_kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+_kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+_kernel32.CloseHandle.restype = wintypes.BOOL
+
+
+def _exe_from_pid(pid: int) -> str:
+    """
+    通过 QueryFullProcessImageNameW 直接获取进程的可执行文件路径
+
+    只需要 PROCESS_QUERY_LIMITED_INFORMATION 权限，省去构造 psutil.Process 的开销
+
+    Raises:
+        OSError: 打开进程或查询路径失败时
+    """
+    handle = _kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        raise ctypes.WinError(ctypes.get_last_error())
+    try:
+        size = wintypes.DWORD(_MAX_IMAGE_PATH)
+        buf = ctypes.create_unicode_buffer(_MAX_IMAGE_PATH)
+        if not _kernel32.QueryFullProcessImageNameW(handle, 0, buf, ctypes.byref(size)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return buf.value
+    finally:
+        _kernel32.CloseHandle(handle)
+
+
+def _foreground_entry(hwnd: int) -> dict:
+    """返回 hwnd 对应的前台缓存项；窗口变化或超过 TTL 时重置"""
+    now = time.monotonic()
+    if _foreground_cache["hwnd"] != hwnd or now - _foreground_cache["ts"] >= _FOREGROUND_CACHE_TTL_S:
+        _foreground_cache.clear()
+        _foreground_cache.update(hwnd=hwnd, ts=now)
+    return _foreground_cache
+
+
+def _foreground_exe(hwnd: int) -> str:
+    """获取窗口所属进程的可执行文件路径（小写），结果写入前台缓存"""
+    entry = _foreground_entry(hwnd)
+    exe = entry.get("exe")
+    if exe is None:
+        _, pid = win32process.GetWindowThreadProcessId(hwnd)
+        try:
+            exe = _exe_from_pid(pid)
+        except OSError as e:
+            log(f"QueryFullProcessImageNameW failed for PID {pid}, falling back to psutil: {e}")
+            exe = _get_process_info(pid)[0]
+        exe = exe.lower()
+        entry["exe"] = exe
+    return exe
+
+
 def get_foreground_process_name() -> str:
     """
     获取当前前台进程的名称
@@ -34,9 +135,7 @@ def get_foreground_process_name() -> str:
         if not hwnd:
             return ""
         
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        process = psutil.Process(pid)
-        return os.path.basename(process.exe()).lower()
+        return os.path.basename(_foreground_exe(hwnd))
         
     except Exception as e:
         log(f"Failed to get foreground process: {e}")
@@ -55,9 +154,7 @@ def get_foreground_process_path() -> str:
         if not hwnd:
             return ""
         
-        _, pid = win32process.GetWindowThreadProcessId(hwnd)
-        process = psutil.Process(pid)
-        return process.exe().lower()
+        return _foreground_exe(hwnd)
         
     except Exception as e:
         log(f"Failed to get foreground process path: {e}")
@@ -75,7 +172,12 @@ def get_foreground_window_title() -> str:
         hwnd = get_foreground_window()
         if not hwnd:
             return ""
-        return win32gui.GetWindowText(hwnd)
+        entry = _foreground_entry(hwnd)
+        title = entry.get("title")
+        if title is None:
+            title = win32gui.GetWindowText(hwnd)
+            entry["title"] = title
+        return title
     except Exception as e:
         log(f"Failed to get window title: {e}")
         return ""
@@ -89,19 +191,22 @@ def get_running_apps() -> list[dict]:
         应用列表，每个元素为 {"name": 进程名(无后缀), "exe_path": 可执行文件路径}
     """
     apps = {}
+    seen_pids = set()
     
     def enum_handler(hwnd, _):
         try:
             if not win32gui.IsWindowVisible(hwnd):
                 return True
             
-            # 获取进程 ID
+            # 获取进程 ID（同一进程的多个窗口只处理一次）
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
+            if pid in seen_pids:
+                return True
+            seen_pids.add(pid)
             
             # 获取进程信息
-            proc = psutil.Process(pid)
-            exe_path = proc.exe()
-            name = proc.name().replace(".exe", "")
+            exe_path, proc_name = _get_process_info(pid)
+            name = proc_name.replace(".exe", "")
             
             # 避免重复
             if name not in apps:
@@ -123,6 +228,13 @@ def get_running_apps() -> list[dict]:
     return list(apps.values())
 
 
+# 只处理这些进程（排除 wpscloudsvr 等服务进程）
+_WPS_TARGET_PROCESS_NAMES = frozenset({'wps.exe', 'kwps.exe', 'et.exe', 'ket.exe'})
+_WPS_SERVICE_PROCESS_NAME = 'wpscloudsvr.exe'
+# 清理后最多再复查的轮数，避免无限循环
+_WPS_CLEANUP_MAX_RETRIES = 3
+
+
 def cleanup_background_wps_processes(ep: int = 0) -> int:
     """
     清理后台的 WPS 进程，保留前台的 WPS 进程
@@ -132,113 +244,185 @@ def cleanup_background_wps_processes(ep: int = 0) -> int:
     2. 保留主进程及其所有子进程树
     3. 只清理孤立的、既没有任务栏窗口也不属于进程树的进程
     
+    每轮清理等待被结束的进程退出后重新检查，直到没有可清理的进程（最多复查 3 轮）。
+    
     Returns:
         int: 清理的进程数量
     """
-    try:
-        cleaned_count = 0
-        
-        # 只处理这些进程（排除 wpscloudsvr 等服务进程）
-        wps_process_names = ['wps.exe', 'kwps.exe', 'et.exe', 'ket.exe']
-        
-        # 获取所有 WPS 进程（包括服务进程，用于查找父子关系）
-        all_wps_processes = []
-        target_processes = []
-        
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'ppid']):
-            try:
-                proc_name = proc.info['name'].lower()
-                # 收集所有 WPS 相关进程（包括 wpscloudsvr）
-                if proc_name in wps_process_names or proc_name == 'wpscloudsvr.exe':
-                    all_wps_processes.append(proc)
-                    # 只对文档/表格进程进行清理判断
-                    if proc_name in wps_process_names:
-                        target_processes.append(proc)
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                pass
-        
-        if not target_processes:
-            log("No WPS target processes found")
-            return 0
-        
-        log(f"Found {len(target_processes)} WPS target process(es), {len(all_wps_processes)} total WPS-related")
-        
-        # 1. 找到所有需要保护的主进程
-        # - wpscloudsvr.exe（服务进程，始终保护）
-        # - 没有 /Automation 参数的文档/表格进程（用户打开的应用）
-        # 注意：/Automation 表示 COM 自动化模式，应该被清理
-        protected_pids = set()
-        
-        for proc in all_wps_processes:
+    total_cleaned = 0
+    # 进程命令行缓存（psutil.Process 以 pid + 创建时间区分），多轮清理间复用
+    cmdline_cache: dict[psutil.Process, str] = {}
+    while True:
+        try:
+            cleaned_count = _cleanup_wps_pass(cmdline_cache)
+        except Exception as e:
+            log(f"Error during cleanup: {e}")
+            break
+
+        total_cleaned += cleaned_count
+        if cleaned_count <= 0:
+            break
+        log(f"Cleaned up {cleaned_count} background process(es)")
+        if ep >= _WPS_CLEANUP_MAX_RETRIES:
+            break
+        ep += 1
+
+    return total_cleaned
+
+
+def _cleanup_wps_pass(cmdline_cache: dict) -> int:
+    """
+    执行一轮 WPS 后台进程清理（基于一次进程快照）
+
+    Args:
+        cmdline_cache: 进程 -> 小写命令行 的缓存，跨轮次复用
+
+    Returns:
+        int: 本轮清理的进程数量
+    """
+    # 获取所有 WPS 进程（包括服务进程，用于查找父子关系）
+    all_wps_processes = []
+    target_processes = []
+    # 父进程 pid -> 子进程 pid 列表，用于一次性展开进程树
+    children_by_ppid: dict[int, list[int]] = {}
+
+    # 全量遍历时只取进程名；父进程号（Windows 上每次查询都要枚举全部进程）
+    # 和命令行（需要读取目标进程内存）只对匹配到的 WPS 进程按需获取
+    for proc in psutil.process_iter(['name']):
+        try:
+            proc_name = (proc.info['name'] or '').lower()
+            if proc_name not in _WPS_TARGET_PROCESS_NAMES and proc_name != _WPS_SERVICE_PROCESS_NAME:
+                continue
+            # 收集所有 WPS 相关进程（包括 wpscloudsvr）
             try:
-                pid = proc.pid
-
-                # 检查文档/表格进程：如果有 /Automation 参数，说明是 COM 自动化模式，不保护
-                cmdline = proc.info.get('cmdline', [])
-                cmdline_str = ' '.join(cmdline) if cmdline else ''
-                has_automation = '/automation' in cmdline_str.lower()
-
-                # 没有 /Automation 参数并且有窗口的才保护（用户正常打开的应用）
-                if not has_automation and _has_main_user_window(pid):
-                    protected_pids.add(pid)
-                    log(f"Protected: user application {pid} (no /Automation)")
-                else:
-                    log(f"Skipped: automation process {pid} (has /Automation)")
-            except Exception:
-                pass
-
-        # 2. 保护所有主进程的子进程树
-        def add_children(parent_pid):
-            for proc in all_wps_processes:
+                ppid = proc.ppid()
+            except psutil.AccessDenied:
+                ppid = None
+            all_wps_processes.append(proc)
+            children_by_ppid.setdefault(ppid, []).append(proc.pid)
+            # 只对文档/表格进程进行清理判断
+            if proc_name in _WPS_TARGET_PROCESS_NAMES:
+                target_processes.append(proc)
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+
+    if not target_processes:
+        log("No WPS target processes found")
+        return 0
+
+    log(f"Found {len(target_processes)} WPS target process(es), {len(all_wps_processes)} total WPS-related")
+
+    # 1. 找到所有需要保护的主进程
+    # - wpscloudsvr.exe（服务进程，始终保护）
+    # - 没有 /Automation 参数的文档/表格进程（用户打开的应用）
+    # 注意：/Automation 表示 COM 自动化模式，应该被清理
+    protected_pids = set()
+
+    # 一次枚举所有顶层窗口，各进程只检查自己的窗口
+    try:
+        windows_by_pid = _snapshot_windows()
+    except Exception as e:
+        log(f"Failed to enumerate windows: {e}")
+        windows_by_pid = None
+
+    for proc in all_wps_processes:
+        try:
+            pid = proc.pid
+
+            # 检查文档/表格进程：如果有 /Automation 参数，说明是 COM 自动化模式，不保护
+            cmdline_str = cmdline_cache.get(proc)
+            if cmdline_str is None:
                 try:
-                    if proc.info.get('ppid') == parent_pid and proc.pid not in protected_pids:
-                        protected_pids.add(proc.pid)
-                        log(f"Protected: child {proc.pid} (parent: {parent_pid})")
-                        add_children(proc.pid)
-                except Exception:
-                    pass
+                    cmdline = proc.cmdline()
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    cmdline = []
+                cmdline_str = ' '.join(cmdline).lower() if cmdline else ''
+                cmdline_cache[proc] = cmdline_str
+            has_automation = '/automation' in cmdline_str
 
-        for pid in list(protected_pids):
-            add_children(pid)
+            # 没有 /Automation 参数并且有窗口的才保护（用户正常打开的应用）
+            hwnds = windows_by_pid.get(pid, []) if windows_by_pid is not None else None
+            if not has_automation and _has_main_user_window(pid, hwnds):
+                protected_pids.add(pid)
+                log(f"Protected: user application {pid} (no /Automation)")
+            else:
+                log(f"Skipped: automation process {pid} (has /Automation)")
+        except Exception:
+            pass
+
+    # 2. 保护所有主进程的子进程树（迭代展开，按父子关系逐层加入）
+    pending = list(protected_pids)
+    while pending:
+        parent_pid = pending.pop()
+        for child_pid in children_by_ppid.get(parent_pid, ()):
+            if child_pid not in protected_pids:
+                protected_pids.add(child_pid)
+                log(f"Protected: child {child_pid} (parent: {parent_pid})")
+                pending.append(child_pid)
+
+    # 3. 清理不在保护列表中的目标进程（只清理文档/表格进程）
+    # 先统一发出 terminate，再一起等待退出，避免逐个串行等待
+    terminated = []
+    for proc in target_processes:
+        try:
+            pid = proc.pid
+            proc_name = proc.info['name'].lower()
 
-        # 3. 清理不在保护列表中的目标进程（只清理文档/表格进程）
-        for proc in target_processes:
-            if proc.info['name'].lower() == 'wpscloudsvr.exe':
-                continue  # 永远不清理服务进程
+            if pid in protected_pids:
+                continue
+
+            log(f"Cleaning up background process: {pid} ({proc_name})")
             try:
-                pid = proc.pid
-                proc_name = proc.info['name'].lower()
-                
-                if pid in protected_pids:
-                    continue
-                
-                log(f"Cleaning up background process: {pid} ({proc_name})")
-                try:
-                    proc.terminate()
-                    try:
-                        proc.wait(timeout=2)
-                    except psutil.TimeoutExpired:
-                        proc.kill()
-                    cleaned_count += 1
-                except Exception as e:
-                    log(f"Failed to terminate {pid}: {e}")
-            except Exception:
-                pass
-        
-        if cleaned_count > 0:
-            if ep < 3:  # 限制递归深度，避免无限循环
-                sleep(0.15)  # 等待进程退出
-                cleanup_background_wps_processes(ep+1)  # 递归清理，直到没有可清理的进程
-            log(f"Cleaned up {cleaned_count} background process(es)")
-        
-        return cleaned_count
-    
-    except Exception as e:
-        log(f"Error during cleanup: {e}")
+                proc.terminate()
+                terminated.append(proc)
+            except Exception as e:
+                log(f"Failed to terminate {pid}: {e}")
+        except Exception:
+            pass
+
+    if not terminated:
         return 0
 
+    # wait_procs 在所有进程退出后立即返回，超时仍存活的再强制结束
+    _, alive = psutil.wait_procs(terminated, timeout=2)
+    killed = []
+    for proc in alive:
+        try:
+            proc.kill()
+            killed.append(proc)
+        except psutil.NoSuchProcess:
+            killed.append(proc)
+        except Exception as e:
+            log(f"Failed to terminate {proc.pid}: {e}")
+    if killed:
+        psutil.wait_procs(killed, timeout=1)
+
+    # 强制结束失败的进程不计入清理数量
+    return len(terminated) - (len(alive) - len(killed))
+
+
+def _snapshot_windows() -> dict[int, list[int]]:
+    """
+    枚举一次所有顶层窗口，按所属进程 ID 分组
+
+    Returns:
+        {pid: [hwnd, ...]}（保持 EnumWindows 的 Z 序）
+    """
+    windows_by_pid: dict[int, list[int]] = {}
+
+    def window_callback(hwnd, extra):
+        try:
+            _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
+            windows_by_pid.setdefault(window_pid, []).append(hwnd)
+        except Exception:
+            pass
+        return True
+
+    win32gui.EnumWindows(window_callback, None)
+    return windows_by_pid
+
 
-def _has_taskbar_window(pid: int) -> bool:
+def _has_taskbar_window(pid: int, hwnds: list[int] | None = None) -> bool:
     """
     检查进程是否有任务栏窗口（即在任务管理器中显示为"应用"）
     
@@ -250,50 +434,43 @@ def _has_taskbar_window(pid: int) -> bool:
     
     Args:
         pid: 进程 ID
+        hwnds: 该进程的顶层窗口列表（来自 _snapshot_windows），省略时自行枚举
         
     Returns:
         True 如果进程有任务栏窗口（是"应用"而非"后台进程"）
     """
     try:
-        import win32con
+        if hwnds is None:
+            hwnds = _snapshot_windows().get(pid, [])
         
-        has_taskbar = False
-        
-        def window_callback(hwnd, extra):
-            nonlocal has_taskbar
+        for hwnd in hwnds:
             try:
-                # 获取窗口所属的进程 ID
-                _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                if window_pid != pid:
-                    return True
-                
                 # 检查窗口是否可见或最小化
                 is_visible = win32gui.IsWindowVisible(hwnd)
                 is_minimized = win32gui.IsIconic(hwnd)
                 
                 if not is_visible and not is_minimized:
                     # 完全不可见且未最小化，不是任务栏窗口
-                    return True
+                    continue
                 
                 # 获取窗口扩展样式
-                ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+                ex_style = win32gui.GetWindowLong(hwnd, GWL_EXSTYLE)
                 
                 # 排除工具窗口（工具窗口不在任务栏显示）
-                if ex_style & win32con.WS_EX_TOOLWINDOW:
-                    return True
+                if ex_style & WS_EX_TOOLWINDOW:
+                    continue
                 
                 # 检查是否有 WS_EX_APPWINDOW 样式（强制在任务栏显示）
-                has_app_window = ex_style & win32con.WS_EX_APPWINDOW
+                has_app_window = ex_style & WS_EX_APPWINDOW
                 
                 if has_app_window:
                     # 有 APPWINDOW 样式，是任务栏窗口
                     title = win32gui.GetWindowText(hwnd)
                     log(f"Found taskbar window (APPWINDOW) for PID {pid}: '{title}'")
-                    has_taskbar = True
-                    return False
+                    return True
                 
                 # 检查窗口是否有所有者
-                owner = win32gui.GetWindow(hwnd, win32con.GW_OWNER)
+                owner = win32gui.GetWindow(hwnd, GW_OWNER)
                 
                 # 如果窗口没有所有者且可见，通常会在任务栏显示
                 if not owner and is_visible:
@@ -301,16 +478,12 @@ def _has_taskbar_window(pid: int) -> bool:
                     # 必须有标题才算任务栏窗口
                     if title:
                         log(f"Found taskbar window (no owner, visible) for PID {pid}: '{title}'")
-                        has_taskbar = True
-                        return False
+                        return True
                 
             except Exception as e:
                 log(f"Error checking taskbar window for PID {pid}: {e}")
-                pass
-            return True  # 继续枚举
         
-        win32gui.EnumWindows(window_callback, None)
-        return has_taskbar
+        return False
     
     except Exception as e:
         log(f"Error checking taskbar window for PID {pid}: {e}")
@@ -318,7 +491,7 @@ def _has_taskbar_window(pid: int) -> bool:
         return True
 
 
-def _has_document_window(pid: int) -> bool:
+def _has_document_window(pid: int, hwnds: list[int] | None = None) -> bool:
     """
     检查进程是否有文档窗口（主窗口或最小化的窗口）
     
@@ -329,23 +502,17 @@ def _has_document_window(pid: int) -> bool:
     
     Args:
         pid: 进程 ID
+        hwnds: 该进程的顶层窗口列表（来自 _snapshot_windows），省略时自行枚举
         
     Returns:
         True 如果进程有文档窗口
     """
     try:
-        import win32con
-        
-        has_doc_window = False
+        if hwnds is None:
+            hwnds = _snapshot_windows().get(pid, [])
         
-        def window_callback(hwnd, extra):
-            nonlocal has_doc_window
+        for hwnd in hwnds:
             try:
-                # 获取窗口所属的进程 ID
-                _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                if window_pid != pid:
-                    return True
-                
                 # 检查窗口是否最小化
                 is_minimized = win32gui.IsIconic(hwnd)
                 
@@ -357,25 +524,24 @@ def _has_document_window(pid: int) -> bool:
                     title = win32gui.GetWindowText(hwnd)
                     if title:  # 有标题的最小化窗口
                         log(f"Found minimized document window for PID {pid}: '{title}'")
-                        has_doc_window = True
-                        return False
+                        return True
                 
                 # 不可见的窗口跳过
                 if not is_visible:
-                    return True
+                    continue
                 
                 # 获取窗口标题
                 title = win32gui.GetWindowText(hwnd)
                 if not title:
                     # 没有标题的可见窗口，不是文档窗口
-                    return True
+                    continue
                 
                 # 获取窗口样式
-                ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+                ex_style = win32gui.GetWindowLong(hwnd, GWL_EXSTYLE)
                 
                 # 排除工具窗口（工具窗口不算文档窗口）
-                if ex_style & win32con.WS_EX_TOOLWINDOW:
-                    return True
+                if ex_style & WS_EX_TOOLWINDOW:
+                    continue
                 
                 # 检查窗口尺寸（排除异常小的窗口）
                 try:
@@ -385,23 +551,19 @@ def _has_document_window(pid: int) -> bool:
                     
                     # 文档窗口应该有合理的尺寸（至少 200x200）
                     if width < 200 or height < 200:
-                        return True
+                        continue
                 except Exception:
                     # 无法获取尺寸，跳过
-                    return True
+                    continue
                 
                 # 找到了文档窗口
                 log(f"Found document window for PID {pid}: '{title}' ({width}x{height})")
-                has_doc_window = True
-                return False  # 停止枚举
+                return True
                 
             except Exception as e:
                 log(f"Error checking window for PID {pid}: {e}")
-                pass
-            return True  # 继续枚举
         
-        win32gui.EnumWindows(window_callback, None)
-        return has_doc_window
+        return False
     
     except Exception as e:
         log(f"Error checking document window for PID {pid}: {e}")
@@ -409,7 +571,7 @@ def _has_document_window(pid: int) -> bool:
         return True
 
 
-def _has_main_user_window(pid: int) -> bool:
+def _has_main_user_window(pid: int, hwnds: list[int] | None = None) -> bool:
     """
     检查进程是否有用户窗口（包括主窗口、工具窗口、最小化窗口等）
     
@@ -422,64 +584,53 @@ def _has_main_user_window(pid: int) -> bool:
     
     Args:
         pid: 进程 ID
+        hwnds: 该进程的顶层窗口列表（来自 _snapshot_windows），省略时自行枚举
         
     Returns:
         True 如果进程有任何用户窗口
     """
     try:
-        import win32con
-        
-        has_user_window = False
+        if hwnds is None:
+            hwnds = _snapshot_windows().get(pid, [])
         
-        def window_callback(hwnd, extra):
-            nonlocal has_user_window
+        for hwnd in hwnds:
             try:
-                # 获取窗口所属的进程 ID
-                _, window_pid = win32process.GetWindowThreadProcessId(hwnd)
-                if window_pid != pid:
-                    return True
-                
                 # 检查窗口是否最小化（最小化的窗口应该保留）
                 is_minimized = win32gui.IsIconic(hwnd)
                 if is_minimized:
                     title = win32gui.GetWindowText(hwnd)
                     log(f"Found minimized window for PID {pid}: '{title}'")
-                    has_user_window = True
-                    return False  # 停止枚举
+                    return True
                 
                 # 检查窗口是否可见
                 is_visible = win32gui.IsWindowVisible(hwnd)
                 if not is_visible:
                     # 不可见的窗口，跳过
-                    return True
+                    continue
                 
                 # 窗口可见，获取窗口标题
                 title = win32gui.GetWindowText(hwnd)
                 
                 # 获取窗口样式
-                style = win32gui.GetWindowLong(hwnd, win32con.GWL_STYLE)
-                ex_style = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+                style = win32gui.GetWindowLong(hwnd, GWL_STYLE)
+                ex_style = win32gui.GetWindowLong(hwnd, GWL_EXSTYLE)
                 
                 # 检查是否是工具窗口
-                is_tool_window = ex_style & win32con.WS_EX_TOOLWINDOW
+                is_tool_window = ex_style & WS_EX_TOOLWINDOW
                 
                 # 检查是否有标题栏（主窗口的特征）
-                has_caption = style & win32con.WS_CAPTION
+                has_caption = style & WS_CAPTION
                 
                 # 只要有标题或者是工具窗口，就认为是用户窗口
                 if title or is_tool_window or has_caption:
                     window_type = "tool window" if is_tool_window else "main window"
                     log(f"Found visible {window_type} for PID {pid}: '{title}'")
-                    has_user_window = True
-                    return False  # 停止枚举
+                    return True
                 
             except Exception as e:
                 log(f"Error checking window for PID {pid}: {e}")
-                pass
-            return True  # 继续枚举
         
-        win32gui.EnumWindows(window_callback, None)
-        return has_user_window
+        return False
     
     except Exception as e:
         log(f"Error checking main window for PID {pid}: {e}")
@@ -372,3 +372,11 @@ def test_auto_layout_gives_long_note_column_space_in_very_wide_tables():
     assert widths[-1] >= 1600
     assert widths[-1] > widths[0]
     assert all(width > 0 for width in widths)
+
+
+def test_normalize_first_paragraph_style_skips_documents_without_first_paragraph():
+    docx_bytes = _make_label_content_docx()
+
+    processed = DocxProcessor.normalize_first_paragraph_style(docx_bytes)
+
+    assert processed is docx_bytes
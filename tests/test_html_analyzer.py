@@ -0,0 +1,29 @@
+import pytest
+
+from pastemd.utils.html_analyzer import is_plain_html_fragment
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<span>**bold** and `code`</span><!-- <p>hidden</p> -->',
+        '<script>var s = "<table><tr><td>";</script><span># Title\n- item</span>',
+        '<span title="<p>x</p>">1. one\n2. two</span>',
+        '<style>p { margin: 0 } table td {}</style><span>plain text</span>',
+        '<span style="color:red">just text</span>',
+    ],
+)
+def test_tags_in_comments_scripts_and_attributes_do_not_count_as_structure(html):
+    assert is_plain_html_fragment(html) is True
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<div><p>Hello</p></div>',
+        '<table><tr><td>a</td></tr></table>',
+        '<DIV><P CLASS=x>Hi</P></DIV>',
+    ],
+)
+def test_real_semantic_tags_are_structured_html(html):
+    assert is_plain_html_fragment(html) is False
@@ -0,0 +1,104 @@
+import json
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup, NavigableString
+
+from pastemd.utils import html_formatter
+from pastemd.utils.html_formatter import protect_brackets
+
+
+def _baseline_protect_brackets(html: str) -> str:
+    """原先基于 BeautifulSoup 的实现，作为输出对照"""
+    soup = BeautifulSoup(html, "html.parser")
+    for col in soup.find_all("col"):
+        col.decompose()
+    for text_node in soup.find_all(string=True):
+        if isinstance(text_node, NavigableString):
+            text = str(text_node)
+            if '[x]' in text or '[ ]' in text:
+                text_node.replace_with(
+                    text.replace('[x]', '{{TASK_CHECKED}}').replace('[ ]', '{{TASK_UNCHECKED}}')
+                )
+    return str(soup)
+
+
+def _normalized(html: str) -> str:
+    return str(BeautifulSoup(html, "html.parser"))
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        "<ul><li>[x] done</li><li>[ ] todo</li></ul>",
+        "<ul><li>&#91;x&#93; done</li><li>&#91; &#93; todo</li></ul>",
+        "<p>&lsqb;x&rsqb; a &amp; b &lt;tag&gt;</p>",
+        "<p>&#x5B;&#32;&#x5D; spaced &nbsp;text</p>",
+        "<p>[&#120;] encoded x</p>",
+        '<a href="[x]" title="&#91; ]">[x] link</a>',
+        "<table><colgroup><col span=\"2\"></colgroup><tr><td>[ ] cell</td></tr></table>",
+        "<p>&#91;y&#93; not a task &amp;amp;</p>",
+        "<style>li::before { content: \"[x]\" }</style><p>[ ] a</p>",
+    ],
+)
+def test_protect_brackets_matches_baseline(html):
+    assert _normalized(protect_brackets(html)) == _normalized(_baseline_protect_brackets(html))
+
+
+def test_protect_brackets_returns_input_without_markers_or_col_tags():
+    html = "<p>plain &amp; simple [link](x)</p>"
+
+    assert protect_brackets(html) == html
+
+
+def test_protect_brackets_decodes_encoded_markers():
+    assert protect_brackets("<li>&#91;x&#93; a &lt; b</li>") == "<li>{{TASK_CHECKED}} a &lt; b</li>"
+
+
+# 期望输出由旧版 html_formatter 生成（Pandoc 片段 / 完整文档 / 前置 <style> 或注释 / CSS 字体 / KaTeX / Word）
+GOLDEN = json.loads(
+    (Path(__file__).parent / "data" / "html_formatter_golden.json").read_text(encoding="utf-8")
+)
+
+_SOUP_FUNCS = [
+    "clean_html_content",
+    "convert_css_font_to_semantic",
+    "promote_bold_first_row_to_header",
+    "convert_strikethrough_to_del",
+    "unwrap_all_p_div_inside_li",
+    "remove_empty_paragraphs",
+]
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+@pytest.mark.parametrize("func", ["postprocess_pandoc_html_macwps", "clean_html_for_wps"])
+def test_wps_postprocessing_matches_golden_output(name, func):
+    case = GOLDEN[name]
+
+    output = getattr(html_formatter, func)(case["input"])
+
+    assert output == case["expected"][func]
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+@pytest.mark.parametrize("func", _SOUP_FUNCS)
+def test_soup_helpers_match_golden_output(name, func):
+    case = GOLDEN[name]
+    soup = BeautifulSoup(case["input"], "html.parser")
+
+    getattr(html_formatter, func)(soup)
+
+    assert str(soup) == case["expected"][func]
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+def test_extract_html_body_matches_golden_output(name):
+    case = GOLDEN[name]
+
+    assert html_formatter.extract_html_body(case["input"]) == case["expected"]["extract_html_body"]
+
+
+def test_postprocess_pandoc_html_macwps_keeps_fragments_unwrapped():
+    output = html_formatter.postprocess_pandoc_html_macwps("<p><del>a</del></p>")
+
+    assert output == "<p><s>a</s></p>"
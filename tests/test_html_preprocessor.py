@@ -0,0 +1,50 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from pastemd.config.defaults import DEFAULT_CONFIG
+from pastemd.service.preprocessor.html import HtmlPreprocessor
+
+# 期望输出由 html.parser 版本的预处理器生成（Word / 网页 / CF_HTML / 带片段标记的剪贴板内容）
+GOLDEN = json.loads(
+    (Path(__file__).parent / "data" / "html_preprocessor_golden.json").read_text(encoding="utf-8")
+)
+
+
+def _config(variant: str) -> dict:
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    if variant == "header":
+        config["html_formatting"] = {"bold_first_row_to_header": True}
+    return config
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+@pytest.mark.parametrize("variant", ["default", "header"])
+def test_process_matches_golden_output(name, variant):
+    case = GOLDEN[name]
+
+    output = HtmlPreprocessor().process(case["input"], _config(variant))
+
+    assert output == case["expected"][variant]
+
+
+def test_process_keeps_fragment_markers_in_place():
+    html = GOLDEN["word"]["input"]
+
+    output = HtmlPreprocessor().process(html, _config("default"))
+
+    assert "<body lang=\"ZH-CN\"><!--StartFragment--><p" in output
+    assert output.count("<html") == 1
+    assert output.rstrip().endswith("<!--EndFragment--></body></html>")
+
+
+def test_process_skips_parsing_when_all_formatting_is_disabled():
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config["html_formatting"] = {"strikethrough_to_del": False, "css_font_to_semantic": False}
+    html = GOLDEN["fragment"]["input"]
+
+    output = HtmlPreprocessor().process(html, config)
+
+    assert output == "<!DOCTYPE html>\n<meta charset='utf-8'>\n" + html
@@ -0,0 +1,48 @@
+import pytest
+
+from pastemd.utils.markdown_utils import has_backtick_fenced_code_block, has_latex_math, is_markdown
+
+# (文本, is_markdown, has_latex_math, has_backtick_fenced_code_block)，期望值由逐条正则匹配的旧版实现得出
+CASES = [
+    ("", False, False, False),
+    ("plain text", False, False, False),
+    ("# Heading", True, False, False),
+    ("Some **bold** text", True, False, False),
+    ("a * b * c", True, False, False),
+    ("- item\n- item2", True, False, False),
+    ("1. one\n2. two", True, False, False),
+    ("```python\nx=1\n```", True, False, True),
+    ("~~~\ncode\n~~~", False, False, False),
+    ("`inline`", True, False, False),
+    ("> quote", True, False, False),
+    ("| a | b |\n|---|---|\n| 1 | 2 |", False, False, False),
+    ("[link](http://x)", True, False, False),
+    ("![img](a.png)", True, False, False),
+    ("$x^2$", True, True, False),
+    ("$$\nE=mc^2\n$$", True, True, False),
+    ("price $5 and $10", True, True, False),
+    ("\\(a+b\\)", True, True, False),
+    ("\\[x\\]", True, True, False),
+    ("\\begin{equation}x\\end{equation}", False, False, False),
+    ("***", True, False, False),
+    ("text with _under_ score", True, False, False),
+    ("<div>html</div>", False, False, False),
+    ("snake_case_name", True, False, False),
+    ("2 * 3 = 6", False, False, False),
+    ("#hashtag", False, False, False),
+    ("Title\n=====", False, False, False),
+    ("foo\n---", False, False, False),
+    ("* star item", True, False, False),
+    ("+ plus item", True, False, False),
+    ("- [ ] task", True, False, False),
+    ("- [x] done", True, False, False),
+    ("www.example.com", False, False, False),
+    ("a\\b", False, False, False),
+]
+
+
+@pytest.mark.parametrize("text, markdown, latex, fenced", CASES)
+def test_detectors_match_previous_results(text, markdown, latex, fenced):
+    assert is_markdown(text) is markdown
+    assert has_latex_math(text) is latex
+    assert has_backtick_fenced_code_block(text) is fenced
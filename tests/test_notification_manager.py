@@ -0,0 +1,40 @@
+import threading
+
+from pastemd.core.state import app_state
+from pastemd.service.notification.manager import NotificationManager
+
+
+def _collect_sent(monkeypatch, manager):
+    sent = []
+    lock = threading.Lock()
+
+    def fake_send(title, message, **kwargs):
+        with lock:
+            sent.append((title, message))
+
+    monkeypatch.setattr(manager, "_send_one", fake_send)
+    monkeypatch.setattr(app_state, "config", {"notify": True})
+    return sent
+
+
+def test_distinct_messages_with_same_title_are_all_delivered(monkeypatch):
+    manager = NotificationManager()
+    sent = _collect_sent(monkeypatch, manager)
+
+    manager.notify("PasteMD", "转换成功", ok=True)
+    manager.notify("PasteMD", "粘贴失败", ok=False)
+    manager._q.join()
+
+    assert sent == [("PasteMD", "转换成功"), ("PasteMD", "粘贴失败")]
+
+
+def test_exact_duplicate_burst_is_sent_once(monkeypatch):
+    manager = NotificationManager()
+    sent = _collect_sent(monkeypatch, manager)
+
+    for _ in range(3):
+        manager.notify("PasteMD", "转换成功", ok=True)
+    manager.notify("PasteMD", "粘贴失败", ok=False)
+    manager._q.join()
+
+    assert sent == [("PasteMD", "转换成功"), ("PasteMD", "粘贴失败")]
@@ -0,0 +1,64 @@
+import re
+
+import pytest
+
+from pastemd.utils import omml
+
+HTML = (
+    '<table><tr><td><math display="block"><mi>y</mi></math></td></tr></table>'
+    '<p>a <MATH xmlns="http://www.w3.org/1998/Math/MathML"><mi>x</mi></MATH> b</p>'
+    '<p><math><mfrac><mi>a</mi><mi>b</mi></mfrac></math></p>'
+)
+
+
+def _omml(fallback: str) -> str:
+    return f'<!--[if gte msEquation 12]><m:oMath>{fallback}</m:oMath><![endif]--><![if !msEquation]>{fallback}<![endif]>'
+
+
+@pytest.fixture
+def fake_converter(monkeypatch):
+    # 未安装 mathml2omml 时也能测试替换逻辑；含 mfrac 的公式模拟转换失败
+    def convert(mathml, entity_map=None):
+        if "mfrac" in mathml:
+            raise ValueError("unsupported")
+        return f"<m:oMath>{re.sub(r'<[^>]+>', '', mathml)}</m:oMath>"
+
+    monkeypatch.setattr(omml, "convert_mathml_to_omml", convert)
+
+
+def test_extract_mathml_elements_returns_spans():
+    elements = omml.extract_mathml_elements(HTML)
+
+    assert [(start, end) for _, start, end in elements] == [(15, 54), (77, 143), (152, 200)]
+    assert all(HTML[start:end] == mathml for mathml, start, end in elements)
+
+
+def test_extract_mathml_elements_without_math():
+    assert omml.extract_mathml_elements("<p>no math</p>") == []
+
+
+def test_convert_html_mathml_to_omml_replaces_every_formula(fake_converter):
+    output = omml.convert_html_mathml_to_omml(HTML)
+
+    assert output == (
+        f"<table><tr><td>{_omml('y')}</td></tr></table>"
+        f"<p>a {_omml('x')} b</p>"
+        "<p><math><mfrac><mi>a</mi><mi>b</mi></mfrac></math></p>"
+    )
+
+
+def test_convert_html_mathml_to_omml_can_skip_tables(fake_converter):
+    output = omml.convert_html_mathml_to_omml(HTML, skip_table_mathml=True)
+
+    assert output == (
+        '<table><tr><td><math display="block"><mi>y</mi></math></td></tr></table>'
+        f"<p>a {_omml('x')} b</p>"
+        "<p><math><mfrac><mi>a</mi><mi>b</mi></mfrac></math></p>"
+    )
+
+
+def test_convert_html_mathml_to_omml_returns_input_without_math(fake_converter):
+    html = "<table><tr><td>x</td></tr></table><p>text</p>"
+
+    assert omml.convert_html_mathml_to_omml(html) is html
+    assert omml.convert_html_mathml_to_omml(html, skip_table_mathml=True) is html
@@ -0,0 +1,62 @@
+import subprocess
+import time
+
+import pytest
+
+from pastemd.utils.macos import osascript
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(osascript, "_compiled_scripts", {})
+    monkeypatch.setattr(osascript, "_compiling", set())
+    monkeypatch.setattr(osascript, "OSASCRIPT", "osascript")
+    monkeypatch.setattr(osascript, "OSACOMPILE", "osacompile")
+    return recorded
+
+
+def _fake_run(recorded, *, compile_ok=True):
+    def run(cmd, **kwargs):
+        recorded.append(cmd)
+        if cmd[0] == "osacompile":
+            if not compile_ok:
+                raise subprocess.CalledProcessError(1, cmd, stderr=b"syntax error")
+            with open(cmd[2], "wb") as f:
+                f.write(b"scpt")
+        return subprocess.CompletedProcess(cmd, 0)
+
+    return run
+
+
+def _wait_for_compile():
+    deadline = time.monotonic() + 2
+    while osascript._compiling and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_first_run_uses_source_and_later_runs_use_compiled_script(monkeypatch, calls, tmp_path):
+    monkeypatch.setattr(osascript.subprocess, "run", _fake_run(calls))
+    script = 'on run argv\nreturn item 1 of argv\nend run'
+
+    osascript.run_compiled_applescript(script, "a", output_dir=str(tmp_path), name="t", timeout=5)
+    _wait_for_compile()
+    osascript.run_compiled_applescript(script, "b", output_dir=str(tmp_path), name="t", timeout=5)
+
+    runs = [c for c in calls if c[0] == "osascript"]
+    assert [c[0] for c in calls].count("osacompile") == 1
+    assert runs[0] == ["osascript", "-", "a"]
+    assert runs[1][1].endswith(".scpt")
+    assert runs[1][2:] == ["b"]
+
+
+def test_failed_compile_is_not_retried(monkeypatch, calls, tmp_path):
+    monkeypatch.setattr(osascript.subprocess, "run", _fake_run(calls, compile_ok=False))
+    script = 'display dialog "x"'
+
+    for _ in range(3):
+        osascript.run_compiled_applescript(script, output_dir=str(tmp_path), name="t", timeout=5)
+        _wait_for_compile()
+
+    assert [c[0] for c in calls].count("osacompile") == 1
+    assert [c for c in calls if c[0] == "osascript"] == [["osascript", "-"]] * 3
@@ -0,0 +1,152 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pastemd.core.errors import PandocError
+from pastemd.integrations import pandoc_server
+from pastemd.integrations.pandoc_server import PandocServer, shutdown_all_servers
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self._reply({"version": "3.1"} if self.path == "/version" else {})
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append(body)
+        self._reply({"output": body["text"].upper(), "base64": False, "messages": []})
+
+    def _reply(self, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class _FakeProcess:
+    def __init__(self):
+        self.returncode = None
+        self.terminated = False
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.terminated = True
+        self.returncode = 0
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+
+@pytest.fixture
+def stub_http(monkeypatch):
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    _StubHandler.requests = []
+    monkeypatch.setattr(PandocServer, "_pick_free_port", staticmethod(lambda: httpd.server_address[1]))
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _patch_popen(monkeypatch, factory):
+    launched = []
+
+    def fake_popen(cmd, **kwargs):
+        launched.append(cmd)
+        return factory()
+
+    monkeypatch.setattr(pandoc_server.subprocess, "Popen", fake_popen)
+    return launched
+
+
+def _wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_convert_uses_server_after_background_start(monkeypatch, stub_http):
+    processes = []
+    launched = _patch_popen(monkeypatch, lambda: processes.append(_FakeProcess()) or processes[-1])
+    server = PandocServer("pandoc")
+
+    assert server.start_async() is True
+    assert _wait_until(server.is_ready)
+
+    output = server.convert("<p>hi</p>", from_format="html", to_format="gfm")
+
+    assert output == "<P>HI</P>"
+    assert launched[0][:2] == ["pandoc", "server"]
+    assert _StubHandler.requests == [
+        {"text": "<p>hi</p>", "from": "html", "to": "gfm", "wrap": "none"}
+    ]
+    server.stop()
+    assert processes[0].terminated
+
+
+def test_convert_does_not_block_before_server_is_started(monkeypatch, stub_http):
+    _patch_popen(monkeypatch, _FakeProcess)
+    server = PandocServer("pandoc")
+    server._next_start_at = float("inf")  # 不触发后台启动
+
+    with pytest.raises(PandocError):
+        server.convert("x", from_format="html", to_format="gfm")
+
+
+def test_failed_start_backs_off_instead_of_retrying(monkeypatch):
+    def failing_popen():
+        raise OSError("pandoc: no such file")
+
+    launched = _patch_popen(monkeypatch, failing_popen)
+    server = PandocServer("pandoc")
+
+    assert server.start_async() is True
+    assert _wait_until(lambda: not server._starting and server._failures == 1)
+
+    assert server.start_async() is False
+    with pytest.raises(PandocError):
+        server.convert("x", from_format="html", to_format="gfm")
+    assert len(launched) == 1
+
+
+def test_crashed_server_is_not_restarted_on_every_conversion(monkeypatch, stub_http):
+    processes = []
+    launched = _patch_popen(monkeypatch, lambda: processes.append(_FakeProcess()) or processes[-1])
+    server = PandocServer("pandoc")
+    server.start_async()
+    assert _wait_until(server.is_ready)
+
+    processes[0].returncode = 1  # 模拟崩溃
+    for _ in range(3):
+        with pytest.raises(PandocError):
+            server.convert("x", from_format="html", to_format="gfm")
+
+    assert len(launched) == 1
+
+
+def test_shutdown_all_servers_stops_running_servers(monkeypatch, stub_http):
+    processes = []
+    _patch_popen(monkeypatch, lambda: processes.append(_FakeProcess()) or processes[-1])
+    server = PandocServer("pandoc")
+    server.start_async()
+    assert _wait_until(server.is_ready)
+
+    shutdown_all_servers()
+
+    assert processes[0].terminated
+    assert server.start_async() is False
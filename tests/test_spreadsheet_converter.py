@@ -0,0 +1,76 @@
+import io
+import json
+from pathlib import Path
+
+import openpyxl
+import pytest
+
+from pastemd.service.spreadsheet.generator import SpreadsheetGenerator
+from pastemd.service.spreadsheet.html_converter import (
+    clear_cell_cache,
+    table_to_html,
+    table_to_html_and_tsv,
+    table_to_tsv,
+)
+
+# 期望输出由逐单元格分别生成 HTML / TSV / XLSX 的旧版实现生成
+GOLDEN = json.loads(
+    (Path(__file__).parent / "data" / "spreadsheet_golden.json").read_text(encoding="utf-8")
+)
+
+
+def _dump_sheet(data: bytes) -> dict:
+    """读出工作表中每个单元格的值（富文本按片段展开）、字体和列宽，便于与期望值比较"""
+    ws = openpyxl.load_workbook(io.BytesIO(data), rich_text=True).active
+    cells = []
+    for row in ws.iter_rows():
+        for c in row:
+            value = c.value
+            if value is not None and not isinstance(value, (str, int, float)):
+                value = [
+                    [part, None, None, None, None] if isinstance(part, str)
+                    else [part.text, part.font.b, part.font.i, part.font.strike, part.font.rFont]
+                    for part in value
+                ]
+            cells.append([c.coordinate, value, bool(c.font.b), bool(c.font.i), bool(c.font.strike), c.font.name])
+    return {"cells": cells, "widths": {k: d.width for k, d in ws.column_dimensions.items()}}
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+@pytest.mark.parametrize("variant", ["keep_format", "plain"])
+def test_table_to_html_and_tsv_matches_golden_output(name, variant):
+    case = GOLDEN[name]
+    clear_cell_cache()
+
+    html, tsv = table_to_html_and_tsv(case["input"], keep_format=variant == "keep_format")
+
+    assert html == case["expected"]["html"][variant]
+    assert tsv == case["expected"]["tsv"]
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+def test_single_output_helpers_match_golden_output(name):
+    case = GOLDEN[name]
+    clear_cell_cache()
+
+    # 连续调用两次，第二次走单元格缓存
+    for _ in range(2):
+        assert table_to_html(case["input"], keep_format=True) == case["expected"]["html"]["keep_format"]
+        assert table_to_html(case["input"], keep_format=False) == case["expected"]["html"]["plain"]
+        assert table_to_tsv(case["input"]) == case["expected"]["tsv"]
+
+
+def test_table_to_tsv_replaces_embedded_tabs_and_newlines():
+    tsv = table_to_tsv([["a\tb", "c\r\nd", "e\rf"], ["g"]])
+
+    assert tsv == "a b\tc d\te f\ng"
+
+
+@pytest.mark.parametrize("name", sorted(GOLDEN))
+@pytest.mark.parametrize("variant", ["keep_format", "plain"])
+def test_generate_xlsx_bytes_matches_golden_output(name, variant):
+    case = GOLDEN[name]
+
+    data = SpreadsheetGenerator.generate_xlsx_bytes(case["input"], keep_format=variant == "keep_format")
+
+    assert _dump_sheet(data) == case["expected"]["xlsx"][variant]